@@ -0,0 +1,103 @@
+"""
+Benchmark bulk Assumption validation against per-object construction.
+
+Generates synthetic market-research rows (with a small share of invalid
+ones) and times:
+
+* constructing ``Assumption`` models one by one
+* ``validate_assumptions`` on a list of records and on a DataFrame, with
+  and without building models
+
+Usage:
+    python benchmarks/assumption_validation.py [--rows 10000 100000] [--invalid 0.01]
+"""
+
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pydantic import ValidationError  # noqa: E402
+from backend.underwriting.assumptions.models import Assumption  # noqa: E402
+from backend.underwriting.assumptions.validation import validate_assumptions  # noqa: E402
+
+
+def synthetic_rows(rows: int, invalid: float, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate assumption records.
+
+    Args:
+        rows: Number of records
+        invalid: Share of records with an out-of-range confidence level
+        seed: Random seed
+
+    Returns:
+        List of record dictionaries
+    """
+    rng = np.random.default_rng(seed)
+    confidence = rng.uniform(0.5, 1.0, rows)
+    confidence[rng.random(rows) < invalid] = 1.5
+    values = rng.uniform(0.0, 0.1, rows)
+    categories = rng.choice(["revenue", "expense", "financing", "exit"], rows)
+    return [
+        {"name": f"Assumption {i}", "value": float(values[i]), "category": str(categories[i]),
+         "unit": "percentage", "source": "Market survey", "confidence_level": float(confidence[i])}
+        for i in range(rows)
+    ]
+
+
+def per_object(rows: List[Dict[str, Any]]) -> List[Assumption]:
+    """Construct models one at a time, keeping the valid ones as an import would."""
+    assumptions = []
+    for row in rows:
+        try:
+            assumptions.append(Assumption(**row))
+        except ValidationError:
+            pass
+    return assumptions
+
+
+def timed(function, *args, repeat: int = 5, **kwargs) -> float:
+    """Best of ``repeat`` runs, each starting from a freshly collected heap."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--invalid", type=float, default=0.01)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        rows = synthetic_rows(count, args.invalid)
+        frame = pd.DataFrame(rows)
+        baseline = timed(per_object, rows)
+        results = {
+            "per-object models": baseline,
+            "batch list -> models": timed(validate_assumptions, rows),
+            "batch list -> models, GC off": timed(validate_assumptions, rows, pause_gc=True),
+            "batch list -> records": timed(validate_assumptions, rows, build_models=False),
+            "per-object from DataFrame": timed(lambda: per_object(frame.to_dict("records"))),
+            "batch DataFrame -> models": timed(validate_assumptions, frame),
+            "batch DataFrame -> records": timed(validate_assumptions, frame, build_models=False),
+        }
+        print(f"{count:,} rows")
+        for label, seconds in results.items():
+            print(f"  {label:<28} {seconds:8.3f}s  {count / seconds:>12,.0f} rows/s  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
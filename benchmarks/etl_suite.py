@@ -0,0 +1,176 @@
+"""
+ETL ingestion benchmark suite.
+
+Measures throughput, peak memory and time-to-first-row for the row, streaming
+and columnar parsing modes on synthetic rent rolls and operating statements
+in several CSV dialects/encodings and XLSX. Every measurement runs in a fresh
+process, and results are written as JSON so they can be compared between
+releases.
+
+Usage:
+    python benchmarks/etl_suite.py [--sizes 1000 100000 1000000]
+        [--datasets rent_roll operating_statement] [--formats ...]
+        [--workdir DIR] [--output bench_results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from synthetic import CSV_VARIANTS, DATASETS, ensure_file  # noqa: E402
+
+
+def _mode_functions() -> Dict[str, Dict[str, Callable[[str], Iterator[Any]]]]:
+    """
+    Parsing modes per file kind, each returning an iterator over output units.
+
+    Imported lazily so that measured processes pay import cost before timing.
+    """
+    from backend.etl.columnar import read_columns
+    from backend.etl.parsers import iter_csv, iter_xlsx, parse_csv, parse_xlsx
+
+    def columnar(path: str) -> Iterator[Any]:
+        columns = read_columns(path)
+        return iter(next(iter(columns.values()), []))
+
+    return {
+        "csv": {
+            "parse_csv": lambda path: iter(parse_csv(path)),
+            "iter_csv": iter_csv,
+            "iter_csv_batched": lambda path: (row for batch in iter_csv(path, batch_size=10_000) for row in batch),
+            "columnar": columnar,
+        },
+        "xlsx": {
+            "parse_xlsx": lambda path: iter(parse_xlsx(path)),
+            "iter_xlsx": iter_xlsx,
+            "columnar": columnar,
+        },
+    }
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run(kind: str, mode: str, path: str, queue) -> None:
+    """Measure one mode on one file inside a child process."""
+    function = _mode_functions()[kind][mode]
+    baseline_rss = _peak_rss_mib()
+    start = time.perf_counter()
+    iterator = function(path)
+    rows = 0
+    first_row = None
+    for _ in iterator:
+        if first_row is None:
+            first_row = time.perf_counter() - start
+        rows += 1
+    elapsed = time.perf_counter() - start
+    queue.put({
+        "rows": rows,
+        "seconds": elapsed,
+        "time_to_first_row": first_row if first_row is not None else elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else None,
+        "peak_rss_mib": _peak_rss_mib(),
+        "baseline_rss_mib": baseline_rss,
+    })
+
+
+def measure(kind: str, mode: str, path: Path) -> Dict[str, Any]:
+    """
+    Measure one parsing mode on one file in a fresh process.
+
+    Args:
+        kind: ``"csv"`` or ``"xlsx"``
+        mode: Mode name from ``_mode_functions``
+        path: File to parse
+
+    Returns:
+        Measurement dictionary
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run, args=(kind, mode, str(path), queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def run_suite(sizes: List[int], datasets: List[str], formats: List[str], workdir: Path) -> Dict[str, Any]:
+    """
+    Run every (dataset, size, format, mode) combination.
+
+    Args:
+        sizes: Row counts to benchmark
+        datasets: Dataset names from ``synthetic.DATASETS``
+        formats: ``"xlsx"`` and/or CSV variant names
+        workdir: Directory for generated input files
+
+    Returns:
+        Dictionary with ``metadata`` and a flat list of ``results``
+    """
+    modes = _mode_functions()
+    results = []
+    for dataset in datasets:
+        for size in sizes:
+            for file_format in formats:
+                path = ensure_file(workdir, dataset, size, file_format)
+                kind = "xlsx" if file_format == "xlsx" else "csv"
+                for mode in modes[kind]:
+                    result = measure(kind, mode, path)
+                    result.update({"dataset": dataset, "size": size, "format": file_format, "mode": mode,
+                                   "file_bytes": path.stat().st_size})
+                    results.append(result)
+                    print(f"{dataset:<20} {size:>9} {file_format:<17} {mode:<17} "
+                          f"{result['seconds']:>8.2f}s {result['rows_per_sec'] or 0:>11,.0f} rows/s "
+                          f"ttfr {result['time_to_first_row']:>7.3f}s peak {result['peak_rss_mib']:>8.1f} MiB",
+                          flush=True)
+    return {"metadata": _metadata(), "results": results}
+
+
+def main() -> None:
+    all_formats = [name for name, _, _ in CSV_VARIANTS] + ["xlsx"]
+    parser = argparse.ArgumentParser(description="ETL ingestion benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--formats", nargs="+", choices=all_formats, default=all_formats)
+    parser.add_argument("--workdir", type=Path, default=Path("bench_data"),
+                        help="where generated inputs are cached between runs")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    args = parser.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    report = run_suite(args.sizes, args.datasets, args.formats, args.workdir)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
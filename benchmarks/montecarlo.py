@@ -0,0 +1,60 @@
+"""
+Benchmark Monte Carlo simulation: trials per second by worker count.
+
+Simulates the moderate assumption set with uncertain rent growth, exit cap,
+vacancy and interest rate (exit cap and interest rate correlated).
+
+Usage:
+    python benchmarks/montecarlo.py [--trials 100000 1000000] [--workers 1 4]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from backend.underwriting.montecarlo import UncertainAssumption, run_monte_carlo  # noqa: E402
+
+ASSUMPTIONS_DIR = Path(__file__).resolve().parents[1] / "data" / "assumptions"
+
+UNCERTAIN = [
+    UncertainAssumption("rent_growth_rate", 0.03, 0.01),
+    UncertainAssumption("exit_cap_rate", 0.06, 0.005, 0.005),
+    UncertainAssumption("vacancy_rate", 0.05, 0.015, 0.0, 1.0),
+    UncertainAssumption("interest_rate", 0.055, 0.005, 0.0),
+]
+
+CORRELATION = [
+    [1.0, 0.0, 0.0, 0.0],
+    [0.0, 1.0, 0.0, 0.6],
+    [0.0, 0.0, 1.0, 0.0],
+    [0.0, 0.6, 0.0, 1.0],
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    assumptions = json.loads((ASSUMPTIONS_DIR / "moderate.json").read_text())
+    for trials in args.trials:
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = run_monte_carlo(10_000_000, 1_200_000, assumptions, UNCERTAIN, CORRELATION,
+                                     trials=trials, seed=42, chunk_size=args.chunk_size,
+                                     max_workers=workers)
+            seconds = time.perf_counter() - start
+            print(f"{trials:>10,} trials  {workers:>2} workers  {seconds:7.2f}s  "
+                  f"{trials / seconds:>10,.0f} trials/s  "
+                  f"IRR p5/p50/p95 {result.irr.percentiles[5]:.2%}/{result.irr.percentiles[50]:.2%}/"
+                  f"{result.irr.percentiles[95]:.2%}")
+
+
+if __name__ == "__main__":
+    main()
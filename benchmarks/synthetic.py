@@ -0,0 +1,148 @@
+"""
+Synthetic rent rolls and operating statements (T-12s) for benchmarks.
+
+Generated files are deterministic for a given size and seed, and are reused
+from the work directory when they already exist, since writing million-row
+XLSX files takes minutes.
+"""
+
+import csv
+import random
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+import openpyxl
+
+RENT_ROLL_HEADERS = [
+    "Unit", "Unit Type", "Sq Ft", "Tenant", "Lease Start", "Lease End",
+    "Market Rent", "Actual Rent", "Deposit", "Status",
+]
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+OPERATING_STATEMENT_HEADERS = ["GL Code", "Account", "Category"] + MONTHS + ["Total"]
+
+_ACCOUNTS = [
+    ("Gross Potential Rent", "Revenue"),
+    ("Loss to Lease", "Revenue"),
+    ("Vacancy Loss", "Revenue"),
+    ("Utility Reimbursements", "Revenue"),
+    ("Property Taxes", "Expense"),
+    ("Insurance", "Expense"),
+    ("Repairs & Maintenance", "Expense"),
+    ("Payroll", "Expense"),
+    ("Management Fee", "Expense"),
+    ("Utilities", "Expense"),
+]
+
+_TENANT_NAMES = ["Smith", "Johnson", "Garcia", "Nguyen", "Müller", "Peña", "O'Brien", "José Ruiz", "Chen", "Kowalski"]
+
+# CSV variants exercised by the suite: (name, delimiter, encoding)
+CSV_VARIANTS = [
+    ("comma_utf8", ",", "utf-8"),
+    ("semicolon_latin1", ";", "latin-1"),
+    ("tab_utf8", "\t", "utf-8"),
+]
+
+
+def rent_roll_rows(rows: int, seed: int = 42) -> Iterator[List[object]]:
+    """
+    Generate rent roll data rows.
+
+    Args:
+        rows: Number of rows
+        seed: Random seed
+
+    Yields:
+        Lists of cell values matching ``RENT_ROLL_HEADERS``
+    """
+    rng = random.Random(seed)
+    for unit in range(1, rows + 1):
+        market_rent = rng.randint(900, 2600)
+        status = rng.choice(["Occupied", "Occupied", "Occupied", "Vacant", "Notice"])
+        yield [
+            f"{unit:07d}",
+            rng.choice(["1x1", "2x1", "2x2", "3x2"]),
+            rng.randint(550, 1400),
+            "" if status == "Vacant" else f"{rng.choice(_TENANT_NAMES)} {unit}",
+            f"2024-{rng.randint(1, 12):02d}-01",
+            f"2025-{rng.randint(1, 12):02d}-01",
+            f"${market_rent:,.2f}",
+            "" if status == "Vacant" else f"${market_rent - rng.randint(0, 150):,.2f}",
+            500,
+            status,
+        ]
+
+
+def operating_statement_rows(rows: int, seed: int = 42) -> Iterator[List[object]]:
+    """
+    Generate operating statement (T-12) data rows.
+
+    Args:
+        rows: Number of rows (GL lines)
+        seed: Random seed
+
+    Yields:
+        Lists of cell values matching ``OPERATING_STATEMENT_HEADERS``
+    """
+    rng = random.Random(seed)
+    for line in range(rows):
+        account, category = _ACCOUNTS[line % len(_ACCOUNTS)]
+        monthly = [round(rng.uniform(1_000, 250_000), 2) for _ in MONTHS]
+        yield [f"{4000 + line:07d}", account, category] + monthly + [round(sum(monthly), 2)]
+
+
+DATASETS = {
+    "rent_roll": (RENT_ROLL_HEADERS, rent_roll_rows),
+    "operating_statement": (OPERATING_STATEMENT_HEADERS, operating_statement_rows),
+}
+
+
+def write_csv(path: Path, headers: Sequence[str], rows: Iterator[List[object]],
+              delimiter: str = ",", encoding: str = "utf-8") -> None:
+    """Write rows to a CSV file with the given delimiter and encoding."""
+    with open(path, "w", newline="", encoding=encoding, errors="replace") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def write_xlsx(path: Path, headers: Sequence[str], rows: Iterator[List[object]]) -> None:
+    """Write rows to an XLSX file using openpyxl's write-only mode."""
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Data")
+    worksheet.append(list(headers))
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def ensure_file(workdir: Path, dataset: str, rows: int, file_format: str, seed: int = 42) -> Path:
+    """
+    Return the path of a synthetic file, generating it if missing.
+
+    Args:
+        workdir: Directory holding generated files
+        dataset: Key in ``DATASETS``
+        rows: Number of data rows
+        file_format: ``"xlsx"`` or a CSV variant name from ``CSV_VARIANTS``
+        seed: Random seed
+
+    Returns:
+        Path to the generated file
+    """
+    headers, generator = DATASETS[dataset]
+    suffix = "xlsx" if file_format == "xlsx" else "csv"
+    path = Path(workdir) / f"{dataset}_{rows}_{file_format}_{seed}.{suffix}"
+    if path.exists():
+        return path
+
+    temp_path = path.with_name(f".{path.name}.tmp")
+    if file_format == "xlsx":
+        write_xlsx(temp_path, headers, generator(rows, seed))
+    else:
+        variants = {name: (delimiter, encoding) for name, delimiter, encoding in CSV_VARIANTS}
+        delimiter, encoding = variants[file_format]
+        write_csv(temp_path, headers, generator(rows, seed), delimiter, encoding)
+    temp_path.replace(path)
+    return path
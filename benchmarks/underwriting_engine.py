@@ -0,0 +1,88 @@
+"""
+Benchmark the vectorized cash-flow engine: deals per second by batch size.
+
+Compares one vectorized call over the whole batch with calling the engine
+once per deal, on synthetic deals with mixed holding periods.
+
+Usage:
+    python benchmarks/underwriting_engine.py [--deals 1000 100000 1000000] [--loop-deals 2000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from backend.underwriting.engine import flatten_assumptions, project_cash_flows  # noqa: E402
+
+ASSUMPTIONS_DIR = Path(__file__).resolve().parents[1] / "data" / "assumptions"
+
+
+def synthetic_deals(deals: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Generate deal inputs around the moderate assumption set.
+
+    Args:
+        deals: Number of deals
+        seed: Random seed
+
+    Returns:
+        Dictionary with ``purchase_price``, ``gross_potential_rent`` and
+        per-deal ``assumptions`` arrays
+    """
+    rng = np.random.default_rng(seed)
+    base = flatten_assumptions(json.loads((ASSUMPTIONS_DIR / "moderate.json").read_text()))
+    assumptions = {key: np.full(deals, float(value)) for key, value in base.items()}
+    assumptions["holding_period"] = rng.integers(3, 11, deals).astype(float)
+    assumptions["rent_growth_rate"] = rng.uniform(0.01, 0.05, deals)
+    assumptions["exit_cap_rate"] = rng.uniform(0.045, 0.075, deals)
+    assumptions["vacancy_rate"] = rng.uniform(0.03, 0.08, deals)
+    price = rng.uniform(5e6, 80e6, deals)
+    return {
+        "purchase_price": price,
+        "gross_potential_rent": price * rng.uniform(0.08, 0.12, deals),
+        "assumptions": assumptions,
+    }
+
+
+def time_vectorized(deals: int) -> float:
+    """Seconds for one vectorized call over ``deals`` deals."""
+    inputs = synthetic_deals(deals)
+    start = time.perf_counter()
+    project_cash_flows(inputs["purchase_price"], inputs["gross_potential_rent"], inputs["assumptions"])
+    return time.perf_counter() - start
+
+
+def time_per_deal(deals: int) -> float:
+    """Seconds for calling the engine once per deal."""
+    inputs = synthetic_deals(deals)
+    sets = [{key: float(values[i]) for key, values in inputs["assumptions"].items()} for i in range(deals)]
+    start = time.perf_counter()
+    for i in range(deals):
+        project_cash_flows(inputs["purchase_price"][i], inputs["gross_potential_rent"][i], sets[i])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deals", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--loop-deals", type=int, default=2_000,
+                        help="deals for the one-call-per-deal baseline")
+    args = parser.parse_args()
+
+    print(f"{'deals':>9} {'mode':<11} {'seconds':>9} {'deals/sec':>13}")
+    seconds = time_per_deal(args.loop_deals)
+    print(f"{args.loop_deals:>9} {'per_deal':<11} {seconds:>9.3f} {args.loop_deals / seconds:>13,.0f}")
+    for deals in args.deals:
+        seconds = time_vectorized(deals)
+        print(f"{deals:>9} {'vectorized':<11} {seconds:>9.3f} {deals / seconds:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark XLSX rent-roll ingestion: full-mode loading vs. the read-only fast path.
+
+Each measurement runs in a fresh process so peak RSS reflects a single parse.
+
+Usage:
+    python benchmarks/xlsx_parsing.py [--rows 50000 500000] [--workdir DIR]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from backend.etl.parsers import parse_xlsx  # noqa: E402
+from synthetic import ensure_file  # noqa: E402
+
+
+def parse_xlsx_full_mode(path: str) -> List[Dict[str, Any]]:
+    """Baseline: the original full-mode, cell-object implementation of parse_xlsx."""
+    workbook = openpyxl.load_workbook(path, data_only=True)
+    worksheet = workbook.active
+    headers = []
+    for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row):
+        if any(cell.value for cell in row):
+            headers = [str(cell.value).strip().replace(' ', '_').lower()
+                       if cell.value else f"column_{i+1}"
+                       for i, cell in enumerate(row)]
+            break
+    data = []
+    for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
+        if any(cell.value for cell in row):
+            row_dict = {}
+            for i, cell in enumerate(row):
+                if i < len(headers):
+                    value = cell.value
+                    row_dict[headers[i]] = str(value).strip() if value is not None else None
+            data.append(row_dict)
+    workbook.close()
+    return data
+
+
+IMPLEMENTATIONS = {
+    "full_mode": parse_xlsx_full_mode,
+    "read_only": parse_xlsx,
+}
+
+
+def _measure(name: str, path: str, queue) -> None:
+    """Run one implementation and report rows, seconds and peak RSS (MiB)."""
+    start = time.perf_counter()
+    rows = len(IMPLEMENTATIONS[name](path))
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    queue.put((rows, elapsed, peak / divisor))
+
+
+def measure(name: str, path: str) -> Dict[str, Any]:
+    """
+    Measure one implementation in a fresh process.
+
+    Args:
+        name: Key in ``IMPLEMENTATIONS``
+        path: XLSX file to parse
+
+    Returns:
+        Dictionary with rows, seconds, rows_per_sec and peak_rss_mib
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(name, path, queue))
+    process.start()
+    rows, elapsed, peak_rss = queue.get()
+    process.join()
+    return {
+        "implementation": name,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("inf"),
+        "peak_rss_mib": peak_rss,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 500_000])
+    parser.add_argument("--workdir", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as temp_dir:
+        print(f"{'rows':>9} {'implementation':<12} {'seconds':>9} {'rows/sec':>11} {'peak RSS MiB':>13}")
+        for rows in args.rows:
+            path = ensure_file(Path(temp_dir), "rent_roll", rows, "xlsx")
+            for name in IMPLEMENTATIONS:
+                result = measure(name, str(path))
+                print(f"{rows:>9} {name:<12} {result['seconds']:>9.2f} "
+                      f"{result['rows_per_sec']:>11,.0f} {result['peak_rss_mib']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
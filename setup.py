@@ -9,6 +9,7 @@ setup(
     python_requires=">=3.11",
     install_requires=[
         "fastapi==0.104.1",
+        "typing-extensions==4.8.0",
         "uvicorn[standard]==0.24.0",
         "python-multipart==0.0.6",
         "sqlalchemy==2.0.23",
@@ -21,6 +22,7 @@ setup(
         "pandas==2.1.3",
         "numpy==1.25.2",
         "openpyxl==3.1.2",
+        "pdfplumber==0.10.3",
         "python-pptx==0.6.23",
         "weasyprint==60.2",
         "httpx==0.25.2",
@@ -29,6 +31,9 @@ setup(
         "prometheus-client==0.19.0",
     ],
     extras_require={
+        "ocr": [
+            "pytesseract==0.3.10",
+        ],
         "dev": [
             "pytest==7.4.3",
             "pytest-asyncio==0.21.1",
@@ -0,0 +1,120 @@
+"""
+Parallel batch ingestion of many files through the ETL parsers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .parsers import parse_csv, parse_pdf, parse_xlsx
+
+# Parser used for each supported file extension
+PARSERS = {
+    '.csv': parse_csv,
+    '.xlsx': parse_xlsx,
+    '.pdf': parse_pdf,
+}
+
+
+class ParseResult(NamedTuple):
+    """Outcome of parsing one file in a batch."""
+
+    path: str
+    rows: Optional[List[Dict[str, Any]]]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file parsed successfully."""
+        return self.error is None
+
+
+def parse_file(path: str, pdf_workers: Optional[int] = None) -> ParseResult:
+    """
+    Parse one file with the parser matching its extension.
+
+    Errors are captured in the result instead of being raised.
+
+    Args:
+        path: Path to a ``.csv``, ``.xlsx`` or ``.pdf`` file
+        pdf_workers: Page-extraction worker processes for PDFs (defaults to
+            the CPU count); ``1`` keeps extraction in the calling process
+
+    Returns:
+        ParseResult with either ``rows`` or ``error`` set
+    """
+    parser = PARSERS.get(Path(path).suffix.lower())
+    if parser is None:
+        return ParseResult(path, None, f"Unsupported file type: {path}")
+    try:
+        if parser is parse_pdf:
+            return ParseResult(path, parse_pdf(path, max_workers=pdf_workers), None)
+        return ParseResult(path, parser(path), None)
+    except Exception as e:
+        return ParseResult(path, None, f"{type(e).__name__}: {e}")
+
+
+def _parse_chunk(paths: List[str], pdf_workers: Optional[int] = 1) -> List[ParseResult]:
+    """
+    Parse a chunk of files inside a worker process.
+
+    PDFs are extracted serially by default: the batch already runs one worker
+    per CPU, and a page pool per worker would oversubscribe the machine.
+    """
+    return [parse_file(path, pdf_workers) for path in paths]
+
+
+def parse_many(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+) -> Iterator[ParseResult]:
+    """
+    Parse many files in parallel, yielding results as they finish.
+
+    Files are grouped into chunks of ``chunksize`` and each chunk is parsed in
+    a worker process. Results therefore arrive in completion order, not input
+    order. A file that fails to parse yields a result with ``error`` set; it
+    never aborts the rest of the batch.
+
+    Args:
+        paths: Paths of the files to parse
+        max_workers: Number of worker processes (defaults to the CPU count);
+            ``1`` parses serially in the calling process
+        chunksize: Number of files handed to a worker per task
+
+    Yields:
+        ParseResult for every input path
+
+    Raises:
+        ValueError: If ``max_workers`` or ``chunksize`` is not positive
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+
+    paths = [str(path) for path in paths]
+    if not paths:
+        return
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+
+    if workers == 1:
+        for chunk in chunks:
+            # No batch pool: a PDF may use its own page-extraction pool
+            yield from _parse_chunk(chunk, pdf_workers=max_workers)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_parse_chunk, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed for memory); report every
+                # file in its chunk rather than failing the batch
+                results = [ParseResult(path, None, f"{type(e).__name__}: {e}")
+                           for path in futures[future]]
+            yield from results
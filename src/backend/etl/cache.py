@@ -0,0 +1,424 @@
+"""
+Content-addressed on-disk cache for parse results.
+
+Entries are keyed by the SHA-256 of the input file's bytes plus the parser
+name, parser version and options, so re-uploading an identical workbook under
+a different name still hits. Each entry is stored in a compact binary layout
+that is memory-mapped on read:
+
+    magic (8 bytes) | header length (uint64) | JSON header | aligned buffers
+
+Row tables store each column as one UTF-8 text blob with character offsets
+and a per-row state byte (value / None / missing), so loading a table never
+re-runs the CSV or XLSX parser. Numeric NumPy arrays are returned as
+zero-copy, read-only views of the mapped file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.monitoring.metrics import inc_parse_cache_hit, inc_parse_cache_miss
+
+_MAGIC = b"MFPCACH1"
+_ALIGNMENT = 64
+_ENTRY_SUFFIX = ".bin"
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Number of (path, size, mtime) -> content digest results kept per cache
+_DIGEST_MEMO_SIZE = 1024
+
+# Per-row cell state in table entries
+_VALUE, _NONE, _MISSING = 0, 1, 2
+
+
+class CacheEncodingError(TypeError):
+    """Raised when a parse result has no binary cache representation."""
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _encode_scalar(value: Any) -> Any:
+    """Encode a scalar as a JSON-compatible value."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise CacheEncodingError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode_scalar(value: Any) -> Any:
+    """Invert :func:`_encode_scalar`."""
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+    return value
+
+
+def _encode_table(rows: List[Dict[str, Any]], buffers: List[Tuple[str, np.ndarray]]) -> Dict[str, Any]:
+    """Encode a list of row dictionaries with string/None values."""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+
+    encoded_columns = []
+    for index, column in enumerate(columns):
+        states = np.empty(len(rows), dtype=np.uint8)
+        offsets = np.empty(len(rows) + 1, dtype=np.int64)
+        offsets[0] = 0
+        parts = []
+        position = 0
+        for i, row in enumerate(rows):
+            if column not in row:
+                states[i] = _MISSING
+            else:
+                value = row[column]
+                if value is None:
+                    states[i] = _NONE
+                elif isinstance(value, str):
+                    states[i] = _VALUE
+                    parts.append(value)
+                    position += len(value)
+                else:
+                    raise CacheEncodingError(f"Cannot cache row value of type {type(value).__name__}")
+            offsets[i + 1] = position
+        text = np.frombuffer(''.join(parts).encode('utf-8'), dtype=np.uint8)
+        buffers.append((f"c{index}.states", states))
+        buffers.append((f"c{index}.offsets", offsets))
+        buffers.append((f"c{index}.text", text))
+        encoded_columns.append(column)
+    return {"kind": "table", "rows": len(rows), "columns": encoded_columns}
+
+
+def _encode_mapping(mapping: Dict[str, Any], buffers: List[Tuple[str, np.ndarray]]) -> Dict[str, Any]:
+    """Encode a mapping of names to scalars or NumPy arrays."""
+    entries = {}
+    for name, value in mapping.items():
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind in "biuf":
+                buffer_name = f"m{len(buffers)}"
+                buffers.append((buffer_name, np.ascontiguousarray(value)))
+                entries[name] = {"array": buffer_name}
+            else:
+                entries[name] = {"objects": [_encode_scalar(item) for item in value.ravel().tolist()],
+                                 "shape": list(value.shape)}
+        else:
+            entries[name] = {"scalar": _encode_scalar(value)}
+    return {"kind": "mapping", "entries": entries}
+
+
+def encode(value: Any) -> bytes:
+    """
+    Serialize a parse result to the binary cache format.
+
+    Args:
+        value: List of row dictionaries, or mapping of names to scalars/arrays
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        CacheEncodingError: If the value cannot be represented
+    """
+    buffers: List[Tuple[str, np.ndarray]] = []
+    if isinstance(value, list):
+        header = _encode_table(value, buffers)
+    elif isinstance(value, dict):
+        header = _encode_mapping(value, buffers)
+    else:
+        raise CacheEncodingError(f"Cannot cache result of type {type(value).__name__}")
+
+    # Buffer offsets are relative to the (aligned) start of the data section
+    layout = {}
+    offset = 0
+    for name, array in buffers:
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape),
+                        "offset": offset, "nbytes": array.nbytes}
+        offset += array.nbytes
+    header["buffers"] = layout
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    data_start = _align(len(_MAGIC) + 8 + len(header_bytes))
+    out = bytearray(data_start + offset)
+    out[:len(_MAGIC)] = _MAGIC
+    struct.pack_into('<Q', out, len(_MAGIC), len(header_bytes))
+    out[len(_MAGIC) + 8:len(_MAGIC) + 8 + len(header_bytes)] = header_bytes
+    for name, array in buffers:
+        start = data_start + layout[name]["offset"]
+        out[start:start + array.nbytes] = array.tobytes()
+    return bytes(out)
+
+
+def decode(buffer: Any) -> Any:
+    """
+    Deserialize a parse result from the binary cache format.
+
+    Args:
+        buffer: Bytes-like object (typically an ``mmap``) holding an entry
+
+    Returns:
+        The cached parse result
+
+    Raises:
+        ValueError: If the buffer is not a valid cache entry
+    """
+    view = memoryview(buffer)
+    if bytes(view[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError("Not a parse cache entry")
+    (header_length,) = struct.unpack_from('<Q', view, len(_MAGIC))
+    header_start = len(_MAGIC) + 8
+    header = json.loads(bytes(view[header_start:header_start + header_length]))
+    data_start = _align(header_start + header_length)
+
+    def array(name: str) -> np.ndarray:
+        spec = header["buffers"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = spec["nbytes"] // dtype.itemsize if dtype.itemsize else 0
+        result = np.frombuffer(view, dtype=dtype, count=count, offset=data_start + spec["offset"])
+        return result.reshape(spec["shape"])
+
+    if header["kind"] == "table":
+        rows: List[Dict[str, Any]] = [{} for _ in range(header["rows"])]
+        for index, column in enumerate(header["columns"]):
+            states = array(f"c{index}.states")
+            offsets = array(f"c{index}.offsets").tolist()
+            text = array(f"c{index}.text").tobytes().decode('utf-8')
+            for i, state in enumerate(states.tolist()):
+                if state == _VALUE:
+                    rows[i][column] = text[offsets[i]:offsets[i + 1]]
+                elif state == _NONE:
+                    rows[i][column] = None
+        return rows
+
+    if header["kind"] == "mapping":
+        result = {}
+        for name, entry in header["entries"].items():
+            if "array" in entry:
+                result[name] = array(entry["array"])
+            elif "objects" in entry:
+                objects = np.empty(len(entry["objects"]), dtype=object)
+                objects[:] = [_decode_scalar(item) for item in entry["objects"]]
+                result[name] = objects.reshape(entry["shape"])
+            else:
+                result[name] = _decode_scalar(entry["scalar"])
+        return result
+
+    raise ValueError(f"Unknown parse cache entry kind: {header['kind']}")
+
+
+class ParseCache:
+    """
+    Size-bounded, content-addressed parse result cache with LRU eviction.
+
+    Recency is persisted through entry file mtimes, so the eviction order
+    survives restarts and is shared by processes using the same directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding cache entries (created if missing)
+            max_bytes: Maximum total size of cache entries on disk
+
+        Raises:
+            ValueError: If ``max_bytes`` is not positive
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+        entries = []
+        for entry in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, entry.stem, stat.st_size))
+        self._entries: "OrderedDict[str, int]" = OrderedDict(
+            (key, size) for _, key, size in sorted(entries)
+        )
+        self._total_bytes = sum(self._entries.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cache entries on disk."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key_for(self, path: str, parser: str, version: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a file.
+
+        The content digest is memoized per (path, size, mtime) so repeated
+        lookups of an unchanged file in one process hash it only once; the
+        memo keeps the most recently used ``_DIGEST_MEMO_SIZE`` files.
+
+        Args:
+            path: Path to the input file
+            parser: Parser name (e.g. ``"csv"``)
+            version: Parser version; bump it whenever parser output changes
+            options: Parser options that affect the result
+
+        Returns:
+            Hex cache key
+        """
+        stat = os.stat(path)
+        stamp = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            content = self._digests.get(stamp)
+            if content is not None:
+                self._digests.move_to_end(stamp)
+        if content is None:
+            content = file_digest(path)
+            with self._lock:
+                self._digests[stamp] = content
+                while len(self._digests) > _DIGEST_MEMO_SIZE:
+                    self._digests.popitem(last=False)
+        material = json.dumps([content, parser, version, options or {}], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Load a cached result.
+
+        Args:
+            key: Cache key from :meth:`key_for`
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            result = decode(mapped)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        Store a result, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key from :meth:`key_for`
+            value: Parse result to store
+
+        Returns:
+            True if the result was stored, False if it cannot be encoded or
+            is larger than the whole cache
+        """
+        try:
+            payload = encode(value)
+        except CacheEncodingError:
+            return False
+        if len(payload) > self.max_bytes:
+            return False
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return False
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    self._entry_path(evicted).unlink()
+                except OSError:
+                    pass
+        return True
+
+    def get_or_parse(
+        self,
+        path: str,
+        parser: str,
+        version: str,
+        parse: Callable[[], Any],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Return the cached result for a file, parsing and storing it on a miss.
+
+        Args:
+            path: Path to the input file
+            parser: Parser name, also used as the metrics label
+            version: Parser version
+            parse: Zero-argument callable producing the result on a miss
+            options: Parser options that affect the result
+
+        Returns:
+            Parse result
+        """
+        key = self.key_for(path, parser, version, options)
+        cached = self.get(key)
+        if cached is not None:
+            inc_parse_cache_hit(parser)
+            return cached
+        inc_parse_cache_miss(parser)
+        result = parse()
+        self.put(key, result)
+        return result
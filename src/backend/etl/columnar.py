@@ -0,0 +1,249 @@
+"""
+Typed columnar output for the ETL parsers.
+
+The row parsers return every value as a stripped string. This module turns
+those rows into one typed NumPy array per column (or a pandas DataFrame), with
+type inference applied to whole columns at once.
+"""
+
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .parsers import _batched, iter_csv, iter_xlsx
+
+# Whole-value patterns, applied with Series.str.fullmatch
+_INTEGER_PATTERN = r'[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)'
+# Zero-padded codes ("0101", ZIP "02134") are identifiers, not numbers
+_PADDED_PATTERN = r'[-+]?0\d[\d,]*'
+# Accounting negatives are wrapped in parentheses: "(300.00)"
+_DECIMAL_PATTERN = r'(\()?[-+]?\$?\s*(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+)(?(1)\))'
+_PERCENT_PATTERN = r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)\s*%'
+_DATE_PATTERN = (
+    r'\d{4}-\d{1,2}-\d{1,2}(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?'
+    r'|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}'
+    r'|[A-Za-z]{3,9}\.? \d{1,2},? \d{4}'
+)
+
+_COLUMNAR_READERS = {
+    '.csv': iter_csv,
+    '.xlsx': iter_xlsx,
+}
+
+_BATCH_SIZE = 10_000
+
+# Candidate types are rejected on this many leading values before a full pass
+_SAMPLE_SIZE = 64
+
+
+def _all_match(present: pd.Series, pattern: str) -> bool:
+    """
+    Check that every value fully matches ``pattern``.
+
+    A small leading sample is checked first so that columns of the wrong type
+    are rejected without a full pass.
+
+    Args:
+        present: Non-blank stripped strings
+        pattern: Regular expression to match against whole values
+
+    Returns:
+        True if all values match
+    """
+    if not present.iloc[:_SAMPLE_SIZE].str.fullmatch(pattern).all():
+        return False
+    return bool(present.str.fullmatch(pattern).all())
+
+
+def _parse_numbers(present: pd.Series) -> Union[pd.Series, None]:
+    """
+    Convert currency, decimal and accounting-negative strings to numbers.
+
+    Args:
+        present: Non-blank stripped strings
+
+    Returns:
+        Float series, or None if any value is not numeric
+    """
+    if not _all_match(present, _DECIMAL_PATTERN):
+        return None
+    negative = present.str.startswith('(')
+    numbers = pd.to_numeric(present.str.replace(r'[$,()\s]', '', regex=True))
+    if negative.any():
+        numbers = numbers.where(~negative, -numbers)
+    return numbers
+
+
+def _parse_dates(present: pd.Series) -> Union[pd.Series, None]:
+    """
+    Convert date strings to datetimes.
+
+    Args:
+        present: Non-blank stripped strings
+
+    Returns:
+        Datetime series, or None if any value is not a date
+    """
+    if not _all_match(present, _DATE_PATTERN):
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        dates = pd.to_datetime(present, errors='coerce')
+        if dates.isna().any():
+            # Mixed layouts across rows ("2024-01-01" and "01/15/2024")
+            dates = pd.to_datetime(present, errors='coerce', format='mixed')
+    if dates.isna().any():
+        return None
+    return dates
+
+
+def infer_column(values: Iterable[Any]) -> np.ndarray:
+    """
+    Infer a column's type and convert it to a typed NumPy array.
+
+    Blank values (None or empty strings) are ignored when choosing the type and
+    become NaN/NaT (or None for text columns). Types are tried in order:
+
+    * integers (``"150"``, ``"1,250"``) -> ``int64``, or ``float64`` with blanks
+    * currency and decimals (``"$1,250.00"``, ``"(300.00)"``) -> ``float64``
+    * percentages (``"5.5%"``) -> ``float64`` fractions (``0.055``)
+    * dates (``"2024-01-15"``, ``"01/15/2024"``) -> ``datetime64[ns]``
+    * anything else -> ``object`` array of strings
+
+    Numeric columns with a zero-padded value (``"0101"``, ``"02134"``, but not
+    a lone ``"0"``) or an integer that does not fit ``int64`` stay text, since
+    those are codes rather than quantities.
+
+    Args:
+        values: Column values as produced by the row parsers
+
+    Returns:
+        Typed NumPy array with one entry per input value
+    """
+    series = pd.Series(list(values), dtype=object)
+    blank = series.isna() | (series == '')
+    if blank.all():
+        return np.full(len(series), np.nan)
+
+    present = series[~blank].astype(str).str.strip()
+
+    if _all_match(present, _INTEGER_PATTERN):
+        if present.str.fullmatch(_PADDED_PATTERN).any():
+            return _text(present, blank)
+        integers = pd.to_numeric(present.str.replace(',', '', regex=False))
+        if integers.dtype != np.int64:
+            # Beyond int64: pandas falls back to uint64 or Python ints
+            return _text(present, blank)
+        if not blank.any():
+            return integers.to_numpy(dtype=np.int64)
+        return _scatter(integers.to_numpy(dtype=np.float64), blank, np.nan)
+
+    numbers = _parse_numbers(present)
+    if numbers is not None:
+        if present.str.fullmatch(_PADDED_PATTERN).any():
+            return _text(present, blank)
+        return _scatter(numbers.to_numpy(dtype=np.float64), blank, np.nan)
+
+    if _all_match(present, _PERCENT_PATTERN):
+        percents = pd.to_numeric(present.str.replace(r'[%\s]', '', regex=True)) / 100.0
+        return _scatter(percents.to_numpy(dtype=np.float64), blank, np.nan)
+
+    dates = _parse_dates(present)
+    if dates is not None:
+        return _scatter(dates.to_numpy(dtype='datetime64[ns]'), blank, np.datetime64('NaT', 'ns'))
+
+    return _text(present, blank)
+
+
+def _text(present: pd.Series, blank: pd.Series) -> np.ndarray:
+    """
+    Keep a column as strings, with None at blank positions.
+
+    Args:
+        present: Non-blank stripped strings
+        blank: Boolean mask of blank positions
+
+    Returns:
+        ``object`` array aligned with the original column
+    """
+    text = np.empty(len(blank), dtype=object)
+    text[~blank.to_numpy()] = present.to_numpy(dtype=object)
+    return text
+
+
+def _scatter(present_values: np.ndarray, blank: pd.Series, fill: Any) -> np.ndarray:
+    """
+    Place converted non-blank values back at their original positions.
+
+    Args:
+        present_values: Converted values for the non-blank positions
+        blank: Boolean mask of blank positions
+        fill: Value to use for blank positions
+
+    Returns:
+        Array aligned with the original column
+    """
+    mask = blank.to_numpy()
+    if not mask.any():
+        return present_values
+    result = np.full(len(mask), fill, dtype=present_values.dtype)
+    result[~mask] = present_values
+    return result
+
+
+def rows_to_columns(rows: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert parser row dictionaries into typed columns.
+
+    Columns appear in first-seen order; rows missing a column get a blank.
+
+    Args:
+        rows: Row dictionaries from ``parse_csv``/``parse_xlsx`` or their
+            streaming counterparts
+
+    Returns:
+        Dictionary mapping column name to a typed NumPy array
+    """
+    columns: Dict[str, List[Any]] = {}
+    count = 0
+    for batch in _batched(rows, _BATCH_SIZE):
+        for row in batch:
+            for key in row:
+                if key not in columns:
+                    columns[key] = [None] * count
+        for key, column in columns.items():
+            column.extend([row.get(key) for row in batch])
+        count += len(batch)
+    return {name: infer_column(values) for name, values in columns.items()}
+
+
+def read_columns(path: str, as_dataframe: bool = False) -> Union[Dict[str, np.ndarray], pd.DataFrame]:
+    """
+    Parse a CSV or XLSX file into typed columns.
+
+    This is the opt-in columnar counterpart of ``parse_csv``/``parse_xlsx``;
+    header normalization and dialect detection are identical.
+
+    Args:
+        path: Path to a ``.csv`` or ``.xlsx`` file
+        as_dataframe: Return a pandas DataFrame instead of a dict of arrays
+
+    Returns:
+        Dictionary of typed NumPy arrays, or a DataFrame
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file type is unsupported or the file is invalid
+    """
+    suffix = Path(path).suffix.lower()
+    reader = _COLUMNAR_READERS.get(suffix)
+    if reader is None:
+        raise ValueError(f"Unsupported file type for columnar parsing: {suffix or path}")
+
+    columns = rows_to_columns(reader(path))
+    if as_dataframe:
+        return pd.DataFrame(columns)
+    return columns
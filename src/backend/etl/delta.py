@@ -0,0 +1,264 @@
+"""
+Delta ingestion for recurring uploads of the same file (e.g. monthly rent rolls).
+
+Rows are fingerprinted by a configurable key (such as the unit number) and
+compared with the snapshot stored from the previous upload, so downstream
+processing only has to handle inserted, updated and removed rows.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .cache import decode, encode
+from .parsers import iter_csv, iter_xlsx
+
+# Reserved column holding each row's fingerprint inside a stored snapshot
+_FINGERPRINT_COLUMN = "__fingerprint__"
+
+_DELTA_READERS = {
+    '.csv': iter_csv,
+    '.xlsx': iter_xlsx,
+}
+
+
+class RowDelta(NamedTuple):
+    """Changes between two versions of a keyed table."""
+
+    inserted: List[Dict[str, Any]]
+    updated: List[Dict[str, Any]]
+    removed: List[Dict[str, Any]]
+    unchanged: int
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any row was inserted, updated or removed."""
+        return bool(self.inserted or self.updated or self.removed)
+
+
+def _key_columns(key: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    columns = (key,) if isinstance(key, str) else tuple(key)
+    if not columns:
+        raise ValueError("At least one key column is required")
+    return columns
+
+
+def row_key(row: Dict[str, Any], key_columns: Sequence[str]) -> Tuple[Any, ...]:
+    """
+    Extract a row's key.
+
+    Args:
+        row: Row dictionary
+        key_columns: Columns making up the key
+
+    Returns:
+        Tuple of key values
+
+    Raises:
+        ValueError: If a key column is missing or every key value is blank
+    """
+    try:
+        values = tuple(row[column] for column in key_columns)
+    except KeyError as e:
+        raise ValueError(f"Key column {e} not found in row")
+    if all(value is None for value in values):
+        raise ValueError(f"Row has a blank key: {row}")
+    return values
+
+
+def row_fingerprint(row: Dict[str, Any]) -> str:
+    """
+    Fingerprint a row's contents independently of column order.
+
+    Args:
+        row: Row dictionary
+
+    Returns:
+        Hex digest of the row's columns and values
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in sorted(row):
+        if column == _FINGERPRINT_COLUMN:
+            continue
+        value = row[column]
+        digest.update(column.encode('utf-8'))
+        digest.update(b'\x1f')
+        digest.update(b'\x00' if value is None else str(value).encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def _text_row(row: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Copy of a row with values as text, the form the parsers produce and snapshots store."""
+    text_row: Dict[str, Optional[str]] = {}
+    for column, value in row.items():
+        if not isinstance(column, str):
+            raise ValueError(f"Column names must be strings, got {column!r}")
+        text_row[column] = value if value is None or isinstance(value, str) else str(value)
+    return text_row
+
+
+def _index(rows: Iterable[Dict[str, Any]], key_columns: Sequence[str], label: str,
+           fingerprints: Optional[Sequence[str]] = None) -> Dict[Tuple[Any, ...], Tuple[str, Dict[str, Any]]]:
+    """Map each row key to its (fingerprint, row), rejecting duplicate keys."""
+    index: Dict[Tuple[Any, ...], Tuple[str, Dict[str, Any]]] = {}
+    for position, row in enumerate(rows):
+        stored = row.get(_FINGERPRINT_COLUMN)
+        if _FINGERPRINT_COLUMN in row:
+            row = {column: value for column, value in row.items() if column != _FINGERPRINT_COLUMN}
+        if fingerprints is not None:
+            fingerprint = fingerprints[position]
+        else:
+            fingerprint = stored or row_fingerprint(row)
+        key = row_key(row, key_columns)
+        if key in index:
+            raise ValueError(f"Duplicate key {key} in {label} rows")
+        index[key] = (fingerprint, row)
+    return index
+
+
+def _compare(old: Dict[Tuple[Any, ...], Tuple[str, Dict[str, Any]]],
+             new: Dict[Tuple[Any, ...], Tuple[str, Dict[str, Any]]]) -> RowDelta:
+    """Compare two keyed indexes built by :func:`_index`."""
+    inserted, updated = [], []
+    unchanged = 0
+    for row_id, (fingerprint, row) in new.items():
+        previous_entry = old.get(row_id)
+        if previous_entry is None:
+            inserted.append(row)
+        elif previous_entry[0] != fingerprint:
+            updated.append(row)
+        else:
+            unchanged += 1
+    removed = [row for row_id, (_, row) in old.items() if row_id not in new]
+    return RowDelta(inserted, updated, removed, unchanged)
+
+
+def diff_rows(
+    previous: Iterable[Dict[str, Any]],
+    current: Iterable[Dict[str, Any]],
+    key: Union[str, Sequence[str]],
+) -> RowDelta:
+    """
+    Compare two versions of a keyed table.
+
+    Args:
+        previous: Rows from the earlier version
+        current: Rows from the new version
+        key: Key column name, or several names for a composite key
+
+    Returns:
+        RowDelta with inserted and updated rows (from ``current``) and
+        removed rows (from ``previous``), each in their original order
+
+    Raises:
+        ValueError: If a key column is missing, blank or duplicated
+    """
+    key_columns = _key_columns(key)
+    return _compare(_index(previous, key_columns, "previous"),
+                    _index(current, key_columns, "current"))
+
+
+def load_snapshot(snapshot_path: str) -> List[Dict[str, Any]]:
+    """
+    Load the rows stored by :func:`save_snapshot`.
+
+    Rows keep their stored fingerprint under a reserved column, so diffing
+    against them does not re-hash the previous upload.
+
+    Args:
+        snapshot_path: Path of the snapshot file
+
+    Returns:
+        Stored rows, or an empty list if no snapshot exists yet
+
+    Raises:
+        ValueError: If the file is not a valid snapshot
+    """
+    path = Path(snapshot_path)
+    if not path.exists():
+        return []
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    rows = decode(mapped)
+    if not isinstance(rows, list):
+        raise ValueError(f"Not a row snapshot: {snapshot_path}")
+    return rows
+
+
+def save_snapshot(snapshot_path: str, rows: List[Dict[str, Any]],
+                  fingerprints: Optional[Sequence[str]] = None) -> None:
+    """
+    Atomically store rows (with their fingerprints) as the latest snapshot.
+
+    Args:
+        snapshot_path: Path of the snapshot file
+        rows: Rows to store
+        fingerprints: Precomputed fingerprints for ``rows``, if available
+    """
+    path = Path(snapshot_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fingerprints is None:
+        fingerprints = [row_fingerprint(row) for row in rows]
+    stored = [{**row, _FINGERPRINT_COLUMN: fingerprint} for row, fingerprint in zip(rows, fingerprints)]
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encode(stored))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def ingest_delta(
+    path: str,
+    snapshot_path: str,
+    key: Union[str, Sequence[str]] = "unit",
+    rows: Optional[Iterable[Dict[str, Any]]] = None,
+) -> RowDelta:
+    """
+    Parse a new upload, diff it against the stored snapshot, and update it.
+
+    The snapshot is only replaced once the diff succeeds, so a malformed
+    upload (e.g. duplicate units) leaves the previous month intact.
+
+    Args:
+        path: Path to the new ``.csv`` or ``.xlsx`` upload
+        snapshot_path: Where the previous upload's snapshot is kept
+        key: Key column name (normalized header), or several for a
+            composite key
+        rows: Already-parsed rows of ``path``; parsed from the file if
+            omitted. Values other than None are converted to text, as the
+            file parsers produce them (fingerprints already compare values
+            as text); the caller's dictionaries are not modified
+
+    Returns:
+        RowDelta against the previous snapshot (everything is inserted on the
+        first upload)
+
+    Raises:
+        FileNotFoundError: If the upload doesn't exist
+        ValueError: If the file type is unsupported, the file is invalid,
+            keys are missing or duplicated, or a column name is not a string
+    """
+    if rows is None:
+        suffix = Path(path).suffix.lower()
+        reader = _DELTA_READERS.get(suffix)
+        if reader is None:
+            raise ValueError(f"Unsupported file type for delta ingestion: {suffix or path}")
+        rows = reader(path)
+    current = [_text_row(row) for row in rows]
+    fingerprints = [row_fingerprint(row) for row in current]
+
+    key_columns = _key_columns(key)
+    delta = _compare(_index(load_snapshot(snapshot_path), key_columns, "previous"),
+                     _index(current, key_columns, "current", fingerprints))
+    save_snapshot(snapshot_path, current, fingerprints)
+    return delta
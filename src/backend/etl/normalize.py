@@ -0,0 +1,235 @@
+"""
+Rent-roll normalization and schema mapping.
+
+Rent rolls exported from Yardi, RealPage and broker spreadsheets name the same
+fields differently ("Mkt Rent", "market_rent", "Market Rent/Mo"). This stage
+resolves headers to a canonical schema through a precompiled alias index and
+then applies column-wide transforms: unit type parsing, lease date parsing,
+currency cleanup and rent per square foot.
+"""
+
+import re
+import warnings
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+# Canonical rent-roll fields and the header spellings that map to them
+RENT_ROLL_ALIASES: Dict[str, List[str]] = {
+    "unit": ["unit", "unit number", "unit no", "unit #", "unit id", "apt", "apartment", "suite", "bldg unit"],
+    "unit_type": ["unit type", "floor plan", "floorplan", "plan", "type", "bed bath", "bd ba", "unit style"],
+    "square_feet": ["sq ft", "sqft", "square feet", "square footage", "unit sq ft", "unit sqft", "area", "rsf", "size"],
+    "tenant": ["tenant", "tenant name", "resident", "resident name", "lessee", "name", "occupant"],
+    "status": ["status", "unit status", "occupancy", "occupancy status", "lease status"],
+    "lease_start": ["lease start", "lease from", "lease start date", "lease begin", "start date", "from"],
+    "lease_end": ["lease end", "lease to", "lease end date", "lease expiration", "expiration", "lease exp",
+                  "end date", "to"],
+    "move_in": ["move in", "move in date", "movein", "moved in"],
+    "market_rent": ["market rent", "mkt rent", "market", "asking rent", "market rate", "gross market rent"],
+    "actual_rent": ["actual rent", "rent", "lease rent", "contract rent", "current rent", "effective rent",
+                    "in place rent", "charged rent", "monthly rent"],
+    "deposit": ["deposit", "security deposit", "sec dep", "deposit held", "deposits on hand"],
+}
+
+CANONICAL_FIELDS = list(RENT_ROLL_ALIASES) + ["bedrooms", "bathrooms", "market_rent_psf", "actual_rent_psf"]
+
+# Tokens that describe units or periods rather than the field itself
+_HEADER_NOISE = re.compile(r"\(.*?\)|\$|/\s*mo(nth)?\b|\bper month\b|\bmonthly\b|\bmo\b")
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9#]+")
+
+_UNIT_TYPE_PATTERN = (
+    r"(?<![a-z\d.])(?P<bedrooms>\d+(?:\.\d+)?)\s*(?:x|/|-|br|bd|bed(?:room)?s?)\s*"
+    r"(?:[/-]\s*)?(?P<bathrooms>\d+(?:\.\d+)?)?"
+)
+_STUDIO_PATTERN = r"(?i)\b(?:studio|eff(?:iciency)?)\b"
+
+_MONEY_FIELDS = ["market_rent", "actual_rent", "deposit"]
+_DATE_FIELDS = ["lease_start", "lease_end", "move_in"]
+
+
+def _alias_key(header: str) -> str:
+    """Reduce a header to a comparison key ("Market Rent/Mo" -> "marketrent")."""
+    text = str(header).lower().replace("_", " ").replace("&", " and ")
+    text = _HEADER_NOISE.sub(" ", text)
+    return _NON_ALPHANUMERIC.sub("", text).replace("number", "no")
+
+
+_ALIAS_INDEX: Dict[str, str] = {
+    _alias_key(alias): field
+    for field, aliases in RENT_ROLL_ALIASES.items()
+    for alias in [field] + aliases
+}
+
+
+@lru_cache(maxsize=4096)
+def resolve_header(header: str) -> Union[str, None]:
+    """
+    Resolve one source header to its canonical rent-roll field.
+
+    Args:
+        header: Header as it appears in the source (raw or parser-normalized)
+
+    Returns:
+        Canonical field name, or None if the header is not recognized
+    """
+    return _ALIAS_INDEX.get(_alias_key(header))
+
+
+def resolve_headers(headers: Iterable[str]) -> Dict[str, str]:
+    """
+    Map source headers to canonical fields.
+
+    When several headers resolve to the same field, the first one wins.
+
+    Args:
+        headers: Source headers in column order
+
+    Returns:
+        Dictionary mapping each recognized source header to its field
+    """
+    mapping: Dict[str, str] = {}
+    taken = set()
+    for header in headers:
+        field = resolve_header(header)
+        if field is not None and field not in taken:
+            mapping[header] = field
+            taken.add(field)
+    return mapping
+
+
+def _on_unique(series: pd.Series, transform: Callable[[pd.Series], Any]) -> Any:
+    """
+    Apply a column transform to the distinct values only, then broadcast back.
+
+    Rent rolls repeat the same unit types, lease dates and rents many times,
+    so this turns a per-row cost into a per-distinct-value cost. Missing
+    values map to NaN/NaT.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    converted = transform(pd.Series(uniques, dtype=object))
+    if isinstance(converted, pd.DataFrame):
+        values = converted.to_numpy(dtype=float)
+        # Code -1 (missing) selects the appended all-NaN row
+        values = np.vstack([values, np.full((1, values.shape[1]), np.nan)])
+        return pd.DataFrame(values[codes], columns=converted.columns, index=series.index)
+    values = np.asarray(converted)
+    missing = np.datetime64("NaT", "ns") if values.dtype.kind == "M" else np.nan
+    values = np.append(values, np.array([missing], dtype=values.dtype if values.dtype.kind == "M" else float))
+    return pd.Series(values[codes], index=series.index)
+
+
+def _to_money(series: pd.Series) -> pd.Series:
+    """Convert currency strings ("$1,250.00", "(25.00)") to floats."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+
+    def convert(uniques: pd.Series) -> np.ndarray:
+        text = uniques.astype(str).str.strip()
+        negative = text.str.startswith("(") & text.str.endswith(")")
+        numbers = pd.to_numeric(text.str.replace(r"[$,()\s]", "", regex=True), errors="coerce")
+        return np.where(negative, -numbers, numbers)
+
+    return _on_unique(series, convert)
+
+
+def _to_number(series: pd.Series) -> pd.Series:
+    """Convert numeric strings ("1,050") to floats."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    return _on_unique(series, lambda uniques: pd.to_numeric(
+        uniques.astype(str).str.replace(r"[,\s]", "", regex=True), errors="coerce").to_numpy(dtype=float))
+
+
+def _to_date(series: pd.Series) -> pd.Series:
+    """Convert date strings to datetime64, leaving unparseable values as NaT."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    def convert(uniques: pd.Series) -> np.ndarray:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            dates = pd.to_datetime(uniques, errors="coerce", format="mixed")
+        return dates.to_numpy(dtype="datetime64[ns]")
+
+    return _on_unique(series, convert)
+
+
+def _parse_unit_types(series: pd.Series) -> pd.DataFrame:
+    """Extract bedroom and bathroom counts from unit type labels ("2x2", "1BR/1BA", "Studio")."""
+
+    def convert(uniques: pd.Series) -> pd.DataFrame:
+        text = uniques.astype(str)
+        parsed = text.str.extract(f"(?i){_UNIT_TYPE_PATTERN}").astype(float)
+        studio = text.str.contains(_STUDIO_PATTERN, regex=True)
+        parsed.loc[studio & parsed["bedrooms"].isna(), ["bedrooms", "bathrooms"]] = [0.0, 1.0]
+        return parsed
+
+    return _on_unique(series, convert)
+
+
+def _to_frame(data: Union[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]) -> pd.DataFrame:
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, dict):
+        return pd.DataFrame(data)
+    return pd.DataFrame.from_records(list(data))
+
+
+def normalize_rent_roll(data: Union[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]) -> pd.DataFrame:
+    """
+    Map a parsed rent roll onto the canonical schema and normalize its values.
+
+    Accepts the output of ``parse_csv``/``parse_xlsx`` (list of row dicts) or
+    of ``read_columns`` (dict of arrays or DataFrame). Canonical columns come
+    first, in ``CANONICAL_FIELDS`` order; unrecognized source columns are kept
+    after them under their original names.
+
+    Transforms applied to whole columns:
+
+    * ``market_rent``, ``actual_rent``, ``deposit``: currency to float
+    * ``square_feet``: number
+    * ``lease_start``, ``lease_end``, ``move_in``: datetime64
+    * ``unit_type``: adds ``bedrooms`` and ``bathrooms``
+    * ``market_rent_psf``, ``actual_rent_psf``: rent / square feet
+
+    Args:
+        data: Parsed rent roll
+
+    Returns:
+        Normalized DataFrame
+    """
+    frame = _to_frame(data)
+    source = {field: header for header, field in resolve_headers(frame.columns).items()}
+    columns = {field: frame[header] for field, header in source.items()}
+
+    result: Dict[str, Any] = {}
+    for field in ("unit", "tenant", "status"):
+        if field in columns:
+            result[field] = columns[field]
+    if "unit_type" in columns:
+        result["unit_type"] = columns["unit_type"]
+        result.update(_parse_unit_types(columns["unit_type"]))
+    if "square_feet" in columns:
+        result["square_feet"] = _to_number(columns["square_feet"])
+    for field in _DATE_FIELDS:
+        if field in columns:
+            result[field] = _to_date(columns[field])
+    for field in _MONEY_FIELDS:
+        if field in columns:
+            result[field] = _to_money(columns[field])
+
+    if "square_feet" in result:
+        square_feet = result["square_feet"].where(result["square_feet"] > 0)
+        for field in ("market_rent", "actual_rent"):
+            if field in result:
+                result[f"{field}_psf"] = result[field] / square_feet
+
+    ordered = {field: result[field] for field in CANONICAL_FIELDS if field in result}
+    mapped = set(source.values())
+    for column in frame.columns:
+        if column not in mapped:
+            # Keep unrecognized columns, without shadowing a canonical one
+            ordered[column if column not in ordered else f"source_{column}"] = frame[column]
+    return pd.DataFrame(ordered, index=frame.index)
@@ -2,36 +2,122 @@
 ETL parsers for data ingestion and parsing.
 """
 
+import bisect
 import csv
+import itertools
+import logging
+import os
 import openpyxl
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
+from .cache import ParseCache
 
+logger = logging.getLogger(__name__)
 
-def parse_csv(path: str) -> List[Dict[str, Any]]:
+# Bump whenever the shape or normalization of parser output changes, so
+# cached results from older parser code are never served
+PARSER_VERSION = "2"
+
+
+_READ_CHUNK_SIZE = 64 * 1024
+_SNIFF_SAMPLE_SIZE = 1024
+
+
+def _iter_decoded_lines(binary_file) -> Iterator[str]:
     """
-    Parse CSV file and return list of dictionaries.
+    Yield decoded text lines from a binary file, keeping line endings.
+    
+    Lines are decoded as UTF-8 until the first line that fails to decode;
+    that line and every line after it are decoded as latin-1 instead, so a
+    stray non-UTF-8 byte deep in a large file never forces a re-read of the
+    rows that were already produced.
     
     Args:
-        path: Path to the CSV file
+        binary_file: File object opened in binary mode
         
-    Returns:
-        List of dictionaries representing CSV rows
+    Yields:
+        Decoded lines, including their original line terminators
+    """
+    encoding = 'utf-8'
+    pending = b''
+    while True:
+        chunk = binary_file.read(_READ_CHUNK_SIZE)
+        data = pending + chunk
+        if not data:
+            return
+        lines = data.splitlines(keepends=True)
+        # Hold back a trailing partial line (or a lone '\r' that may be the
+        # first half of '\r\n') until the next chunk arrives.
+        if chunk and not lines[-1].endswith(b'\n'):
+            pending = lines.pop()
+        else:
+            pending = b''
+        for line in lines:
+            if encoding == 'utf-8':
+                try:
+                    yield line.decode('utf-8')
+                    continue
+                except UnicodeDecodeError:
+                    encoding = 'latin-1'
+            yield line.decode('latin-1')
+        if not chunk:
+            return
+
+
+def _batched(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group rows into lists of at most ``batch_size`` items.
+    
+    Args:
+        rows: Iterable of row dictionaries
+        batch_size: Maximum number of rows per batch
+        
+    Yields:
+        Lists of row dictionaries
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_csv_rows(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized row dictionaries from a CSV file.
+    
+    Args:
+        file_path: Path to an existing CSV file
+        
+    Yields:
+        Dictionaries representing CSV rows
         
     Raises:
-        FileNotFoundError: If the CSV file doesn't exist
         ValueError: If the file is not a valid CSV
     """
-    file_path = Path(path)
-    if not file_path.exists():
-        raise FileNotFoundError(f"CSV file not found: {path}")
-    
     try:
-        data = []
-        with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            # Try to detect the dialect
-            sample = csvfile.read(1024)
-            csvfile.seek(0)
+        with open(file_path, 'rb') as binary_file:
+            lines = _iter_decoded_lines(binary_file)
+            
+            # Buffer just enough leading lines to build the sniffer sample
+            head = []
+            head_size = 0
+            for line in lines:
+                head.append(line)
+                head_size += len(line)
+                if head_size >= _SNIFF_SAMPLE_SIZE:
+                    break
+            sample = ''.join(head)[:_SNIFF_SAMPLE_SIZE]
+            # Sniff whole lines only: a row cut off mid-way makes delimiter
+            # counts look inconsistent and detection fall back to commas
+            last_line_end = max(sample.rfind('\n'), sample.rfind('\r'))
+            if last_line_end > 0:
+                sample = sample[:last_line_end + 1]
             
             # Use csv.Sniffer to detect delimiter and other CSV properties
             try:
@@ -42,20 +128,18 @@ def parse_csv(path: str) -> List[Dict[str, Any]]:
                 dialect = csv.excel
                 has_header = True
             
-            reader = csv.reader(csvfile, dialect)
+            reader = csv.reader(itertools.chain(head, lines), dialect)
             
             if has_header:
                 # Read header row - handle empty files
                 try:
                     headers = next(reader)
                 except StopIteration:
-                    # Empty file, return empty list
-                    return []
+                    return
                 
                 # Clean headers (remove whitespace, replace spaces with underscores)
                 headers = [h.strip().replace(' ', '_').lower() for h in headers]
                 
-                # Read data rows
                 for row in reader:
                     if row:  # Skip empty rows
                         # Create dict mapping headers to values
@@ -63,105 +147,583 @@ def parse_csv(path: str) -> List[Dict[str, Any]]:
                         for i, value in enumerate(row):
                             if i < len(headers):
                                 row_dict[headers[i]] = value.strip() if value else None
-                        data.append(row_dict)
+                        yield row_dict
             else:
                 # No header, use column indices as keys
                 for row in reader:
                     if row:  # Skip empty rows
-                        row_dict = {f"column_{i}": value.strip() if value else None 
-                                   for i, value in enumerate(row)}
-                        data.append(row_dict)
+                        yield {f"column_{i}": value.strip() if value else None
+                               for i, value in enumerate(row)}
+    except Exception as e:
+        raise ValueError(f"Failed to parse CSV file: {e}")
+
+
+def iter_csv(path: str, batch_size: Optional[int] = None) -> Iterator[Any]:
+    """
+    Stream a CSV file as normalized row dictionaries.
+    
+    Only one read chunk and the current row (or batch) are held in memory, so
+    arbitrarily large exports can be processed with bounded memory. Dialect and
+    header detection match :func:`parse_csv`.
+    
+    Args:
+        path: Path to the CSV file
+        batch_size: If given, yield lists of up to this many rows instead of
+            individual rows
         
-        return data
+    Returns:
+        Iterator over row dictionaries, or over lists of them when
+        ``batch_size`` is set
         
-    except UnicodeDecodeError:
-        # Try with different encoding
-        try:
-            with open(file_path, 'r', newline='', encoding='latin-1') as csvfile:
-                reader = csv.DictReader(csvfile)
-                return [dict(row) for row in reader]
-        except Exception as e:
-            raise ValueError(f"Failed to parse CSV file: {e}")
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        ValueError: If ``batch_size`` is not positive, or (during iteration)
+            if the file is not a valid CSV
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    
+    rows = _iter_csv_rows(file_path)
+    if batch_size is None:
+        return rows
+    return _batched(rows, batch_size)
+
+
+def parse_csv(path: str, cache: Optional[ParseCache] = None) -> List[Dict[str, Any]]:
+    """
+    Parse CSV file and return list of dictionaries.
+    
+    Args:
+        path: Path to the CSV file
+        cache: Optional parse cache; identical file contents are served from
+            it instead of being re-parsed
+        
+    Returns:
+        List of dictionaries representing CSV rows
+        
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        ValueError: If the file is not a valid CSV
+    """
+    if cache is not None:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"CSV file not found: {path}")
+        return cache.get_or_parse(path, "csv", PARSER_VERSION, lambda: list(iter_csv(path)))
+    return list(iter_csv(path))
+
+
+def _iter_xlsx_rows(workbook, worksheet, require_header: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized row dictionaries from a read-only worksheet.
+    
+    The header is detected lazily: it is the first row containing any value,
+    and every later row is a data row. Rows are consumed as plain value tuples,
+    so no cell objects are ever built.
+    
+    Args:
+        workbook: Workbook opened in read-only mode; closed when iteration ends
+        worksheet: Worksheet of ``workbook`` to read
+        require_header: Raise if the worksheet is empty; otherwise an empty
+            worksheet simply yields no rows
+        
+    Yields:
+        Dictionaries representing worksheet rows
+        
+    Raises:
+        ValueError: If the worksheet has no header row or cannot be read
+    """
+    try:
+        rows = worksheet.iter_rows(values_only=True)
+        
+        headers = []
+        for row in rows:
+            if any(row):
+                headers = [str(value).strip().replace(' ', '_').lower()
+                           if value else f"column_{i+1}"
+                           for i, value in enumerate(row)]
+                break
+        
+        if not headers:
+            if require_header:
+                raise ValueError("No header row found in XLSX file")
+            return
+        
+        width = len(headers)
+        for row in rows:
+            if any(row):  # Skip empty rows
+                # Read-only rows may be shorter than the header row
+                if len(row) < width:
+                    row = row + (None,) * (width - len(row))
+                # Convert to string for consistency
+                yield {headers[i]: str(row[i]).strip() if row[i] is not None else None
+                       for i in range(width)}
     except Exception as e:
-        raise ValueError(f"Failed to parse CSV file: {e}")
+        raise ValueError(f"Failed to parse XLSX file: {e}")
+    finally:
+        workbook.close()
 
 
-def parse_xlsx(path: str) -> List[Dict[str, Any]]:
+def _open_xlsx_sheet(file_path: Path, sheet: Optional[str] = None):
     """
-    Parse XLSX file and return list of dictionaries.
+    Open a workbook in read-only, values-only mode and select a worksheet.
+    
+    Args:
+        file_path: Path to an existing XLSX file
+        sheet: Worksheet name, or None for the active worksheet
+        
+    Returns:
+        Tuple of (workbook, worksheet); the caller must close the workbook
+        
+    Raises:
+        ValueError: If the file is not a valid XLSX or the sheet is missing
+    """
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Failed to parse XLSX file: {e}")
+    
+    if sheet is None:
+        worksheet = workbook.active
+        if not worksheet:
+            workbook.close()
+            raise ValueError("Failed to parse XLSX file: No active worksheet found in XLSX file")
+    elif sheet in workbook.sheetnames:
+        worksheet = workbook[sheet]
+    else:
+        workbook.close()
+        raise ValueError(f"Failed to parse XLSX file: Worksheet '{sheet}' not found")
+    # Some writers emit stale <dimension> tags; ignore them so no rows are lost
+    worksheet.reset_dimensions()
+    return workbook, worksheet
+
+
+def iter_xlsx(path: str, batch_size: Optional[int] = None, sheet: Optional[str] = None) -> Iterator[Any]:
+    """
+    Stream a worksheet of an XLSX file as normalized row dictionaries.
+    
+    The workbook is opened in read-only, values-only mode, so rows are pulled
+    straight from the sheet XML without building the in-memory cell tree.
     
     Args:
         path: Path to the XLSX file
+        batch_size: If given, yield lists of up to this many rows instead of
+            individual rows
+        sheet: Name of the worksheet to read (defaults to the active sheet)
         
     Returns:
-        List of dictionaries representing worksheet rows
+        Iterator over row dictionaries, or over lists of them when
+        ``batch_size`` is set
         
     Raises:
         FileNotFoundError: If the XLSX file doesn't exist
-        ValueError: If the file is not a valid XLSX
+        ValueError: If ``batch_size`` is not positive, the sheet doesn't exist
+            or the file is not a valid XLSX (missing header rows are reported
+            during iteration)
     """
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"XLSX file not found: {path}")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    
+    workbook, worksheet = _open_xlsx_sheet(file_path, sheet)
+    rows = _iter_xlsx_rows(workbook, worksheet)
+    if batch_size is None:
+        return rows
+    return _batched(rows, batch_size)
+
+
+def _parse_xlsx_sheet(path: str, sheet: str) -> List[Dict[str, Any]]:
+    """
+    Parse one worksheet in its own read-only workbook (runs in worker processes).
+    
+    Args:
+        path: Path to the XLSX file
+        sheet: Worksheet name
+        
+    Returns:
+        Row dictionaries; empty for a worksheet without a header row
+    """
+    workbook, worksheet = _open_xlsx_sheet(Path(path), sheet)
+    return list(_iter_xlsx_rows(workbook, worksheet, require_header=False))
+
+
+def parse_xlsx_sheets(
+    path: str,
+    sheets: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Parse several worksheets of an XLSX file into separate tables.
+    
+    Each worksheet is parsed in its own worker process, which opens the file
+    in read-only mode, so wall time scales with cores rather than tab count.
+    Worksheets without a header row come back as empty tables.
+    
+    Args:
+        path: Path to the XLSX file
+        sheets: Names of the worksheets to parse (defaults to all of them)
+        max_workers: Number of worker processes (defaults to the CPU count);
+            ``1`` parses serially in the calling process
+        
+    Returns:
+        Dictionary mapping worksheet name to its rows, in workbook order when
+        ``sheets`` is omitted and in the requested order otherwise
+        
+    Raises:
+        FileNotFoundError: If the XLSX file doesn't exist
+        ValueError: If a requested worksheet doesn't exist, ``max_workers`` is
+            not positive or the file is not a valid XLSX
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"XLSX file not found: {path}")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
     
     try:
-        # Load the workbook
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        available = workbook.sheetnames
+        workbook.close()
+    except Exception as e:
+        raise ValueError(f"Failed to parse XLSX file: {e}")
+    
+    names = list(available if sheets is None else sheets)
+    missing = [name for name in names if name not in available]
+    if missing:
+        raise ValueError(f"Failed to parse XLSX file: Worksheet(s) not found: {', '.join(missing)}")
+    if not names:
+        return {}
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(names))
+    if workers == 1:
+        return {name: _parse_xlsx_sheet(str(file_path), name) for name in names}
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(_parse_xlsx_sheet, str(file_path), name) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def parse_xlsx(path: str, cache: Optional[ParseCache] = None) -> List[Dict[str, Any]]:
+    """
+    Parse XLSX file and return list of dictionaries.
+    
+    Args:
+        path: Path to the XLSX file
+        cache: Optional parse cache; identical file contents are served from
+            it instead of being re-parsed
         
-        # Get the first active sheet
-        worksheet = workbook.active
-        if not worksheet:
-            raise ValueError("No active worksheet found in XLSX file")
+    Returns:
+        List of dictionaries representing worksheet rows
         
-        data = []
-        headers = []
+    Raises:
+        FileNotFoundError: If the XLSX file doesn't exist
+        ValueError: If the file is not a valid XLSX
+    """
+    if cache is not None:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"XLSX file not found: {path}")
+        return cache.get_or_parse(path, "xlsx", PARSER_VERSION, lambda: list(iter_xlsx(path)))
+    return list(iter_xlsx(path))
+
+
+_OCR_RESOLUTION = 300
+
+# Why OCR is unavailable in this process, once that has been logged
+_ocr_unavailable: Optional[str] = None
+
+
+def _merge_words_into_cells(words: List[Dict[str, Any]]) -> List[List[Tuple[float, float, str]]]:
+    """
+    Group positioned words into lines and adjacent words into cells.
+    
+    Words on the same baseline are one line. Within a line, words separated by
+    less than half the text height (an ordinary space) belong to the same cell;
+    wider gaps start a new cell.
+    
+    Args:
+        words: Dictionaries with ``x0``, ``x1``, ``top``, ``bottom`` and
+            ``text`` keys, in PDF points
         
-        # Find the first row with data (header row)
-        for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row):
-            if any(cell.value for cell in row):
-                # This is our header row
-                headers = [str(cell.value).strip().replace(' ', '_').lower() 
-                          if cell.value else f"column_{i+1}"
-                          for i, cell in enumerate(row)]
-                break
+    Returns:
+        Lines in top-to-bottom order, each a list of ``(x0, x1, text)`` cells
+    """
+    lines: List[List[Dict[str, Any]]] = []
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        height = max(word['bottom'] - word['top'], 1.0)
+        if lines and abs(word['top'] - lines[-1][0]['top']) <= height / 2:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    
+    result = []
+    for line in lines:
+        cells: List[List[Any]] = []
+        for word in sorted(line, key=lambda w: w['x0']):
+            height = max(word['bottom'] - word['top'], 1.0)
+            if cells and word['x0'] - cells[-1][1] <= height / 2:
+                cells[-1][1] = word['x1']
+                cells[-1][2] += ' ' + word['text']
+            else:
+                cells.append([word['x0'], word['x1'], word['text']])
+        result.append([(x0, x1, text) for x0, x1, text in cells])
+    return result
+
+
+def _ocr_words(page) -> Optional[List[Dict[str, Any]]]:
+    """
+    Recognize words on a page that has no text layer.
+    
+    When no local OCR engine (pytesseract + tesseract) is available, a warning
+    is logged once per process and the page is skipped.
+    
+    Args:
+        page: pdfplumber page
         
-        if not headers:
-            raise ValueError("No header row found in XLSX file")
-        
-        # Read data rows
-        for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-            if any(cell.value for cell in row):  # Skip empty rows
-                row_dict = {}
-                for i, cell in enumerate(row):
-                    if i < len(headers):
-                        # Convert cell value to appropriate type
-                        value = cell.value
-                        if value is not None:
-                            # Convert to string for consistency
-                            row_dict[headers[i]] = str(value).strip()
-                        else:
-                            row_dict[headers[i]] = None
-                data.append(row_dict)
+    Returns:
+        Word dictionaries in PDF points, as produced by ``extract_words``, or
+        None if OCR is unavailable
+    """
+    global _ocr_unavailable
+    if _ocr_unavailable is not None:
+        return None
+    try:
+        import pytesseract
+    except ImportError:
+        _ocr_unavailable = "pytesseract is not installed"
+    else:
+        image = page.to_image(resolution=_OCR_RESOLUTION).original
+        try:
+            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        except pytesseract.TesseractNotFoundError:
+            _ocr_unavailable = "the tesseract binary is not installed"
+    if _ocr_unavailable is not None:
+        logger.warning("Skipping PDF pages without a text layer: %s", _ocr_unavailable)
+        return None
+    
+    scale = 72.0 / _OCR_RESOLUTION
+    words = []
+    for i, text in enumerate(data['text']):
+        if text.strip() and float(data['conf'][i]) >= 0:
+            left, top = data['left'][i] * scale, data['top'][i] * scale
+            words.append({
+                'x0': left,
+                'x1': left + data['width'][i] * scale,
+                'top': top,
+                'bottom': top + data['height'][i] * scale,
+                'text': text.strip(),
+            })
+    return words
+
+
+def _extract_page_lines(page, ocr: bool) -> List[List[Tuple[float, float, str]]]:
+    """
+    Extract positioned table lines from one PDF page.
+    
+    Ruled tables are used when the page has any; otherwise rows are rebuilt
+    from the text layer's word positions. Pages without a text layer are
+    OCR'd only when ``ocr`` is set and they contain an image; blank pages are
+    skipped.
+    
+    Args:
+        page: pdfplumber page
+        ocr: Whether to OCR pages that have no text layer
         
-        workbook.close()
-        return data
+    Returns:
+        Lines in reading order, each a list of ``(x0, x1, text)`` cells
+    """
+    if not page.chars:
+        words = _ocr_words(page) if ocr and page.images else None
+        return _merge_words_into_cells(words) if words else []
+    
+    lines = []
+    for table in page.find_tables():
+        for row, values in zip(table.rows, table.extract()):
+            cells = [(bbox[0], bbox[2], value) for bbox, value in zip(row.cells, values)
+                     if bbox is not None and value]
+            if cells:
+                lines.append(cells)
+    if lines:
+        return lines
+    return _merge_words_into_cells(page.extract_words())
+
+
+def _extract_pdf_pages(path: str, page_numbers: List[int], ocr: bool) -> List[List[List[Tuple[float, float, str]]]]:
+    """
+    Extract table lines from a range of pages (runs in worker processes).
+    
+    Args:
+        path: Path to the PDF file
+        page_numbers: Zero-based page indices to extract
+        ocr: Whether to OCR pages that have no text layer
+        
+    Returns:
+        Extracted lines for each requested page, in order
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(path) as pdf:
+        results = []
+        for number in page_numbers:
+            page = pdf.pages[number]
+            results.append(_extract_page_lines(page, ocr))
+            # Release the page's parsed layout before moving on
+            page.close()
+        return results
+
+
+def _iter_pdf_page_lines(path: str, page_count: int, max_workers: int,
+                         pages_per_task: int, ocr: bool) -> Iterator[List[List[Tuple[float, float, str]]]]:
+    """
+    Yield each page's extracted lines in page order.
+    
+    With more than one worker, page ranges are extracted in a process pool
+    while keeping at most ``2 * max_workers`` ranges in flight, so memory
+    stays bounded however long the document is.
+    """
+    tasks = [list(range(start, min(start + pages_per_task, page_count)))
+             for start in range(0, page_count, pages_per_task)]
+    
+    if max_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from _extract_pdf_pages(path, task, ocr)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        remaining = iter(tasks)
+        pending = deque(executor.submit(_extract_pdf_pages, path, task, ocr)
+                        for task in itertools.islice(remaining, 2 * max_workers))
+        while pending:
+            pages = pending.popleft().result()
+            task = next(remaining, None)
+            if task is not None:
+                pending.append(executor.submit(_extract_pdf_pages, path, task, ocr))
+            yield from pages
+
+
+def _iter_pdf_rows(path: str, page_count: int, max_workers: int,
+                   pages_per_task: int, ocr: bool) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized row dictionaries from extracted PDF table lines.
+    
+    The first line with at least two cells is the header; header column
+    boundaries (midpoints between neighbouring header cells) decide which
+    column each later cell belongs to. Single-cell lines such as titles and
+    page footers are skipped, as are header lines repeated on later pages.
+    
+    Yields:
+        Dictionaries representing table rows
         
+    Raises:
+        ValueError: If the PDF cannot be read
+    """
+    try:
+        headers: List[str] = []
+        header_text: List[str] = []
+        boundaries: List[float] = []
+        for lines in _iter_pdf_page_lines(path, page_count, max_workers, pages_per_task, ocr):
+            for cells in lines:
+                if len(cells) < 2:
+                    continue
+                texts = [text.strip() for _, _, text in cells]
+                if not headers:
+                    header_text = texts
+                    headers = [text.replace(' ', '_').lower() if text else f"column_{i+1}"
+                               for i, text in enumerate(texts)]
+                    boundaries = [(cells[i][1] + cells[i + 1][0]) / 2 for i in range(len(cells) - 1)]
+                    continue
+                if texts == header_text:
+                    continue
+                
+                row_dict: Dict[str, Any] = dict.fromkeys(headers)
+                for x0, x1, text in cells:
+                    column = bisect.bisect_right(boundaries, (x0 + x1) / 2)
+                    value = text.strip()
+                    if value:
+                        key = headers[column]
+                        row_dict[key] = f"{row_dict[key]} {value}" if row_dict[key] else value
+                yield row_dict
     except Exception as e:
-        raise ValueError(f"Failed to parse XLSX file: {e}")
+        raise ValueError(f"Failed to parse PDF file: {e}")
+
+
+def iter_pdf(path: str, max_workers: Optional[int] = None, pages_per_task: int = 4,
+             ocr: bool = True, batch_size: Optional[int] = None) -> Iterator[Any]:
+    """
+    Stream table rows from a PDF as normalized row dictionaries.
+    
+    Pages are extracted in parallel worker processes and rows are yielded in
+    page order as soon as their pages are done. Tables are read from the text
+    layer; only pages without one are OCR'd with a local tesseract engine.
+    
+    Args:
+        path: Path to the PDF file
+        max_workers: Number of worker processes (defaults to the CPU count);
+            ``1`` extracts pages serially in the calling process
+        pages_per_task: Number of consecutive pages handed to a worker per task
+        ocr: Whether to OCR pages that have no text layer; when False, or
+            when no OCR engine is installed, those pages are skipped
+        batch_size: If given, yield lists of up to this many rows instead of
+            individual rows
+        
+    Returns:
+        Iterator over row dictionaries, or over lists of them when
+        ``batch_size`` is set
+        
+    Raises:
+        FileNotFoundError: If the PDF file doesn't exist
+        ValueError: If an argument is not positive or the file is not a valid
+            PDF
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"PDF file not found: {path}")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    if pages_per_task < 1:
+        raise ValueError("pages_per_task must be a positive integer")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    
+    try:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+    except Exception as e:
+        raise ValueError(f"Failed to parse PDF file: {e}")
+    
+    rows = _iter_pdf_rows(str(file_path), page_count, max_workers or os.cpu_count() or 1,
+                          pages_per_task, ocr)
+    if batch_size is None:
+        return rows
+    return _batched(rows, batch_size)
 
 
-def parse_pdf(path: str) -> List[Dict[str, Any]]:
+def parse_pdf(path: str, cache: Optional[ParseCache] = None,
+              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Parse PDF file and return list of dictionaries.
     
     Args:
         path: Path to the PDF file
+        cache: Optional parse cache; identical file contents are served from
+            it instead of being re-parsed
+        max_workers: Page-extraction worker processes (defaults to the CPU
+            count); ``1`` extracts pages in the calling process
         
     Returns:
-        List of dictionaries representing extracted data
+        List of dictionaries representing extracted table rows
         
     Raises:
-        NotImplementedError: Function not yet implemented
+        FileNotFoundError: If the PDF file doesn't exist
+        ValueError: If the file is not a valid PDF
     """
-    # TODO: Implement PDF parsing with OCR fallback using PyPDF2, pdfplumber, or similar
-    raise NotImplementedError("PDF parsing not yet implemented") 
\ No newline at end of file
+    if cache is not None:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"PDF file not found: {path}")
+        return cache.get_or_parse(path, "pdf", PARSER_VERSION,
+                                  lambda: list(iter_pdf(path, max_workers=max_workers)))
+    return list(iter_pdf(path, max_workers=max_workers))
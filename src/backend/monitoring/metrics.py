@@ -36,6 +36,18 @@ REPORTS_EXPORTED = Counter(
     ['format']  # xlsx, pdf, pptx
 )
 
+PARSE_CACHE_HITS = Counter(
+    'parse_cache_hits_total',
+    'Total number of parse cache hits',
+    ['parser']  # csv, xlsx, proforma
+)
+
+PARSE_CACHE_MISSES = Counter(
+    'parse_cache_misses_total',
+    'Total number of parse cache misses',
+    ['parser']
+)
+
 
 def inc_request(path: str, method: str, status: int) -> None:
     """
@@ -81,6 +93,26 @@ def inc_report_export(format_type: str) -> None:
     REPORTS_EXPORTED.labels(format=format_type).inc()
 
 
+def inc_parse_cache_hit(parser: str) -> None:
+    """
+    Increment parse cache hit counter.
+    
+    Args:
+        parser: Parser whose result was served from the cache
+    """
+    PARSE_CACHE_HITS.labels(parser=parser).inc()
+
+
+def inc_parse_cache_miss(parser: str) -> None:
+    """
+    Increment parse cache miss counter.
+    
+    Args:
+        parser: Parser that had to run because no cached result existed
+    """
+    PARSE_CACHE_MISSES.labels(parser=parser).inc()
+
+
 def get_metrics() -> str:
     """
     Generate Prometheus metrics output.
@@ -3,8 +3,10 @@ Monitoring server with Prometheus metrics endpoint and middleware.
 """
 
 import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from backend.underwriting.assumptions.service import warm_assumption_cache
 from .metrics import inc_request, observe_latency, get_metrics
 
 
@@ -34,14 +36,29 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         return response
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: warm caches before serving requests.
+    
+    Args:
+        app: FastAPI application
+    """
+    warm_assumption_cache()
+    yield
+
+
 def create_monitoring_app() -> FastAPI:
     """
     Create FastAPI app with monitoring middleware and metrics endpoint.
     
+    Assumption sets are parsed into the registry at startup so the first
+    scenario request does not pay for it.
+    
     Returns:
         FastAPI application with monitoring capabilities
     """
-    app = FastAPI(title="Multifamily Underwriting API", version="1.0.0")
+    app = FastAPI(title="Multifamily Underwriting API", version="1.0.0", lifespan=lifespan)
     
     # Add metrics middleware
     app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,168 @@
+"""
+Compile assumption sets into contiguous arrays for the vectorized engines.
+
+N assumption sets become one ``(fields, sets)`` float64 block with a fixed
+field layout and defaults filled in. Each field is a contiguous row, so
+``compiled["exit_cap_rate"]`` is a zero-copy ``(sets,)`` array and
+``compiled.columns`` can be passed straight to
+:func:`backend.underwriting.engine.project_cash_flows`. Slicing a range of
+sets returns views into the same block.
+"""
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from ..engine import OPTIONAL_ASSUMPTIONS, REQUIRED_ASSUMPTIONS, flatten_assumptions
+from .models import Assumption
+
+# Fixed field layout: engine inputs in a stable order
+FIELDS = tuple(REQUIRED_ASSUMPTIONS) + tuple(OPTIONAL_ASSUMPTIONS)
+
+AssumptionSet = Union[Mapping[str, Any], Sequence[Assumption]]
+
+
+def _flat_values(assumption_set: AssumptionSet) -> Dict[str, Any]:
+    """Flat key -> value mapping of a document, an assumptions mapping, or Assumption models."""
+    if isinstance(assumption_set, Mapping):
+        return flatten_assumptions(assumption_set)
+    return {item.name.strip().lower().replace(" ", "_"): item.value for item in assumption_set}
+
+
+class CompiledAssumptions:
+    """
+    Assumption sets as a ``(fields, sets)`` array.
+
+    Args:
+        values: C-contiguous array of shape ``(len(fields), len(names))``
+        fields: Field name of each row
+        names: Set name of each column
+    """
+
+    def __init__(self, values: np.ndarray, fields: Sequence[str], names: Sequence[str]):
+        self.values = values
+        self.fields = tuple(fields)
+        self.names = list(names)
+        self.field_index = {field: row for row, field in enumerate(self.fields)}
+        self.set_index = {name: column for column, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """
+        Zero-copy ``(sets,)`` array of one field.
+
+        Raises:
+            KeyError: If the field is not compiled
+        """
+        return self.values[self.field_index[field]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Field -> ``(sets,)`` array views, ready for the cash-flow engine."""
+        return {field: self.values[row] for row, field in enumerate(self.fields)}
+
+    def select(self, sets: Union[slice, int, str, Sequence[Union[int, str]]]) -> "CompiledAssumptions":
+        """
+        Subset of the sets.
+
+        A slice (or a single set) is a view sharing memory with this block;
+        a list of positions or names gathers a copy.
+
+        Args:
+            sets: Slice, position, name, or list of positions/names
+
+        Returns:
+            CompiledAssumptions over the selected sets
+
+        Raises:
+            IndexError: If a position is out of range
+            KeyError: If a name is not compiled
+        """
+        if isinstance(sets, str):
+            sets = self.set_index[sets]
+        if isinstance(sets, (int, np.integer)):
+            position = int(sets)
+            if not -len(self.names) <= position < len(self.names):
+                raise IndexError(f"Set position {position} out of range for {len(self.names)} sets")
+            position %= len(self.names)
+            sets = slice(position, position + 1)
+        if isinstance(sets, slice):
+            return CompiledAssumptions(self.values[:, sets], self.fields, self.names[sets])
+        positions = [self.set_index[item] if isinstance(item, str) else int(item) for item in sets]
+        return CompiledAssumptions(np.ascontiguousarray(self.values[:, positions]), self.fields,
+                                   [self.names[position] for position in positions])
+
+    def to_dict(self, set_name: Union[int, str]) -> Dict[str, float]:
+        """
+        One set's values by field name, e.g. for reports.
+
+        Args:
+            set_name: Set name or position
+
+        Returns:
+            Field -> value dictionary
+        """
+        column = self.set_index[set_name] if isinstance(set_name, str) else set_name
+        return {field: float(value) for field, value in zip(self.fields, self.values[:, column])}
+
+
+def compile_assumptions(
+    assumption_sets: Sequence[AssumptionSet],
+    names: Optional[Sequence[str]] = None,
+    fields: Sequence[str] = FIELDS,
+    strict: bool = True,
+) -> CompiledAssumptions:
+    """
+    Compile assumption sets into one contiguous array.
+
+    Args:
+        assumption_sets: Sets as assumption-set documents, flat or nested
+            assumption mappings, or lists of ``Assumption`` models (whose
+            names are matched in snake case, e.g. ``"Exit Cap Rate"``)
+        names: Name of each set; defaults to each document's ``name`` or
+            its position
+        fields: Field layout; defaults to every engine input
+        strict: Raise on missing required fields; otherwise fill them with NaN
+
+    Returns:
+        CompiledAssumptions
+
+    Raises:
+        ValueError: If names do not match the sets, a value is not numeric,
+            or (with ``strict``) a required field is missing
+    """
+    assumption_sets = list(assumption_sets)
+    if names is None:
+        names = [item.get("name", str(index)) if isinstance(item, Mapping) else str(index)
+                 for index, item in enumerate(assumption_sets)]
+    names = [str(name) for name in names]
+    if len(names) != len(assumption_sets):
+        raise ValueError(f"Expected {len(assumption_sets)} names, got {len(names)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Assumption set names must be unique")
+
+    flat_sets = [_flat_values(item) for item in assumption_sets]
+    values = np.empty((len(fields), len(flat_sets)), dtype=np.float64)
+    for row, field in enumerate(fields):
+        default = OPTIONAL_ASSUMPTIONS.get(field)
+        if default is None and field == "expense_growth_rate":
+            column = [flat.get(field, flat.get("rent_growth_rate", np.nan)) for flat in flat_sets]
+        else:
+            column = [flat.get(field, np.nan if default is None else default) for flat in flat_sets]
+        try:
+            values[row] = column
+        except (TypeError, ValueError):
+            raise ValueError(f"Non-numeric value for assumption '{field}'")
+
+    if strict:
+        for row, field in enumerate(fields):
+            if field in REQUIRED_ASSUMPTIONS:
+                missing = np.flatnonzero(np.isnan(values[row]))
+                if missing.size:
+                    raise ValueError(f"Missing required assumption '{field}' in set '{names[missing[0]]}'")
+    return CompiledAssumptions(values, fields, names)
@@ -0,0 +1,280 @@
+"""
+In-process registry of assumption sets with mtime-based invalidation.
+
+Each set is parsed once and kept as a read-only view (nested mappings
+become ``MappingProxyType``, lists become tuples), so callers can share it
+without copying. Files are re-checked by ``stat`` at most once per
+``poll_interval`` seconds; a changed modification time or size triggers a
+re-parse, so edits are picked up without a restart.
+
+A set may declare ``"extends": "<parent>"``; it is then an overlay whose
+values replace the parent's, with nested mappings such as ``financing``
+merged key by key. Resolved sets are memoized by the content hashes of
+their layer chain, so they are rebuilt only when a layer changes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+
+class _Entry(NamedTuple):
+    """A parsed set and the file state it was parsed from."""
+
+    signature: Tuple[int, int]  # (mtime_ns, size)
+    view: Mapping[str, Any]
+    checked: float  # monotonic time of the last stat
+    digest: str  # content hash of the file
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert parsed JSON into a read-only structure.
+
+    Args:
+        value: Parsed JSON value
+
+    Returns:
+        Dicts as ``MappingProxyType``, lists as tuples, scalars unchanged
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def merge(base: Mapping[str, Any], overlay: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Deep-merge ``overlay`` onto ``base``.
+
+    Nested mappings are merged key by key; any other value in ``overlay``
+    (including lists) replaces the base value.
+
+    Args:
+        base: Parent values
+        overlay: Overriding values
+
+    Returns:
+        New merged dictionary (inputs are not modified)
+    """
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def thaw(value: Any) -> Any:
+    """
+    Recursively copy a frozen structure back into plain dicts and lists.
+
+    Args:
+        value: Value returned by :func:`freeze`
+
+    Returns:
+        Mutable copy
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class AssumptionRegistry:
+    """
+    Cache of the assumption sets in one directory.
+
+    Args:
+        directory: Directory of ``<name>.json`` assumption sets
+        poll_interval: Seconds between file-state checks for a cached set;
+            0 checks on every access
+    """
+
+    def __init__(self, directory: Union[str, Path], poll_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._names: Optional[Tuple[Tuple[int, int], List[str]]] = None
+        # name -> (layer chain key, resolved view)
+        self._resolved: Dict[str, Tuple[Tuple[str, ...], Mapping[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, name: str) -> Mapping[str, Any]:
+        """
+        Read-only view of one assumption-set file, without resolving ``extends``.
+
+        Args:
+            name: Name of the assumption set
+
+        Returns:
+            Read-only mapping of the file's JSON content
+
+        Raises:
+            ValueError: If the set is not found or is not valid JSON
+        """
+        return self._entry(name).view
+
+    def _entry(self, name: str) -> _Entry:
+        """Cached entry for a file, parsed at most once per file version."""
+        now = time.monotonic()
+        entry = self._entries.get(name)
+        if entry is not None and now - entry.checked < self.poll_interval:
+            return entry
+
+        path = self.directory / f"{name}.json"
+        signature = self._signature(path)
+        if signature is None:
+            with self._lock:
+                self._entries.pop(name, None)
+            raise ValueError(f"Assumption set '{name}' not found")
+        if entry is not None and entry.signature == signature:
+            entry = entry._replace(checked=now)
+            self._entries[name] = entry
+            return entry
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            view = freeze(json.loads(content))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in assumption set '{name}': {e}")
+        except Exception as e:
+            raise ValueError(f"Error loading assumption set '{name}': {e}")
+        entry = _Entry(signature, view, now, hashlib.sha256(content).hexdigest())
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def resolve(self, name: str) -> Mapping[str, Any]:
+        """
+        Read-only view of an assumption set with its ``extends`` chain applied.
+
+        Parents are merged first and each child overlays them; the result has
+        no ``extends`` key. Sets without a parent are returned as-is.
+
+        Args:
+            name: Name of the assumption set
+
+        Returns:
+            Read-only mapping of the resolved set
+
+        Raises:
+            ValueError: If a set in the chain is missing or invalid, or the
+                chain is circular
+        """
+        chain = [self._entry(name)]
+        names = [name]
+        parent = chain[0].view.get("extends")
+        if parent is None:
+            return chain[0].view
+        while parent is not None:
+            if not isinstance(parent, str):
+                raise ValueError(f"'extends' in assumption set '{names[-1]}' must be a set name")
+            if parent in names:
+                raise ValueError(f"Circular 'extends' chain: {' -> '.join(names + [parent])}")
+            names.append(parent)
+            chain.append(self._entry(parent))
+            parent = chain[-1].view.get("extends")
+
+        key = tuple(entry.digest for entry in chain)
+        cached = self._resolved.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        resolved: Dict[str, Any] = {}
+        for entry in reversed(chain):
+            resolved = merge(resolved, entry.view)
+        resolved.pop("extends", None)
+        view = freeze(thaw(resolved))
+        with self._lock:
+            self._resolved[name] = (key, view)
+        return view
+
+    def names(self) -> List[str]:
+        """
+        Names of the available assumption sets.
+
+        The directory is only re-listed when its modification time changes
+        (files added, removed or renamed).
+
+        Returns:
+            Sorted list of assumption set names
+        """
+        signature = self._signature(self.directory)
+        if signature is None:
+            return []
+        cached = self._names
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        names = sorted(path.stem for path in self.directory.glob("*.json"))
+        self._names = (signature, names)
+        return list(names)
+
+    def warm(self) -> Dict[str, Optional[str]]:
+        """
+        Parse every assumption set ahead of the first request.
+
+        Returns:
+            Name -> None for sets that loaded, or the error message for sets
+            that did not (errors are not raised so startup can proceed)
+        """
+        results: Dict[str, Optional[str]] = {}
+        for name in self.names():
+            try:
+                self.resolve(name)
+                results[name] = None
+            except ValueError as e:
+                results[name] = str(e)
+        return results
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached sets so the next access re-reads them.
+
+        Args:
+            name: Set to drop; all sets (and the name listing) if omitted
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._resolved.clear()
+                self._names = None
+            else:
+                self._entries.pop(name, None)
+                self._resolved.pop(name, None)
+
+
+_registries: Dict[Path, AssumptionRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(directory: Union[str, Path]) -> AssumptionRegistry:
+    """
+    Shared registry for a directory.
+
+    Args:
+        directory: Directory of assumption sets
+
+    Returns:
+        The process-wide AssumptionRegistry for that directory
+    """
+    key = Path(directory).resolve()
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.setdefault(key, AssumptionRegistry(key))
+    return registry
@@ -2,39 +2,85 @@
 Assumption service for managing underwriting assumptions.
 """
 
-import json
-import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Mapping, Optional, Union
 
+from .registry import get_registry
+from .store import VersionInfo, get_store
 
-def load_assumptions(name: str) -> Dict[str, Any]:
+
+def _assumptions_dir() -> Path:
+    """Directory of assumption set files, resolved from this module's location."""
+    return Path(__file__).parent.parent.parent.parent.parent / "data" / "assumptions"
+
+
+def _versions_dir() -> Path:
+    """Root of the versioned assumption store."""
+    return _assumptions_dir() / ".versions"
+
+
+def load_assumptions(name: str, version: Union[str, int, None] = None) -> Mapping[str, Any]:
     """
     Load assumption set by name.
     
+    Sets are served from the in-process registry: each file is parsed once
+    and re-read only after it changes on disk. A set that declares
+    ``"extends": "<parent>"`` is returned merged over its parent chain.
+    Historical versions recorded with :func:`record_assumptions` are
+    reconstructed from the versioned store and served from its LRU cache.
+    
     Args:
         name: Name of the assumption set to load
+        version: Recorded version to load: version id, unique id prefix,
+            or position in the set's history (negative counts from the
+            newest); the current file if omitted
         
     Returns:
-        Dictionary containing assumption data
+        Read-only mapping containing assumption data (use
+        ``registry.thaw`` for a mutable copy)
         
     Raises:
-        ValueError: If assumption set not found
+        ValueError: If assumption set or version not found, invalid, or
+            its ``extends`` chain is circular
     """
-    # Get the path to the assumptions directory
-    assumptions_dir = Path(__file__).parent.parent.parent.parent.parent / "data" / "assumptions"
-    file_path = assumptions_dir / f"{name}.json"
+    if version is None:
+        return get_registry(_assumptions_dir()).resolve(name)
+    store = get_store(_versions_dir())
+    return store.load(store.resolve_version(name, version))
+
+
+def record_assumptions(name: str, message: Optional[str] = None) -> str:
+    """
+    Record the current content of an assumption set as a version.
+    
+    Call this when assumptions are used for a deliverable (e.g. an IC memo)
+    and keep the returned id with it. Recording unchanged content returns
+    the existing id without storing anything.
     
-    if not file_path.exists():
-        raise ValueError(f"Assumption set '{name}' not found")
+    Args:
+        name: Name of the assumption set
+        message: Optional description of the change
+        
+    Returns:
+        Version id (SHA-256 of the resolved set's canonical JSON)
+        
+    Raises:
+        ValueError: If assumption set not found or invalid
+    """
+    return get_store(_versions_dir()).commit(name, load_assumptions(name), message)
+
+
+def assumption_history(name: str) -> List[VersionInfo]:
+    """
+    Recorded versions of an assumption set, oldest first.
     
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON in assumption set '{name}': {e}")
-    except Exception as e:
-        raise ValueError(f"Error loading assumption set '{name}': {e}")
+    Args:
+        name: Name of the assumption set
+        
+    Returns:
+        List of VersionInfo (empty if nothing was recorded)
+    """
+    return get_store(_versions_dir()).history(name)
 
 
 def list_assumption_sets() -> List[str]:
@@ -44,15 +90,14 @@ def list_assumption_sets() -> List[str]:
     Returns:
         List of assumption set names
     """
-    # Get the path to the assumptions directory
-    assumptions_dir = Path(__file__).parent.parent.parent.parent.parent / "data" / "assumptions"
-    
-    if not assumptions_dir.exists():
-        return []
-    
-    assumption_sets = []
-    for file_path in assumptions_dir.glob("*.json"):
-        # Return filename without .json extension
-        assumption_sets.append(file_path.stem)
+    return get_registry(_assumptions_dir()).names()
+
+
+def warm_assumption_cache() -> Dict[str, Optional[str]]:
+    """
+    Parse all assumption sets into the registry, e.g. at application startup.
     
-    return sorted(assumption_sets) 
\ No newline at end of file
+    Returns:
+        Name -> None for sets that loaded, or the error message otherwise
+    """
+    return get_registry(_assumptions_dir()).warm()
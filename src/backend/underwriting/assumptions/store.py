@@ -0,0 +1,354 @@
+"""
+Versioned, content-addressed store of assumption sets.
+
+Every version is identified by the SHA-256 of its canonical JSON (sorted
+keys, compact separators), so identical content always has the same
+version id and is stored once. Versions are stored as deltas against their
+parent version (the set's previous head); every ``snapshot_interval``-th
+version in a chain is a full snapshot, so reconstructing any version
+applies at most ``snapshot_interval - 1`` deltas. Reconstructed versions
+are immutable and kept in an LRU cache.
+
+Layout under the store root::
+
+    objects/<ab>/<hash>.json   snapshot or delta, named by content hash
+    refs/<name>.jsonl          one line per committed version of a set
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .registry import freeze, thaw
+
+Path_ = Tuple[str, ...]
+
+
+class VersionInfo(NamedTuple):
+    """One entry in a set's history."""
+
+    version: str
+    parent: Optional[str]
+    created: float  # UNIX timestamp
+    message: Optional[str]
+
+
+def canonical_json(content: Any) -> str:
+    """
+    Canonical JSON text used for hashing.
+
+    Args:
+        content: JSON-compatible value (frozen views are accepted)
+
+    Returns:
+        JSON with sorted keys and no insignificant whitespace
+    """
+    return json.dumps(thaw(content), sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(content: Any) -> str:
+    """
+    Version id of some content.
+
+    Args:
+        content: JSON-compatible value
+
+    Returns:
+        Hex SHA-256 of the canonical JSON
+    """
+    return hashlib.sha256(canonical_json(content).encode("utf-8")).hexdigest()
+
+
+def diff(old: Mapping[str, Any], new: Mapping[str, Any], path: Path_ = ()) -> Dict[str, List[Any]]:
+    """
+    Delta turning ``old`` into ``new``.
+
+    Nested mappings are compared key by key; any other changed value is
+    replaced whole.
+
+    Args:
+        old: Parent content
+        new: Child content
+        path: Key path of ``old``/``new`` within the document
+
+    Returns:
+        ``{"set": [[path, value], ...], "unset": [path, ...]}``
+    """
+    delta: Dict[str, List[Any]] = {"set": [], "unset": []}
+    for key in old:
+        if key not in new:
+            delta["unset"].append(list(path + (key,)))
+    for key, value in new.items():
+        if key in old:
+            previous = old[key]
+            if isinstance(previous, Mapping) and isinstance(value, Mapping):
+                nested = diff(previous, value, path + (key,))
+                delta["set"].extend(nested["set"])
+                delta["unset"].extend(nested["unset"])
+                continue
+            if previous == value and type(previous) is type(value):
+                continue
+        delta["set"].append([list(path + (key,)), thaw(value)])
+    return delta
+
+
+def apply_delta(base: Dict[str, Any], delta: Mapping[str, List[Any]]) -> Dict[str, Any]:
+    """
+    Apply a delta from :func:`diff` in place.
+
+    Args:
+        base: Mutable parent content
+        delta: Delta to apply
+
+    Returns:
+        ``base``, modified
+    """
+    for path in delta["unset"]:
+        target = base
+        for key in path[:-1]:
+            target = target[key]
+        del target[path[-1]]
+    for path, value in delta["set"]:
+        target = base
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+    return base
+
+
+class VersionedStore:
+    """
+    Content-addressed history of assumption sets.
+
+    Args:
+        root: Directory holding ``objects/`` and ``refs/``
+        snapshot_interval: Maximum chain length between full snapshots
+        cache_size: Number of reconstructed versions kept in memory
+    """
+
+    def __init__(self, root: Union[str, Path], snapshot_interval: int = 10, cache_size: int = 256):
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be a positive integer")
+        self.root = Path(root)
+        self.snapshot_interval = snapshot_interval
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Mapping[str, Any]]" = OrderedDict()
+        # name -> ((mtime_ns, size) of the refs file, parsed history)
+        self._histories: Dict[str, Tuple[Tuple[int, int], Tuple[VersionInfo, ...]]] = {}
+        self._lock = threading.RLock()
+
+    def _object_path(self, version: str) -> Path:
+        return self.root / "objects" / version[:2] / f"{version}.json"
+
+    def _ref_path(self, name: str) -> Path:
+        return self.root / "refs" / f"{name}.jsonl"
+
+    def _read_object(self, version: str) -> Dict[str, Any]:
+        try:
+            with open(self._object_path(version), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Assumption version '{version}' not found")
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                f.write(text)
+            os.replace(temporary, path)
+        except BaseException:
+            # os.replace may already have moved it
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temporary)
+            raise
+
+    def _remember(self, version: str, view: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._cache[version] = view
+            self._cache.move_to_end(version)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def history(self, name: str) -> List[VersionInfo]:
+        """
+        Committed versions of a set, oldest first.
+
+        The refs file is only re-parsed when its modification time or size
+        changes.
+
+        Args:
+            name: Name of the assumption set
+
+        Returns:
+            List of VersionInfo (empty if the set was never committed)
+        """
+        path = self._ref_path(name)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._histories.get(name)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        with open(path, 'r') as f:
+            entries = tuple(VersionInfo(**json.loads(line)) for line in f if line.strip())
+        with self._lock:
+            self._histories[name] = (signature, entries)
+        return list(entries)
+
+    def commit(self, name: str, content: Mapping[str, Any], message: Optional[str] = None) -> str:
+        """
+        Record a new version of a set.
+
+        Committing content identical to the current head is a no-op.
+
+        Args:
+            name: Name of the assumption set
+            content: Full content of the new version
+            message: Optional description of the change
+
+        Returns:
+            Version id (content hash)
+        """
+        version = content_hash(content)
+        with self._lock:
+            entries = self.history(name)
+            parent = entries[-1].version if entries else None
+            if version == parent:
+                return version
+            if not self._object_path(version).exists():
+                self._write_object(version, content, parent)
+            entry = VersionInfo(version, parent, time.time(), message)
+            self._ref_path(name).parent.mkdir(parents=True, exist_ok=True)
+            with open(self._ref_path(name), 'a') as f:
+                f.write(json.dumps(entry._asdict()) + "\n")
+        return version
+
+    def _write_object(self, version: str, content: Mapping[str, Any], parent: Optional[str]) -> None:
+        """Store ``content`` as a delta against ``parent``, or as a snapshot."""
+        record: Dict[str, Any]
+        if parent is not None:
+            parent_record = self._read_object(parent)
+            depth = parent_record.get("depth", 0) + 1
+            if depth < self.snapshot_interval:
+                delta = diff(self.load(parent), content)
+                record = {"type": "delta", "parent": parent, "depth": depth, "delta": delta}
+                self._write_atomic(self._object_path(version), json.dumps(record))
+                return
+        record = {"type": "snapshot", "depth": 0, "content": thaw(content)}
+        self._write_atomic(self._object_path(version), json.dumps(record))
+
+    def resolve_version(self, name: str, version: Union[str, int, None] = None) -> str:
+        """
+        Full version id from a version reference.
+
+        Args:
+            name: Name of the assumption set
+            version: Full id, unique id prefix (at least 4 characters),
+                position in the history (negative counts from the newest),
+                or None for the newest version
+
+        Returns:
+            Full version id
+
+        Raises:
+            ValueError: If the reference matches no version or is ambiguous
+        """
+        entries = self.history(name)
+        if not entries:
+            raise ValueError(f"Assumption set '{name}' has no recorded versions")
+        if version is None:
+            return entries[-1].version
+        if isinstance(version, int):
+            try:
+                return entries[version].version
+            except IndexError:
+                raise ValueError(f"Assumption set '{name}' has no version {version}")
+        if len(version) < 4:
+            raise ValueError("Version prefixes must have at least 4 characters")
+        matches = {entry.version for entry in entries if entry.version.startswith(version)}
+        if len(matches) != 1:
+            problem = "is ambiguous" if matches else "not found"
+            raise ValueError(f"Version '{version}' of assumption set '{name}' {problem}")
+        return matches.pop()
+
+    def load(self, version: str) -> Mapping[str, Any]:
+        """
+        Reconstruct a version by id.
+
+        Walks parent links back to the nearest snapshot (or cached
+        ancestor) and replays the deltas forward.
+
+        Args:
+            version: Full version id
+
+        Returns:
+            Read-only mapping of the version's content
+
+        Raises:
+            ValueError: If the version is not stored or fails its hash check
+        """
+        with self._lock:
+            cached = self._cache.get(version)
+            if cached is not None:
+                self._cache.move_to_end(version)
+                return cached
+
+        deltas: List[Tuple[str, Mapping[str, Any]]] = []
+        current = version
+        while True:
+            with self._lock:
+                cached = self._cache.get(current)
+            if cached is not None:
+                content = thaw(cached)
+                break
+            record = self._read_object(current)
+            if record["type"] == "snapshot":
+                content = record["content"]
+                break
+            deltas.append((current, record["delta"]))
+            current = record["parent"]
+
+        for _, delta in reversed(deltas):
+            content = apply_delta(content, delta)
+        if content_hash(content) != version:
+            raise ValueError(f"Assumption version '{version}' is corrupt")
+        view = freeze(content)
+        self._remember(version, view)
+        return view
+
+    def cached_versions(self) -> Sequence[str]:
+        """Version ids currently in the LRU cache, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+
+_stores: Dict[Path, VersionedStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(root: Union[str, Path]) -> VersionedStore:
+    """
+    Shared store for a directory.
+
+    Args:
+        root: Store root
+
+    Returns:
+        The process-wide VersionedStore for that root
+    """
+    key = Path(root).resolve()
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, VersionedStore(key))
+    return store
@@ -0,0 +1,235 @@
+"""
+Bulk validation of ``Assumption`` records.
+
+Validates a whole list of records, or a columnar table (a mapping of
+columns or a DataFrame), in one call. Columnar input is range-checked with
+vectorized NumPy operations first (``confidence_level`` within [0, 1],
+required fields present, empty cells treated as missing). The remaining
+rows are then validated in a single pydantic ``TypeAdapter`` pass, straight
+into ``Assumption`` models, or, when only field values are wanted, against
+a ``TypedDict`` mirror of the model's fields, which is much cheaper than
+building models. Each item is a left-to-right union with a catch-all, so a
+failing row becomes a placeholder instead of aborting the list; only those
+rows are validated again, one by one, to report their errors.
+
+Allocating tens of thousands of (acyclic) models triggers repeated cyclic
+garbage collections that can cost as much as validation itself. Callers that
+own the process (scripts, batch jobs) can pass ``pause_gc=True`` to disable
+collection for the call; it is off by default because ``gc.disable`` is
+process-wide and not safe to toggle from concurrent callers.
+"""
+
+import gc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pydantic import Field, PlainValidator, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from .models import Assumption
+
+
+def _record_type() -> type:
+    """TypedDict with the same fields and constraints as ``Assumption``."""
+    fields = {}
+    for name, info in Assumption.model_fields.items():
+        annotation = Annotated[(info.annotation, *info.metadata)] if info.metadata else info.annotation
+        fields[name] = annotation if info.is_required() else NotRequired[annotation]
+    return TypedDict("AssumptionRecord", fields)
+
+
+class _RowFailure:
+    """Placeholder for a list item that failed validation."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+# Matches whatever the item type rejected; only called for failing rows
+_Failed = Annotated[Any, PlainValidator(_RowFailure)]
+
+
+def _collecting(item_type: Any) -> Tuple[TypeAdapter, TypeAdapter]:
+    """
+    Adapters for a list whose failed items come back as ``_RowFailure``, and
+    for one item (to report a failed item's errors).
+    """
+    item = Annotated[Union[item_type, _Failed], Field(union_mode="left_to_right")]
+    return TypeAdapter(List[item]), TypeAdapter(item_type)
+
+
+_RECORDS, _RECORD = _collecting(_record_type())
+_MODELS, _MODEL = _collecting(Assumption)
+
+# Columns that must be present and non-empty on every row
+_REQUIRED_TEXT = ("name", "category")
+
+
+class RowError(NamedTuple):
+    """A validation failure on one input row."""
+
+    row: int
+    field: str
+    message: str
+
+
+class ValidationResult(NamedTuple):
+    """Validated assumptions and the failures, by input row."""
+
+    assumptions: Optional[List[Assumption]]  # when models were requested
+    records: Optional[List[Dict[str, Any]]]  # validated field values, when models were not
+    rows: List[int]  # input row of each validated record
+    errors: List[RowError]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every row validated."""
+        return not self.errors
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Disable cyclic garbage collection for the duration of the block."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _columns_of(data: Any) -> Dict[str, List[Any]]:
+    """Columns of a DataFrame or mapping as Python lists."""
+    if hasattr(data, "columns") and hasattr(data, "to_dict"):
+        return {str(column): data[column].tolist() for column in data.columns}
+    return {str(key): (values.tolist() if isinstance(values, np.ndarray) else list(values))
+            for key, values in data.items()}
+
+
+def _missing(values: List[Any]) -> np.ndarray:
+    """Mask of None/NaN entries."""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    # NaN is the only value not equal to itself
+    return np.asarray((array == None) | (array != array), dtype=bool)  # noqa: E711
+
+
+def _check_columns(columns: Dict[str, List[Any]], count: int) -> Tuple[np.ndarray, List[RowError]]:
+    """Vectorized range checks; returns a mask of rows that passed and their errors."""
+    errors: List[RowError] = []
+    passed = np.ones(count, dtype=bool)
+
+    def fail(mask: np.ndarray, field: str, message: str) -> None:
+        for row in np.flatnonzero(mask & passed):
+            errors.append(RowError(int(row), field, message))
+        passed[mask] = False
+
+    for field in _REQUIRED_TEXT + ("value",):
+        if field not in columns:
+            fail(np.ones(count, dtype=bool), field, "Field required")
+
+    for field in _REQUIRED_TEXT:
+        if field in columns:
+            fail(_missing(columns[field]), field, "Field required")
+
+    if "value" in columns:
+        # An empty cell is a missing value; non-numeric text is left to pydantic
+        fail(_missing(columns["value"]), "value", "Field required")
+
+    if "confidence_level" in columns:
+        levels = columns["confidence_level"]
+        missing = _missing(levels)
+        try:
+            # None and NaN both become NaN; only the present values are range-checked
+            numbers = np.array(levels, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Mixed column: leave per-value coercion to pydantic
+            numbers = None
+        if numbers is not None:
+            fail(~missing & ((numbers < 0.0) | (numbers > 1.0)), "confidence_level",
+                 "Input should be between 0 and 1")
+
+    for field, values in columns.items():
+        if field not in _REQUIRED_TEXT and field != "value":
+            missing = _missing(values)
+            if missing.any():
+                # Empty cells in an optional column mean "not given"
+                columns[field] = [None if gap else value for gap, value in zip(missing, values)]
+    return passed, errors
+
+
+def _validate(data: Any, build_models: bool) -> ValidationResult:
+    """Validate a batch; see :func:`validate_assumptions`."""
+    errors: List[RowError] = []
+    if isinstance(data, Mapping) or hasattr(data, "columns"):
+        columns = _columns_of(data)
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        count = lengths.pop() if lengths else 0
+        passed, errors = _check_columns(columns, count)
+        keys = list(columns)
+        records = [dict(zip(keys, values)) for values in zip(*(columns[key] for key in keys))]
+        candidates = [row for row in range(count) if passed[row]]
+        if len(candidates) < count:
+            records = [records[row] for row in candidates]
+    else:
+        records = list(data)
+        candidates = list(range(len(records)))
+
+    # One pass, straight into models (or into the cheaper TypedDict mirror
+    # when only records are wanted); failed rows come back as placeholders
+    adapter, single = (_MODELS, _MODEL) if build_models else (_RECORDS, _RECORD)
+    validated = adapter.validate_python(records)
+    failed = [position for position, item in enumerate(validated) if type(item) is _RowFailure]
+    if failed:
+        for position in failed:
+            try:
+                single.validate_python(validated[position].value)
+            except ValidationError as e:
+                for error in e.errors():
+                    field = ".".join(str(part) for part in error["loc"]) or "__root__"
+                    errors.append(RowError(candidates[position], field, error["msg"]))
+        dropped = set(failed)
+        candidates = [row for position, row in enumerate(candidates) if position not in dropped]
+        validated = [item for position, item in enumerate(validated) if position not in dropped]
+
+    errors.sort()
+    if build_models:
+        return ValidationResult(validated, None, candidates, errors)
+    return ValidationResult(None, validated, candidates, errors)
+
+
+def validate_assumptions(
+    data: Union[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]], Any],
+    build_models: bool = True,
+    pause_gc: bool = False,
+) -> ValidationResult:
+    """
+    Validate many assumption records in one call.
+
+    Args:
+        data: List of record dictionaries, a mapping of column name ->
+            values, or a pandas DataFrame
+        build_models: Construct ``Assumption`` models for the valid rows;
+            when False the validated field values are returned as plain
+            ``records`` instead, which is several times faster
+        pause_gc: Disable cyclic garbage collection for the duration of the
+            call; affects the whole process, so only use it where no other
+            thread depends on collection state
+
+    Returns:
+        ValidationResult with the valid rows (in input order) and one
+        RowError per failed field
+
+    Raises:
+        ValueError: If columns have different lengths
+    """
+    if not pause_gc:
+        return _validate(data, build_models)
+    with _gc_paused():
+        return _validate(data, build_models)
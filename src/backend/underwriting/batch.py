@@ -0,0 +1,181 @@
+"""
+Bulk loading of pro-forma workbooks across a deal-pipeline folder.
+"""
+
+import glob
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from .loader import load_proforma
+
+# Workbook extensions picked up when a directory is given
+PROFORMA_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+class ProFormaSummary(NamedTuple):
+    """Outcome of loading one workbook in a batch."""
+
+    path: str
+    values: Optional[Dict[str, Any]]
+    missing: List[str]
+    seconds: float
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the workbook loaded successfully."""
+        return self.error is None
+
+
+def find_proformas(source: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]]) -> List[str]:
+    """
+    Resolve a directory, glob pattern, file, or list of files to workbook paths.
+
+    Directories are searched recursively for ``.xlsx``/``.xlsm`` files;
+    Excel lock files (``~$...``) are skipped.
+
+    Args:
+        source: Directory, glob pattern (``"pipeline/**/*.xlsx"``), single
+            file, or a list of files
+
+    Returns:
+        Sorted list of paths
+    """
+    if isinstance(source, (list, tuple)):
+        return [str(path) for path in source]
+    source = str(source)
+    if os.path.isdir(source):
+        paths = [str(path) for path in Path(source).rglob("*")
+                 if path.suffix.lower() in PROFORMA_EXTENSIONS and path.is_file()]
+    elif glob.has_magic(source):
+        paths = [path for path in glob.glob(source, recursive=True) if os.path.isfile(path)]
+    else:
+        paths = [source]
+    return sorted(path for path in paths if not os.path.basename(path).startswith("~$"))
+
+
+def summarize_proforma(path: str, names: Optional[Sequence[str]] = None) -> ProFormaSummary:
+    """
+    Load selected named ranges from one workbook.
+
+    Errors are captured in the summary instead of being raised.
+
+    Args:
+        path: Path to the workbook
+        names: Named ranges to read; all names if omitted. Names the workbook
+            does not define are listed in ``missing``
+
+    Returns:
+        ProFormaSummary with either ``values`` or ``error`` set
+    """
+    start = time.perf_counter()
+    try:
+        with load_proforma(path) as proforma:
+            if names is None:
+                values, missing = proforma.prefetch(), []
+            else:
+                missing = [name for name in names if name not in proforma]
+                values = proforma.prefetch([name for name in names if name in proforma])
+        return ProFormaSummary(path, values, missing, time.perf_counter() - start, None)
+    except Exception as e:
+        return ProFormaSummary(path, None, [], time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+
+def _summarize_in_child(path: str, names: Optional[Sequence[str]], connection) -> None:
+    """Worker process entry point: send one summary back to the parent."""
+    try:
+        connection.send(summarize_proforma(path, names))
+    finally:
+        connection.close()
+
+
+def load_many(
+    source: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]],
+    names: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = 60.0,
+) -> Iterator[ProFormaSummary]:
+    """
+    Load many pro-forma workbooks in parallel, yielding summaries as they finish.
+
+    Each workbook is loaded in its own worker process, with at most
+    ``max_workers`` running at once. A workbook that exceeds ``timeout`` has
+    its process killed and yields a summary with ``error`` set, so one
+    corrupt or huge file cannot stall the batch. Results arrive in
+    completion order, not input order.
+
+    Args:
+        source: Directory, glob pattern, single file, or list of files (see
+            :func:`find_proformas`)
+        names: Named ranges to read from each workbook; all if omitted
+        max_workers: Maximum concurrent worker processes (defaults to the CPU
+            count)
+        timeout: Seconds allowed per workbook; None disables the limit
+
+    Yields:
+        ProFormaSummary for every workbook
+
+    Raises:
+        ValueError: If ``max_workers`` or ``timeout`` is not positive
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive")
+
+    pending = find_proformas(source)
+    pending.reverse()
+    workers = max_workers or os.cpu_count() or 1
+    names = list(names) if names is not None else None
+    context = multiprocessing.get_context()
+    # receiving connection -> (process, path, start time)
+    running: Dict[Any, tuple] = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                path = pending.pop()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_summarize_in_child, args=(path, names, sender), daemon=True)
+                process.start()
+                sender.close()
+                running[receiver] = (process, path, time.perf_counter())
+
+            wait_seconds = None
+            if timeout is not None:
+                earliest = min(started for _, _, started in running.values())
+                wait_seconds = max(0.0, earliest + timeout - time.perf_counter())
+
+            for receiver in wait(list(running), timeout=wait_seconds):
+                process, path, started = running.pop(receiver)
+                try:
+                    summary = receiver.recv()
+                except EOFError:
+                    # The worker died without reporting (e.g. killed for memory)
+                    process.join()
+                    summary = ProFormaSummary(path, None, [], time.perf_counter() - started,
+                                              f"Worker exited with code {process.exitcode}")
+                receiver.close()
+                process.join()
+                yield summary
+
+            if timeout is not None:
+                now = time.perf_counter()
+                for receiver, (process, path, started) in list(running.items()):
+                    if now - started >= timeout:
+                        del running[receiver]
+                        process.kill()
+                        process.join()
+                        receiver.close()
+                        yield ProFormaSummary(path, None, [], now - started,
+                                              f"Timed out after {timeout:g} seconds")
+    finally:
+        # Stop outstanding workers if the caller abandons the iteration
+        for receiver, (process, _, _) in running.items():
+            process.kill()
+            process.join()
+            receiver.close()
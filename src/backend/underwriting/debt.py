@@ -0,0 +1,193 @@
+"""
+Debt sizing and amortization, vectorized across many loans.
+
+Loans are sized as the smaller of LTV-constrained proceeds (price x
+``loan_to_value``) and DSCR-constrained proceeds (the principal whose annual
+debt service is year-1 NOI / ``debt_service_coverage``). Monthly
+amortization schedules are built per unit of principal and memoized by
+(rate, term, amortization), so repeated scenario runs over the same terms
+only scale cached arrays.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class LoanSizing(NamedTuple):
+    """Loan proceeds per loan, each of shape ``(loans,)``."""
+
+    loan_amount: np.ndarray
+    ltv_proceeds: np.ndarray
+    dscr_proceeds: np.ndarray  # inf where no coverage requirement applies
+    dscr_constrained: np.ndarray  # bool: coverage, not LTV, sets the amount
+
+
+class AmortizationSchedule(NamedTuple):
+    """Monthly schedules, each of shape ``(loans, months)``; months past a loan's term are zero."""
+
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray  # outstanding after each payment; the last is the balloon
+
+
+def amortizing_payment(principal: ArrayLike, annual_rate: ArrayLike, years: ArrayLike) -> np.ndarray:
+    """
+    Monthly payment of fully amortizing loans.
+
+    Args:
+        principal: Loan amounts
+        annual_rate: Annual interest rates
+        years: Amortization periods in years
+
+    Returns:
+        Monthly payments (positive)
+    """
+    rate = np.asarray(annual_rate, dtype=np.float64) / 12.0
+    periods = np.asarray(years, dtype=np.float64) * 12.0
+    principal = np.asarray(principal, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = principal * rate / (1.0 - (1.0 + rate) ** -periods)
+    return np.where(rate == 0, principal / periods, payment)
+
+
+def remaining_balance(principal: ArrayLike, annual_rate: ArrayLike, payment: ArrayLike,
+                      months: ArrayLike) -> np.ndarray:
+    """
+    Outstanding balance after a number of monthly payments.
+
+    Args:
+        principal: Loan amounts
+        annual_rate: Annual interest rates
+        payment: Monthly payments
+        months: Payments made
+
+    Returns:
+        Remaining balances (never negative)
+    """
+    rate = np.asarray(annual_rate, dtype=np.float64) / 12.0
+    growth = (1.0 + rate) ** np.asarray(months, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = principal * growth - payment * (growth - 1.0) / rate
+    balance = np.where(rate == 0, principal - payment * months, balance)
+    return np.maximum(balance, 0.0)
+
+
+def size_loan(
+    purchase_price: ArrayLike,
+    net_operating_income: ArrayLike,
+    loan_to_value: ArrayLike,
+    interest_rate: ArrayLike,
+    amortization_period: ArrayLike,
+    debt_service_coverage: ArrayLike = 0.0,
+) -> LoanSizing:
+    """
+    Size loans as the minimum of LTV- and DSCR-constrained proceeds.
+
+    Args:
+        purchase_price: Purchase prices
+        net_operating_income: Year-1 NOI used for the coverage test
+        loan_to_value: Maximum loan-to-value ratios
+        interest_rate: Annual interest rates
+        amortization_period: Amortization periods in years
+        debt_service_coverage: Minimum DSCR; zero (the default) means no
+            coverage requirement
+
+    Returns:
+        LoanSizing with arrays broadcast to a common ``(loans,)`` shape
+    """
+    price, noi, ltv, rate, years, coverage = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(value, dtype=np.float64))
+        for value in (purchase_price, net_operating_income, loan_to_value, interest_rate,
+                      amortization_period, debt_service_coverage)
+    ))
+    ltv_proceeds = price * ltv
+    # Annual debt service per unit of principal
+    constant = amortizing_payment(1.0, rate, years) * 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr_proceeds = np.where(coverage > 0, np.maximum(noi, 0.0) / coverage / constant, np.inf)
+    loan = np.minimum(ltv_proceeds, dscr_proceeds)
+    return LoanSizing(loan, ltv_proceeds, dscr_proceeds, dscr_proceeds < ltv_proceeds)
+
+
+@lru_cache(maxsize=1024)
+def _unit_schedule(annual_rate: float, term_months: int, amortization_months: int) -> Tuple[np.ndarray, ...]:
+    """Read-only schedule of a loan of 1.0; memoized by (rate, term, amortization)."""
+    rate = annual_rate / 12.0
+    payment = float(amortizing_payment(1.0, annual_rate, amortization_months / 12.0))
+    months = np.arange(1, term_months + 1, dtype=np.float64)
+    balance = remaining_balance(1.0, annual_rate, payment, months)
+    opening = np.concatenate([[1.0], balance[:-1]])
+    interest = opening * rate
+    principal = opening - balance
+    payments = interest + principal
+    for array in (payments, interest, principal, balance):
+        array.flags.writeable = False
+    return payments, interest, principal, balance
+
+
+def amortization_schedule(
+    principal: ArrayLike,
+    annual_rate: ArrayLike,
+    term_years: ArrayLike,
+    amortization_years: Optional[ArrayLike] = None,
+) -> AmortizationSchedule:
+    """
+    Monthly amortization schedules for many loans at once.
+
+    Loans sharing (rate, term, amortization) share one cached unit schedule
+    scaled by their principal. A term shorter than the amortization period
+    leaves a balloon balance at maturity.
+
+    Args:
+        principal: Loan amounts
+        annual_rate: Annual interest rates
+        term_years: Loan terms in years (whole months)
+        amortization_years: Amortization periods in years; defaults to the
+            term (fully amortizing)
+
+    Returns:
+        AmortizationSchedule with one row per loan
+
+    Raises:
+        ValueError: If a term or amortization period is not a positive
+            whole number of months
+    """
+    if amortization_years is None:
+        amortization_years = term_years
+    principal, rate, term, amortization = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(value, dtype=np.float64))
+        for value in (principal, annual_rate, term_years, amortization_years)
+    ))
+    term_months = np.round(term * 12.0)
+    amortization_months = np.round(amortization * 12.0)
+    if (np.any(term_months < 1) or np.any(amortization_months < 1)
+            or not np.allclose(term_months, term * 12.0) or not np.allclose(amortization_months, amortization * 12.0)):
+        raise ValueError("Loan terms must be a positive whole number of months")
+
+    loans = principal.size
+    width = int(term_months.max()) if loans else 0
+    series = [np.zeros((loans, width)) for _ in range(4)]
+    keys = np.stack([rate, term_months, amortization_months], axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    for index, (key_rate, key_term, key_amortization) in enumerate(unique):
+        rows = np.flatnonzero(inverse == index)
+        unit = _unit_schedule(float(key_rate), int(key_term), int(key_amortization))
+        for target, values in zip(series, unit):
+            target[rows, :values.size] = principal[rows, None] * values
+    return AmortizationSchedule(*series)
+
+
+def schedule_cache_info():
+    """Hit/miss statistics of the amortization schedule cache."""
+    return _unit_schedule.cache_info()
+
+
+def clear_schedule_cache() -> None:
+    """Drop all memoized amortization schedules."""
+    _unit_schedule.cache_clear()
@@ -0,0 +1,269 @@
+"""
+Vectorized cash-flow engine driven by underwriting assumption sets.
+
+Projects annual cash flows for one deal or a batch of deals at once. Every
+series is a NumPy array of shape ``(deals, years + 1)`` where column 0 is the
+acquisition date and column ``t`` is operating year ``t``; years past a deal's
+holding period are zero, so deals with different holding periods share one
+batch.
+
+Model (annual, per deal):
+
+* GPR grows from the year-1 gross potential rent at ``rent_growth_rate``
+* Vacancy = GPR x ``vacancy_rate``; EGI = GPR - vacancy
+* OpEx = year-1 EGI x ``expense_ratio`` grown at ``expense_growth_rate``,
+  plus ``management_fee`` x EGI
+* NOI = EGI - OpEx; reserves = (``maintenance_reserve`` + ``cap_ex_reserve``)
+  x EGI are deducted below NOI
+* Debt: loan = the smaller of price x ``loan_to_value`` and the amount
+  whose year-1 debt service is covered ``debt_service_coverage`` times by
+  year-1 NOI (see :mod:`backend.underwriting.debt`); monthly amortization
+  over ``amortization_period`` years at ``interest_rate``
+* Reversion at the end of the holding period: next year's NOI /
+  ``exit_cap_rate``, less ``disposition_costs``
+* Unlevered flows start with -(price + acquisition costs); levered flows
+  with the equity check, and repay the loan balance at exit
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from .debt import amortizing_payment, remaining_balance, size_loan
+
+# Assumptions every deal needs
+REQUIRED_ASSUMPTIONS = (
+    "rent_growth_rate",
+    "expense_ratio",
+    "vacancy_rate",
+    "exit_cap_rate",
+    "holding_period",
+)
+
+# Optional assumptions and their defaults (financing defaults to all-cash)
+OPTIONAL_ASSUMPTIONS = {
+    "expense_growth_rate": None,  # defaults to rent_growth_rate
+    "management_fee": 0.0,
+    "maintenance_reserve": 0.0,
+    "cap_ex_reserve": 0.0,
+    "acquisition_costs": 0.0,
+    "disposition_costs": 0.0,
+    "loan_to_value": 0.0,
+    "interest_rate": 0.0,
+    "amortization_period": 30,
+    "debt_service_coverage": 0.0,  # zero: no coverage requirement
+}
+
+AssumptionInput = Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]
+
+
+class CashFlows(NamedTuple):
+    """Projected cash flows, each of shape ``(deals, years + 1)`` unless noted."""
+
+    gross_potential_rent: np.ndarray
+    vacancy: np.ndarray
+    effective_gross_income: np.ndarray
+    operating_expenses: np.ndarray
+    net_operating_income: np.ndarray
+    reserves: np.ndarray
+    debt_service: np.ndarray
+    reversion: np.ndarray
+    unlevered: np.ndarray
+    levered: np.ndarray
+    loan_amount: np.ndarray  # (deals,)
+    exit_loan_balance: np.ndarray  # (deals,)
+    holding_period: np.ndarray  # (deals,)
+
+
+def flatten_assumptions(assumptions: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten an assumption set for the engine.
+
+    Accepts either a full assumption-set document (with an ``assumptions``
+    key) or its ``assumptions`` mapping. Nested ``financing`` values are
+    lifted to the top level (``financing.loan_to_value`` -> ``loan_to_value``).
+
+    Args:
+        assumptions: Assumption set
+
+    Returns:
+        Flat dictionary of assumption values
+    """
+    if "assumptions" in assumptions and isinstance(assumptions["assumptions"], Mapping):
+        assumptions = assumptions["assumptions"]
+    flat: Dict[str, Any] = {}
+    for key, value in assumptions.items():
+        if isinstance(value, Mapping):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def assumption_columns(assumptions: AssumptionInput, deals: int) -> Dict[str, np.ndarray]:
+    """
+    Broadcast assumptions into one ``(deals,)`` column per engine input.
+
+    Missing optional inputs take their defaults (expense growth follows rent
+    growth).
+
+    Args:
+        assumptions: One assumption set, one set per deal, or a mapping of
+            scalars/arrays
+        deals: Number of deals
+
+    Returns:
+        Engine input name -> ``(deals,)`` float64 array (possibly a broadcast view)
+
+    Raises:
+        ValueError: If a required assumption is missing, the number of sets
+            does not match ``deals``, or an array has the wrong length
+    """
+    if isinstance(assumptions, Mapping):
+        flat = flatten_assumptions(assumptions)
+        columns = {key: np.asarray(value, dtype=np.float64) for key, value in flat.items()
+                   if isinstance(value, (int, float, np.ndarray, list, tuple)) and not isinstance(value, bool)}
+    else:
+        sets = [flatten_assumptions(item) for item in assumptions]
+        if len(sets) != deals:
+            raise ValueError(f"Expected {deals} assumption sets, got {len(sets)}")
+        keys = set().union(*sets) if sets else set()
+        columns = {}
+        for key in keys:
+            if key in REQUIRED_ASSUMPTIONS or key in OPTIONAL_ASSUMPTIONS:
+                default = OPTIONAL_ASSUMPTIONS.get(key)
+                values = [item.get(key, default) for item in sets]
+                if any(value is None for value in values):
+                    continue
+                columns[key] = np.asarray(values, dtype=np.float64)
+
+    missing = [key for key in REQUIRED_ASSUMPTIONS if key not in columns]
+    if missing:
+        raise ValueError(f"Missing required assumptions: {', '.join(missing)}")
+    for key, default in OPTIONAL_ASSUMPTIONS.items():
+        if key not in columns:
+            columns[key] = columns["rent_growth_rate"] if default is None else np.asarray(default, dtype=np.float64)
+
+    try:
+        return {key: np.broadcast_to(value, (deals,)) for key, value in columns.items()
+                if key in REQUIRED_ASSUMPTIONS or key in OPTIONAL_ASSUMPTIONS}
+    except ValueError:
+        raise ValueError(f"Assumption arrays must be scalars or have length {deals}")
+
+
+def project_cash_flows(
+    purchase_price: Union[float, Sequence[float], np.ndarray],
+    gross_potential_rent: Union[float, Sequence[float], np.ndarray],
+    assumptions: AssumptionInput,
+) -> CashFlows:
+    """
+    Project annual cash flows for one or many deals in one vectorized pass.
+
+    Args:
+        purchase_price: Purchase price per deal (scalar or ``(deals,)``)
+        gross_potential_rent: Year-1 annual gross potential rent per deal
+        assumptions: One assumption set applied to every deal, a sequence of
+            sets (one per deal), or a mapping whose values are ``(deals,)``
+            arrays; nested ``financing`` values are accepted
+
+    Returns:
+        CashFlows with one row per deal
+
+    Raises:
+        ValueError: If inputs have mismatched lengths, required assumptions
+            are missing, or a holding period is not a positive whole number
+    """
+    price = np.atleast_1d(np.asarray(purchase_price, dtype=np.float64))
+    gpr_year1 = np.atleast_1d(np.asarray(gross_potential_rent, dtype=np.float64))
+    if not isinstance(assumptions, Mapping):
+        assumptions = list(assumptions)
+        deals = max(len(price), len(gpr_year1), len(assumptions))
+    else:
+        deals = max(len(price), len(gpr_year1))
+    try:
+        price = np.broadcast_to(price, (deals,))
+        gpr_year1 = np.broadcast_to(gpr_year1, (deals,))
+    except ValueError:
+        raise ValueError("purchase_price and gross_potential_rent must be scalars or have the same length")
+    a = assumption_columns(assumptions, deals)
+
+    holding = a["holding_period"]
+    if np.any(holding < 1) or np.any(holding != np.round(holding)):
+        raise ValueError("holding_period must be a positive whole number of years")
+    holding = holding.astype(np.int64)
+    horizon = int(holding.max()) if deals else 0
+
+    # Column t is operating year t; one extra year for the forward NOI used at exit
+    years = np.arange(horizon + 2, dtype=np.float64)
+    elapsed = np.maximum(years - 1.0, 0.0)[None, :]
+    operating = (years[None, :] >= 1) & (years[None, :] <= holding[:, None])
+
+    gpr = gpr_year1[:, None] * (1.0 + a["rent_growth_rate"])[:, None] ** elapsed
+    vacancy = gpr * a["vacancy_rate"][:, None]
+    egi = gpr - vacancy
+    base_expenses = egi[:, 1] * a["expense_ratio"] if horizon else np.zeros(deals)
+    opex = (base_expenses[:, None] * (1.0 + a["expense_growth_rate"])[:, None] ** elapsed
+            + egi * a["management_fee"][:, None])
+    noi = egi - opex
+    reserves = egi * (a["maintenance_reserve"] + a["cap_ex_reserve"])[:, None]
+
+    loan = size_loan(price, noi[:, 1], a["loan_to_value"], a["interest_rate"], a["amortization_period"],
+                     a["debt_service_coverage"]).loan_amount
+    monthly_payment = amortizing_payment(loan, a["interest_rate"], a["amortization_period"])
+    debt_service = np.where(operating, (monthly_payment * 12.0)[:, None], 0.0)
+    exit_balance = remaining_balance(loan, a["interest_rate"], monthly_payment, holding * 12)
+
+    rows = np.arange(deals)
+    forward_noi = noi[rows, holding + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sale_price = forward_noi / a["exit_cap_rate"]
+    net_sale = sale_price * (1.0 - a["disposition_costs"])
+    reversion = np.zeros((deals, horizon + 1))
+    reversion[rows, holding] = net_sale
+
+    columns = slice(0, horizon + 1)
+    mask = operating[:, columns]
+    gpr, vacancy, egi, opex, noi, reserves = (np.where(mask, series[:, columns], 0.0)
+                                              for series in (gpr, vacancy, egi, opex, noi, reserves))
+    debt_service = debt_service[:, columns]
+
+    unlevered = noi - reserves + reversion
+    unlevered[:, 0] = -price * (1.0 + a["acquisition_costs"])
+    levered = unlevered - debt_service
+    levered[:, 0] += loan
+    levered[rows, holding] -= exit_balance
+
+    return CashFlows(
+        gross_potential_rent=gpr,
+        vacancy=vacancy,
+        effective_gross_income=egi,
+        operating_expenses=opex,
+        net_operating_income=noi,
+        reserves=reserves,
+        debt_service=debt_service,
+        reversion=reversion,
+        unlevered=unlevered,
+        levered=levered,
+        loan_amount=loan,
+        exit_loan_balance=exit_balance,
+        holding_period=holding,
+    )
+
+
+def cash_flow_table(flows: CashFlows, deal: int = 0) -> List[Dict[str, float]]:
+    """
+    One deal's projection as rows (year 0 through exit), e.g. for reports.
+
+    Args:
+        flows: Result of :func:`project_cash_flows`
+        deal: Row index of the deal
+
+    Returns:
+        List of per-year dictionaries
+    """
+    names = ("gross_potential_rent", "vacancy", "effective_gross_income", "operating_expenses",
+             "net_operating_income", "reserves", "debt_service", "reversion", "unlevered", "levered")
+    return [
+        {"year": year, **{name: float(getattr(flows, name)[deal, year]) for name in names}}
+        for year in range(int(flows.holding_period[deal]) + 1)
+    ]
@@ -0,0 +1,1007 @@
+"""
+Formula evaluation engine for pro-forma workbooks.
+
+Workbooks saved by tools other than Excel carry no cached values, and
+changing an assumption would otherwise require a round trip through Excel.
+The engine tokenizes every formula once with openpyxl's tokenizer, compiles
+it to a Python closure, and builds the cell dependency graph in topological
+order. Changing an input cell then re-evaluates only the formulas downstream
+of it.
+
+Supported: arithmetic, comparison and ``&`` operators, ``%``, array
+constants, cell/range/whole-column references (optionally sheet-qualified),
+defined names, and the functions in ``FUNCTIONS`` (SUM, AVERAGE, MIN, MAX,
+COUNT, ROUND, ABS, IF, IFERROR, AND, OR, NOT, NPV, IRR, PMT, INDEX, MATCH).
+Unsupported functions evaluate to ``#NAME?`` and are listed in
+``FormulaEngine.unsupported``.
+"""
+
+import datetime
+import math
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import openpyxl
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.utils.cell import get_column_letter, range_boundaries
+from openpyxl.utils.datetime import to_excel
+
+from .returns import irr as solve_irr
+
+# (sheet title, row, column), all 1-based
+CellKey = Tuple[str, int, int]
+
+_MAX_ROW = 1048576
+_MAX_COLUMN = 16384
+_SHEET_PREFIX = re.compile(r"^(?:'((?:[^']|'')+)'|([^'!]+))!(.+)$")
+# A single cell; a bare column or row (e.g. a name like NOI) is only an area as part of a range
+_CELL_ADDRESS = re.compile(r"^[A-Za-z]{1,3}[0-9]+$")
+_FUNCTION_PREFIXES = ("_xlfn.", "_xlws.")
+
+
+class ExcelError:
+    """An Excel error value such as ``#DIV/0!``; errors propagate through formulas."""
+
+    __slots__ = ("code",)
+
+    def __init__(self, code: str):
+        self.code = code
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return self.code
+
+
+DIV0 = ExcelError("#DIV/0!")
+NA = ExcelError("#N/A")
+NAME = ExcelError("#NAME?")
+NUM = ExcelError("#NUM!")
+REF = ExcelError("#REF!")
+VALUE = ExcelError("#VALUE!")
+_ERRORS = {error.code: error for error in (DIV0, NA, NAME, NUM, REF, VALUE, ExcelError("#NULL!"))}
+
+
+class _Failed(Exception):
+    """Raised inside evaluation to short-circuit an error value to the cell."""
+
+    def __init__(self, error: ExcelError):
+        super().__init__(error.code)
+        self.error = error
+
+
+class _Area(NamedTuple):
+    sheet: str
+    min_row: int
+    min_col: int
+    max_row: int
+    max_col: int
+
+    @property
+    def is_cell(self) -> bool:
+        return self.min_row == self.max_row and self.min_col == self.max_col
+
+    def keys(self) -> List[List[CellKey]]:
+        return [[(self.sheet, row, col) for col in range(self.min_col, self.max_col + 1)]
+                for row in range(self.min_row, self.max_row + 1)]
+
+
+# -- value coercion ---------------------------------------------------------
+
+def _scalar(value: Any) -> Any:
+    """Reduce a range or array to its top-left value (implicit intersection)."""
+    while isinstance(value, list):
+        if not value or not value[0]:
+            return None
+        value = value[0][0]
+    return value
+
+
+# Dates and times are numbers in Excel (serial days in the 1900 date system)
+_DATES = (datetime.date, datetime.time, datetime.timedelta)
+
+
+def _number(value: Any) -> float:
+    value = _scalar(value)
+    if isinstance(value, ExcelError):
+        raise _Failed(value)
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, _DATES):
+        return float(to_excel(value))
+    try:
+        return float(str(value).strip().replace(",", ""))
+    except ValueError:
+        raise _Failed(VALUE)
+
+
+def _text(value: Any) -> str:
+    value = _scalar(value)
+    if isinstance(value, ExcelError):
+        raise _Failed(value)
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _truthy(value: Any) -> bool:
+    value = _scalar(value)
+    if isinstance(value, ExcelError):
+        raise _Failed(value)
+    if isinstance(value, str):
+        if value.upper() in ("TRUE", "FALSE"):
+            return value.upper() == "TRUE"
+        raise _Failed(VALUE)
+    return bool(value)
+
+
+def _as_range(value: Any) -> Any:
+    return value if isinstance(value, list) else [[value]]
+
+
+def _cells(value: Any) -> Iterator[Any]:
+    """Iterate the cells of a range/array, or a single scalar."""
+    if isinstance(value, list):
+        for row in value:
+            yield from row
+    else:
+        yield value
+
+
+# Aggregates whose reference arguments count like ranges, even single cells
+_AGGREGATES = frozenset({"SUM", "AVERAGE", "MIN", "MAX", "NPV"})
+
+
+def _numbers(values: Sequence[Any]) -> List[float]:
+    """
+    Collect numeric arguments the way Excel aggregates do.
+
+    Inside ranges (and references, which the parser passes as ranges) only
+    numbers count: text, logicals and blanks are ignored. Direct arguments
+    are coerced. Errors propagate in both cases.
+    """
+    numbers = []
+    for value in values:
+        if isinstance(value, list):
+            for cell in _cells(value):
+                if isinstance(cell, ExcelError):
+                    raise _Failed(cell)
+                if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+                    numbers.append(float(cell))
+                elif isinstance(cell, _DATES):
+                    numbers.append(float(to_excel(cell)))
+        elif value is not None:
+            numbers.append(_number(value))
+    return numbers
+
+
+def _compare_key(value: Any) -> Tuple[int, Any]:
+    # Excel orders numbers < text < logicals; text compares case-insensitively
+    if isinstance(value, bool):
+        return 2, value
+    if isinstance(value, str):
+        return 1, value.lower()
+    if isinstance(value, _DATES):
+        return 0, float(to_excel(value))
+    return 0, float(value)
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    left, right = _scalar(left), _scalar(right)
+    for value in (left, right):
+        if isinstance(value, ExcelError):
+            raise _Failed(value)
+    # Blanks take the type of the other side
+    if left is None:
+        left = "" if isinstance(right, str) else (False if isinstance(right, bool) else 0)
+    if right is None:
+        right = "" if isinstance(left, str) else (False if isinstance(left, bool) else 0)
+    a, b = _compare_key(left), _compare_key(right)
+    if op == "=":
+        return a == b
+    if op == "<>":
+        return a != b
+    if op == "<":
+        return a < b
+    if op == ">":
+        return a > b
+    if op == "<=":
+        return a <= b
+    return a >= b
+
+
+def _arithmetic(op: str, a: float, b: float) -> float:
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        if b == 0:
+            raise _Failed(DIV0)
+        return a / b
+    try:
+        result = a ** b
+    except (OverflowError, ZeroDivisionError):
+        raise _Failed(NUM)
+    if isinstance(result, complex):
+        raise _Failed(NUM)
+    return result
+
+
+# -- functions --------------------------------------------------------------
+
+Thunk = Callable[[], Any]
+
+# name -> (implementation, lazy); lazy functions receive unevaluated thunks
+FUNCTIONS: Dict[str, Tuple[Callable[..., Any], bool]] = {}
+
+
+def _function(name: str, lazy: bool = False):
+    def register(implementation: Callable[..., Any]) -> Callable[..., Any]:
+        FUNCTIONS[name] = (implementation, lazy)
+        return implementation
+    return register
+
+
+@_function("SUM")
+def _sum(*values: Any) -> float:
+    return math.fsum(_numbers(values))
+
+
+@_function("AVERAGE")
+def _average(*values: Any) -> float:
+    numbers = _numbers(values)
+    if not numbers:
+        raise _Failed(DIV0)
+    return math.fsum(numbers) / len(numbers)
+
+
+@_function("MIN")
+def _min(*values: Any) -> float:
+    return min(_numbers(values), default=0.0)
+
+
+@_function("MAX")
+def _max(*values: Any) -> float:
+    return max(_numbers(values), default=0.0)
+
+
+@_function("COUNT")
+def _count(*values: Any) -> int:
+    count = 0
+    for value in values:
+        for cell in _cells(value):
+            if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+                count += 1
+    return count
+
+
+@_function("ROUND")
+def _round(value: Any, digits: Any = 0) -> float:
+    number, places = _number(value), int(_number(digits))
+    # Excel rounds half away from zero
+    scale = 10.0 ** places
+    return math.copysign(math.floor(abs(number) * scale + 0.5) / scale, number)
+
+
+@_function("ABS")
+def _abs(value: Any) -> float:
+    return abs(_number(value))
+
+
+@_function("IF", lazy=True)
+def _if(condition: Thunk, if_true: Optional[Thunk] = None, if_false: Optional[Thunk] = None) -> Any:
+    if _truthy(condition()):
+        return if_true() if if_true is not None else True
+    return if_false() if if_false is not None else False
+
+
+@_function("IFERROR", lazy=True)
+def _iferror(value: Thunk, value_if_error: Thunk) -> Any:
+    try:
+        result = _scalar(value())
+    except _Failed:
+        return value_if_error()
+    return value_if_error() if isinstance(result, ExcelError) else result
+
+
+@_function("AND")
+def _and(*values: Any) -> bool:
+    return all(_truthy(cell) for value in values for cell in _cells(value) if cell is not None)
+
+
+@_function("OR")
+def _or(*values: Any) -> bool:
+    return any(_truthy(cell) for value in values for cell in _cells(value) if cell is not None)
+
+
+@_function("NOT")
+def _not(value: Any) -> bool:
+    return not _truthy(value)
+
+
+@_function("NPV")
+def _npv(rate: Any, *values: Any) -> float:
+    discount = 1.0 + _number(rate)
+    if discount == 0:
+        raise _Failed(DIV0)
+    return math.fsum(value / discount ** period for period, value in enumerate(_numbers(values), start=1))
+
+
+def irr(cash_flows: Sequence[float], guess: float = 0.1, tolerance: float = 1e-10,
+        max_iterations: int = 100) -> Optional[float]:
+    """
+    Internal rate of return of periodic cash flows.
+
+    Scalar wrapper around :func:`backend.underwriting.returns.irr`, which
+    returns the root nearest ``guess`` like Excel's IRR.
+
+    Args:
+        cash_flows: Cash flows for periods 0..n
+        guess: Starting rate
+        tolerance: Convergence tolerance
+        max_iterations: Iteration limit
+
+    Returns:
+        The rate, or None if no root was found
+    """
+    flows = np.asarray([float(value) for value in cash_flows], dtype=np.float64)
+    if flows.size == 0:
+        return None
+    result = solve_irr(flows, guess, tolerance, max_iterations)
+    return float(result.rate[0]) if result.converged[0] else None
+
+
+@_function("IRR")
+def _irr(values: Any, guess: Any = 0.1) -> float:
+    result = irr(_numbers([_as_range(values)]), _number(guess))
+    if result is None:
+        raise _Failed(NUM)
+    return result
+
+
+@_function("PMT")
+def _pmt(rate: Any, periods: Any, present_value: Any, future_value: Any = 0, due: Any = 0) -> float:
+    rate, periods = _number(rate), _number(periods)
+    present_value, future_value = _number(present_value), _number(future_value)
+    if periods == 0:
+        raise _Failed(NUM)
+    if rate == 0:
+        return -(present_value + future_value) / periods
+    growth = (1.0 + rate) ** periods
+    timing = 1.0 + rate if _number(due) else 1.0
+    return -rate * (future_value + present_value * growth) / (timing * (growth - 1.0))
+
+
+def _grid(value: Any) -> List[List[Any]]:
+    return value if isinstance(value, list) else [[value]]
+
+
+@_function("INDEX")
+def _index(array: Any, row: Any, column: Any = None) -> Any:
+    grid = _grid(array)
+    row_number = int(_number(row))
+    column_number = None if column is None else int(_number(column))
+    if column_number is None:
+        if len(grid) == 1:
+            # INDEX(single_row, n) indexes along the row
+            row_number, column_number = 1, row_number
+        else:
+            column_number = 1 if grid and len(grid[0]) == 1 else 0
+    height, width = len(grid), len(grid[0]) if grid else 0
+    if not (0 <= row_number <= height and 0 <= column_number <= width):
+        raise _Failed(REF)
+    if row_number == 0 and column_number == 0:
+        return grid
+    if row_number == 0:
+        return [[line[column_number - 1]] for line in grid]
+    if column_number == 0:
+        return [grid[row_number - 1]]
+    return grid[row_number - 1][column_number - 1]
+
+
+@_function("MATCH")
+def _match(lookup_value: Any, lookup_array: Any, match_type: Any = 1) -> int:
+    grid = _grid(lookup_array)
+    if len(grid) > 1 and len(grid[0]) > 1:
+        raise _Failed(NA)
+    cells = list(_cells(grid))
+    target = _scalar(lookup_value)
+    if isinstance(target, ExcelError):
+        raise _Failed(target)
+    kind = int(_number(match_type))
+    target_key = _compare_key(target if target is not None else 0)
+    if kind == 0:
+        for position, cell in enumerate(cells, start=1):
+            if cell is not None and not isinstance(cell, ExcelError) and _compare_key(cell) == target_key:
+                return position
+        raise _Failed(NA)
+    # Approximate match over a sorted array: last position still on the right side of the target
+    found = None
+    for position, cell in enumerate(cells, start=1):
+        if cell is None or isinstance(cell, ExcelError):
+            continue
+        key = _compare_key(cell)
+        if key[0] != target_key[0]:
+            continue
+        if (kind > 0 and key <= target_key) or (kind < 0 and key >= target_key):
+            found = position
+        else:
+            break
+    if found is None:
+        raise _Failed(NA)
+    return found
+
+
+# -- compilation ------------------------------------------------------------
+
+class _Compiled(NamedTuple):
+    evaluate: Thunk
+    dependencies: Set[CellKey]
+    unsupported: Set[str]
+
+
+class _Parser:
+    """Recursive-descent compiler from openpyxl formula tokens to closures."""
+
+    _COMPARISONS = ("=", "<>", "<", ">", "<=", ">=")
+
+    def __init__(self, engine: "FormulaEngine", sheet: str, tokens: List[Token], depth: int = 0):
+        self.engine = engine
+        self.sheet = sheet
+        self.tokens = [token for token in tokens if token.type != Token.WSPACE]
+        self.position = 0
+        self.depth = depth
+        self.dependencies: Set[CellKey] = set()
+        self.unsupported: Set[str] = set()
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of formula")
+        self.position += 1
+        return token
+
+    def _infix(self, operators: Sequence[str]) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token.type == Token.OP_IN and token.value in operators:
+            self.position += 1
+            return token.value
+        return None
+
+    def compile(self) -> Thunk:
+        if not self.tokens:
+            return lambda: None
+        expression = self._comparison()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected token {self._peek().value!r}")
+        return expression
+
+    def _comparison(self) -> Thunk:
+        left = self._concatenation()
+        while True:
+            op = self._infix(self._COMPARISONS)
+            if op is None:
+                return left
+            right = self._concatenation()
+            left = (lambda op, a, b: lambda: _compare(op, a(), b()))(op, left, right)
+
+    def _concatenation(self) -> Thunk:
+        left = self._additive()
+        while self._infix(("&",)):
+            right = self._additive()
+            left = (lambda a, b: lambda: _text(a()) + _text(b()))(left, right)
+        return left
+
+    def _binary(self, operators: Sequence[str], operand: Callable[[], Thunk]) -> Thunk:
+        left = operand()
+        while True:
+            op = self._infix(operators)
+            if op is None:
+                return left
+            right = operand()
+            left = (lambda op, a, b: lambda: _arithmetic(op, _number(a()), _number(b())))(op, left, right)
+
+    def _additive(self) -> Thunk:
+        return self._binary(("+", "-"), self._multiplicative)
+
+    def _multiplicative(self) -> Thunk:
+        return self._binary(("*", "/"), self._power)
+
+    def _power(self) -> Thunk:
+        return self._binary(("^",), self._unary)
+
+    def _unary(self) -> Thunk:
+        token = self._peek()
+        if token is not None and token.type == Token.OP_PRE:
+            self.position += 1
+            operand = self._unary()
+            if token.value == "-":
+                return lambda: -_number(operand())
+            return operand
+        return self._postfix()
+
+    def _postfix(self) -> Thunk:
+        operand = self._primary()
+        while True:
+            token = self._peek()
+            if token is None or token.type != Token.OP_POST:
+                return operand
+            self.position += 1
+            operand = (lambda a: lambda: _number(a()) / 100.0)(operand)
+
+    def _primary(self) -> Thunk:
+        token = self._next()
+        if token.type == Token.OPERAND:
+            return self._operand(token)
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            return self._call(token.value[:-1])
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            expression = self._comparison()
+            closing = self._next()
+            if closing.type != Token.PAREN:
+                raise ValueError("Unbalanced parentheses")
+            return expression
+        if token.type == Token.ARRAY and token.subtype == Token.OPEN:
+            return self._array()
+        raise ValueError(f"Unexpected token {token.value!r}")
+
+    def _operand(self, token: Token) -> Thunk:
+        if token.subtype == Token.NUMBER:
+            value = float(token.value)
+            return lambda: value
+        if token.subtype == Token.TEXT:
+            text = token.value[1:-1].replace('""', '"')
+            return lambda: text
+        if token.subtype == Token.LOGICAL:
+            flag = token.value.upper() == "TRUE"
+            return lambda: flag
+        if token.subtype == Token.ERROR:
+            error = _ERRORS.get(token.value.upper(), ExcelError(token.value))
+            return lambda: error
+        return self._reference(token.value)
+
+    def _reference(self, text: str) -> Thunk:
+        definition = self.engine._resolve_name(text, self.sheet)
+        if definition is None:
+            try:
+                area = self.engine._resolve_area(text, self.sheet)
+            except ValueError:
+                # Deleted sheet or external workbook link: #REF!, as in Excel
+                return lambda: REF
+            if area is None:
+                return lambda: NAME
+            values = self.engine._values
+            if area.is_cell:
+                key = (area.sheet, area.min_row, area.min_col)
+                self.dependencies.add(key)
+                return lambda: values.get(key)
+            grid = area.keys()
+            for line in grid:
+                self.dependencies.update(line)
+            return lambda: [[values.get(key) for key in line] for line in grid]
+
+        if self.depth > 20:
+            raise ValueError(f"Defined name {text!r} is nested too deeply")
+        sheet, formula = definition
+        parser = _Parser(self.engine, sheet, Tokenizer("=" + formula).items, self.depth + 1)
+        expression = parser.compile()
+        self.dependencies.update(parser.dependencies)
+        self.unsupported.update(parser.unsupported)
+        return expression
+
+    def _call(self, name: str) -> Thunk:
+        name = name.upper()
+        for prefix in _FUNCTION_PREFIXES:
+            if name.startswith(prefix.upper()):
+                name = name[len(prefix):]
+        arguments: List[Optional[Thunk]] = []
+        token = self._peek()
+        if token is not None and token.type == Token.FUNC and token.subtype == Token.CLOSE:
+            self.position += 1
+        else:
+            while True:
+                token = self._peek()
+                if token is not None and (token.type == Token.SEP or
+                                          (token.type == Token.FUNC and token.subtype == Token.CLOSE)):
+                    # Empty argument, e.g. IF(A1,,1)
+                    arguments.append(lambda: None)
+                else:
+                    start = self.position
+                    argument = self._comparison()
+                    if name in _AGGREGATES and self.position == start + 1 and token.subtype == Token.RANGE:
+                        # A bare reference: a single cell counts like a one-cell range
+                        argument = (lambda a: lambda: _as_range(a()))(argument)
+                    arguments.append(argument)
+                separator = self._next()
+                if separator.type == Token.FUNC and separator.subtype == Token.CLOSE:
+                    break
+                if separator.type != Token.SEP:
+                    raise ValueError(f"Unexpected token {separator.value!r} in {name} arguments")
+
+        entry = FUNCTIONS.get(name)
+        if entry is None:
+            self.unsupported.add(name)
+            return lambda: NAME
+        implementation, lazy = entry
+        if lazy:
+            return lambda: implementation(*arguments)
+
+        def call() -> Any:
+            try:
+                return implementation(*[argument() for argument in arguments])
+            except TypeError:
+                # Wrong number of arguments
+                raise _Failed(VALUE)
+        return call
+
+    def _array(self) -> Thunk:
+        rows: List[List[Thunk]] = [[]]
+        while True:
+            token = self._peek()
+            if token is not None and token.type == Token.ARRAY and token.subtype == Token.CLOSE:
+                self.position += 1
+                break
+            rows[-1].append(self._unary())
+            separator = self._peek()
+            if separator is not None and separator.type == Token.SEP:
+                self.position += 1
+                if separator.subtype == Token.ROW:
+                    rows.append([])
+        return lambda: [[element() for element in row] for row in rows]
+
+
+# -- engine -----------------------------------------------------------------
+
+class FormulaEngine:
+    """
+    Compiled workbook with incremental recalculation.
+
+    Example:
+        engine = FormulaEngine.from_xlsx("proforma.xlsx")
+        engine.set_value("exit_cap_rate", 0.055)
+        engine.get_value("Returns!C12")
+    """
+
+    # Number of recalculation plans (one per distinct set of changed inputs) kept
+    plan_cache_size = 64
+
+    def __init__(self, sheets: Dict[str, Dict[Tuple[int, int], Any]],
+                 names: Optional[Dict[str, str]] = None,
+                 local_names: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Compile a workbook from raw cell contents.
+
+        Args:
+            sheets: ``{sheet title: {(row, column): value}}`` in workbook
+                order; strings starting with ``=`` are formulas
+            names: Workbook-level defined names and their definitions
+                (e.g. ``{"exit_cap_rate": "Inputs!$B$5"}``)
+            local_names: Sheet-scoped defined names, ``{sheet: {name: definition}}``
+
+        Raises:
+            ValueError: If a formula cannot be parsed or formulas reference
+                each other circularly
+        """
+        self.sheet_titles = list(sheets)
+        self._sheet_lookup = {title.lower(): title for title in sheets}
+        self._extents = {
+            title: (max((row for row, _ in cells), default=1), max((col for _, col in cells), default=1))
+            for title, cells in sheets.items()
+        }
+        self._names = {name.lower(): definition for name, definition in (names or {}).items()}
+        self._local_names = {
+            sheet: {name.lower(): definition for name, definition in definitions.items()}
+            for sheet, definitions in (local_names or {}).items()
+        }
+        self._values: Dict[CellKey, Any] = {}
+        self._formulas: Dict[CellKey, str] = {}
+        self._compiled: Dict[CellKey, Thunk] = {}
+        self._dependents: Dict[CellKey, List[CellKey]] = {}
+        self.unsupported: Dict[CellKey, Set[str]] = {}
+
+        for sheet, cells in sheets.items():
+            for (row, col), value in cells.items():
+                key = (sheet, row, col)
+                if isinstance(value, str) and value.startswith("=") and len(value) > 1:
+                    self._formulas[key] = value
+                elif value is not None:
+                    self._values[key] = value
+
+        dependencies: Dict[CellKey, Set[CellKey]] = {}
+        for key, formula in self._formulas.items():
+            try:
+                compiled = self._compile(formula, key[0])
+            except ValueError as e:
+                raise ValueError(f"Cannot parse formula in {self.address(key)} ({formula}): {e}")
+            self._compiled[key] = compiled.evaluate
+            dependencies[key] = compiled.dependencies
+            if compiled.unsupported:
+                self.unsupported[key] = compiled.unsupported
+            for dependency in compiled.dependencies:
+                self._dependents.setdefault(dependency, []).append(key)
+
+        self._order = self._topological_order(dependencies)
+        self._rank = {key: position for position, key in enumerate(self._order)}
+        self._pending: Set[CellKey] = set()
+        self._plans: "OrderedDict[frozenset, List[CellKey]]" = OrderedDict()
+        for key in self._order:
+            self._evaluate(key)
+
+    @classmethod
+    def from_workbook(cls, workbook) -> "FormulaEngine":
+        """
+        Compile an openpyxl workbook loaded with formulas (``data_only=False``).
+
+        Args:
+            workbook: openpyxl Workbook
+
+        Returns:
+            FormulaEngine
+        """
+        sheets: Dict[str, Dict[Tuple[int, int], Any]] = {}
+        local_names: Dict[str, Dict[str, str]] = {}
+        for worksheet in workbook.worksheets:
+            cells: Dict[Tuple[int, int], Any] = {}
+            if hasattr(worksheet, "reset_dimensions"):
+                # Read-only sheets may carry a stale dimension record
+                worksheet.reset_dimensions()
+            for row_number, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
+                for col_number, value in enumerate(row, start=1):
+                    if hasattr(value, "text"):
+                        # Array formula: evaluate its text at the anchor cell
+                        value = value.text
+                    elif value is not None and not isinstance(value, (str, int, float, bool)) \
+                            and not hasattr(value, "isoformat"):
+                        value = None
+                    if value is not None:
+                        cells[(row_number, col_number)] = value
+            sheets[worksheet.title] = cells
+            local_names[worksheet.title] = {
+                name: definition.value for name, definition in worksheet.defined_names.items()
+                if not definition.is_reserved}
+        names = {name: definition.value for name, definition in workbook.defined_names.items()
+                 if not definition.is_reserved and not definition.is_external}
+        return cls(sheets, names, local_names)
+
+    @classmethod
+    def from_xlsx(cls, xlsx_path: str) -> "FormulaEngine":
+        """
+        Load and compile a workbook's formulas.
+
+        Args:
+            xlsx_path: Path to the Excel file
+
+        Returns:
+            FormulaEngine
+
+        Raises:
+            FileNotFoundError: If the Excel file doesn't exist
+            ValueError: If the file is not a valid Excel file or a formula
+                cannot be compiled
+        """
+        if not Path(xlsx_path).exists():
+            raise FileNotFoundError(f"Excel file not found: {xlsx_path}")
+        try:
+            workbook = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=False)
+        except Exception as e:
+            raise ValueError(f"Invalid Excel file: {e}")
+        try:
+            return cls.from_workbook(workbook)
+        finally:
+            workbook.close()
+
+    # -- references ---------------------------------------------------------
+
+    @staticmethod
+    def address(key: CellKey) -> str:
+        """Format a cell key as ``Sheet!A1``."""
+        sheet, row, col = key
+        title = f"'{sheet}'" if re.search(r"[^A-Za-z0-9_]", sheet) else sheet
+        return f"{title}!{get_column_letter(col)}{row}"
+
+    def _split_sheet(self, text: str, default_sheet: Optional[str]) -> Tuple[Optional[str], str]:
+        match = _SHEET_PREFIX.match(text)
+        if match is None:
+            return default_sheet, text
+        sheet = (match.group(1) or "").replace("''", "'") or match.group(2)
+        return self._sheet_lookup.get(sheet.lower(), sheet), match.group(3)
+
+    def _resolve_area(self, text: str, default_sheet: Optional[str]) -> Optional[_Area]:
+        sheet, cells = self._split_sheet(text, default_sheet)
+        cells = cells.replace("$", "")
+        if ":" not in cells and not _CELL_ADDRESS.match(cells):
+            return None
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(cells)
+        except (ValueError, TypeError):
+            return None
+        if any(value is not None and value > limit for value, limit in
+               ((min_col, _MAX_COLUMN), (max_col, _MAX_COLUMN), (min_row, _MAX_ROW), (max_row, _MAX_ROW))):
+            return None
+        if sheet not in self._extents:
+            raise ValueError(f"Reference to unknown sheet in {text!r}")
+        # Whole-row/column references are bounded by the sheet's used extent
+        last_row, last_col = self._extents[sheet]
+        return _Area(sheet, min_row or 1, min_col or 1, max_row or max(last_row, min_row or 1),
+                     max_col or max(last_col, min_col or 1))
+
+    def _resolve_name(self, text: str, sheet: Optional[str]) -> Optional[Tuple[Optional[str], str]]:
+        """Find a defined name's (scope sheet, definition), preferring sheet-scoped names."""
+        scope, name = self._split_sheet(text, sheet)
+        definition = self._local_names.get(scope, {}).get(name.lower()) if scope else None
+        if definition is None and (scope == sheet or scope is None):
+            definition = self._names.get(name.lower())
+        return None if definition is None else (scope, definition)
+
+    def _compile(self, formula: str, sheet: str) -> _Compiled:
+        parser = _Parser(self, sheet, Tokenizer(formula).items)
+        evaluate = parser.compile()
+        return _Compiled(evaluate, parser.dependencies, parser.unsupported)
+
+    def _cell(self, reference: str) -> CellKey:
+        """Resolve ``Sheet!A1`` or a single-cell defined name to a cell key."""
+        default_sheet = self.sheet_titles[0] if len(self.sheet_titles) == 1 else None
+        definition = self._resolve_name(reference, default_sheet)
+        if definition is not None:
+            area = self._resolve_area(definition[1].lstrip("="), definition[0])
+        else:
+            area = self._resolve_area(reference, default_sheet)
+        if area is None or area.sheet is None:
+            raise ValueError(f"Unknown cell reference: {reference}")
+        if not area.is_cell:
+            raise ValueError(f"Reference is not a single cell: {reference}")
+        return area.sheet, area.min_row, area.min_col
+
+    # -- evaluation -----------------------------------------------------------
+
+    @staticmethod
+    def _topological_order(dependencies: Dict[CellKey, Set[CellKey]]) -> List[CellKey]:
+        """Order formula cells so each comes after the formulas it depends on."""
+        remaining = {key: sum(1 for dependency in deps if dependency in dependencies)
+                     for key, deps in dependencies.items()}
+        dependents: Dict[CellKey, List[CellKey]] = {}
+        for key, deps in dependencies.items():
+            for dependency in deps:
+                if dependency in dependencies:
+                    dependents.setdefault(dependency, []).append(key)
+        ready = [key for key, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            key = ready.pop()
+            order.append(key)
+            for dependent in dependents.get(key, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) < len(dependencies):
+            cycle = sorted(key for key, count in remaining.items() if count > 0)
+            raise ValueError("Circular reference involving "
+                             + ", ".join(FormulaEngine.address(key) for key in cycle[:5]))
+        return order
+
+    def _evaluate(self, key: CellKey) -> None:
+        try:
+            value = _scalar(self._compiled[key]())
+        except _Failed as e:
+            value = e.error
+        except ZeroDivisionError:
+            value = DIV0
+        except OverflowError:
+            value = NUM
+        except TypeError:
+            # A value of a type no operation accepts
+            value = VALUE
+        if isinstance(value, float) and not math.isfinite(value):
+            value = NUM
+        self._values[key] = value
+
+    def _plan(self, changed: frozenset) -> List[CellKey]:
+        """Formula cells downstream of ``changed``, in evaluation order (LRU-memoized)."""
+        plan = self._plans.get(changed)
+        if plan is not None:
+            self._plans.move_to_end(changed)
+        else:
+            dirty: Set[CellKey] = set()
+            stack = list(changed)
+            while stack:
+                for dependent in self._dependents.get(stack.pop(), ()):
+                    if dependent not in dirty:
+                        dirty.add(dependent)
+                        stack.append(dependent)
+            plan = sorted(dirty, key=self._rank.__getitem__)
+            self._plans[changed] = plan
+            while len(self._plans) > self.plan_cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def set_value(self, reference: str, value: Any) -> None:
+        """
+        Change an input cell; dependents are recalculated on the next read.
+
+        Args:
+            reference: ``Sheet!A1`` or a single-cell defined name
+            value: New cell value
+
+        Raises:
+            ValueError: If the reference is unknown or is a formula cell
+        """
+        key = self._cell(reference)
+        if key in self._formulas:
+            raise ValueError(f"{self.address(key)} contains a formula and cannot be set")
+        if value is None:
+            self._values.pop(key, None)
+        else:
+            self._values[key] = value
+        self._pending.add(key)
+
+    def set_values(self, values: Dict[str, Any]) -> None:
+        """Change several input cells; see :meth:`set_value`."""
+        for reference, value in values.items():
+            self.set_value(reference, value)
+
+    def recalculate(self) -> int:
+        """
+        Re-evaluate formulas affected by changes since the last recalculation.
+
+        Returns:
+            Number of formula cells evaluated
+        """
+        if not self._pending:
+            return 0
+        plan = self._plan(frozenset(self._pending))
+        self._pending = set()
+        for key in plan:
+            self._evaluate(key)
+        return len(plan)
+
+    def get_value(self, reference: str) -> Any:
+        """
+        Current value of a cell, range or defined name.
+
+        Args:
+            reference: ``Sheet!A1``, ``Sheet!A1:C3`` or a defined name
+
+        Returns:
+            Scalar for single cells (an ``ExcelError`` for error values),
+            list of rows for ranges
+
+        Raises:
+            ValueError: If the reference is unknown
+        """
+        self.recalculate()
+        default_sheet = self.sheet_titles[0] if len(self.sheet_titles) == 1 else None
+        definition = self._resolve_name(reference, default_sheet)
+        area = None if definition is not None else self._resolve_area(reference, default_sheet)
+        if area is None:
+            if definition is None:
+                raise ValueError(f"Unknown reference: {reference}")
+            try:
+                value = self._compile("=" + definition[1].lstrip("="), definition[0]).evaluate()
+            except _Failed as e:
+                value = e.error
+            return value
+        if area.sheet is None:
+            raise ValueError(f"Reference needs a sheet name: {reference}")
+        if area.is_cell:
+            return self._values.get((area.sheet, area.min_row, area.min_col))
+        return [[self._values.get(key) for key in line] for line in area.keys()]
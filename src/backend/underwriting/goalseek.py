@@ -0,0 +1,185 @@
+"""
+Batched goal seek: solve one deal input against target metrics.
+
+Answers questions such as "what is the most we can pay and still hit a 15%
+levered IRR with a 1.25x DSCR?" for a whole batch of deals at once. Each
+(deal, target) pair is a bracketed bisection on ``metric - target``; every
+iteration evaluates the midpoints of all pairs in a single vectorized
+projection, so the cost grows with the number of iterations, not deals.
+
+Targets are minimums (``metric >= target``). Each target's crossing splits
+the bracket into a feasible and an infeasible side, and the feasible
+intervals of all targets are intersected: for the maximum price meeting
+every target read :attr:`GoalSeekResult.high`, for the minimum exit cap
+read :attr:`GoalSeekResult.low`, and so on.
+"""
+
+from typing import Dict, Mapping, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from .engine import (
+    AssumptionInput,
+    OPTIONAL_ASSUMPTIONS,
+    REQUIRED_ASSUMPTIONS,
+    assumption_columns,
+    project_cash_flows,
+)
+from .returns import METRICS, deal_metrics
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Deal inputs that can be solved for besides assumptions. ``loan_amount``
+# replaces LTV/DSCR sizing with an explicit loan.
+SOLVABLE_INPUTS = ("purchase_price", "gross_potential_rent", "loan_amount")
+
+
+class GoalSeekResult(NamedTuple):
+    """Per-deal solutions, each of shape ``(deals,)``."""
+
+    low: np.ndarray  # smallest input meeting every target (NaN if none)
+    high: np.ndarray  # largest input meeting every target (NaN if none)
+    feasible: np.ndarray  # bool: some input within the bounds meets every target
+    solutions: Dict[str, np.ndarray]  # per target: input where the metric equals it (NaN if not crossed)
+
+
+def _evaluate(
+    variable: str,
+    values: np.ndarray,
+    deals: np.ndarray,
+    price: np.ndarray,
+    gpr: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    metrics: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """Metrics for rows ``deals`` with ``variable`` set to ``values``."""
+    row_price, row_gpr = price[deals], gpr[deals]
+    row_columns = {key: column[deals] for key, column in columns.items()}
+    if variable == "purchase_price":
+        row_price = values
+    elif variable == "gross_potential_rent":
+        row_gpr = values
+    elif variable == "loan_amount":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            row_columns["loan_to_value"] = values / row_price
+        row_columns["debt_service_coverage"] = np.zeros(values.size)
+    else:
+        row_columns[variable] = values
+    results = deal_metrics(project_cash_flows(row_price, row_gpr, row_columns), metrics)
+    for metric, result in results.items():
+        # No debt means coverage is unconstrained; any other undefined metric misses its target
+        results[metric] = np.where(np.isnan(result), np.inf if metric == "dscr" else -np.inf, result)
+    return results
+
+
+def goal_seek(
+    purchase_price: ArrayLike,
+    gross_potential_rent: ArrayLike,
+    assumptions: AssumptionInput,
+    variable: str,
+    targets: Mapping[str, float],
+    bounds: Tuple[ArrayLike, ArrayLike],
+    tolerance: float = 1e-6,
+    max_iterations: int = 100,
+) -> GoalSeekResult:
+    """
+    Solve ``variable`` for every deal so that each metric meets its target.
+
+    Metrics are assumed monotonic in ``variable`` within ``bounds``; where a
+    metric crosses its target more than once, one crossing is returned.
+
+    Args:
+        purchase_price: Purchase price per deal (scalar or ``(deals,)``)
+        gross_potential_rent: Year-1 annual gross potential rent per deal
+        assumptions: Assumptions in any form accepted by
+            :func:`backend.underwriting.engine.project_cash_flows`
+        variable: Input to solve for: ``purchase_price``,
+            ``gross_potential_rent``, ``loan_amount`` or an engine assumption
+            (e.g. ``exit_cap_rate``)
+        targets: Metric -> minimum value, e.g. ``{"irr": 0.15, "dscr": 1.25}``
+        bounds: ``(low, high)`` search bracket, scalars or per deal
+        tolerance: Convergence tolerance on the input, relative to its
+            magnitude (absolute below 1)
+        max_iterations: Bisection iteration limit
+
+    Returns:
+        GoalSeekResult
+
+    Raises:
+        ValueError: If the variable, a metric or the bounds are invalid
+    """
+    if variable not in SOLVABLE_INPUTS and variable not in REQUIRED_ASSUMPTIONS \
+            and variable not in OPTIONAL_ASSUMPTIONS:
+        raise ValueError(f"Unknown goal-seek variable: {variable}")
+    if not targets:
+        raise ValueError("At least one target is required")
+    unknown = [metric for metric in targets if metric not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric: {', '.join(unknown)}")
+
+    price = np.atleast_1d(np.asarray(purchase_price, dtype=np.float64))
+    gpr = np.atleast_1d(np.asarray(gross_potential_rent, dtype=np.float64))
+    if not isinstance(assumptions, Mapping):
+        assumptions = list(assumptions)
+        count = max(len(price), len(gpr), len(assumptions))
+    else:
+        count = max(len(price), len(gpr))
+    try:
+        price = np.broadcast_to(price, (count,))
+        gpr = np.broadcast_to(gpr, (count,))
+        low = np.broadcast_to(np.asarray(bounds[0], dtype=np.float64), (count,)).copy()
+        high = np.broadcast_to(np.asarray(bounds[1], dtype=np.float64), (count,)).copy()
+    except ValueError:
+        raise ValueError("Deal inputs and bounds must be scalars or have one value per deal")
+    if np.any(~(low < high)):
+        raise ValueError("bounds must satisfy low < high")
+    columns = assumption_columns(assumptions, count)
+
+    names = list(targets)
+    goals = np.array([targets[name] for name in names], dtype=np.float64)
+    deals = np.arange(count)
+
+    # Evaluate both ends of every bracket in one pass
+    ends = _evaluate(variable, np.concatenate([low, high]), np.concatenate([deals, deals]),
+                     price, gpr, columns, names)
+    at_low = np.stack([ends[name][:count] for name in names]) - goals[:, None]
+    at_high = np.stack([ends[name][count:] for name in names]) - goals[:, None]
+    crossed = (at_low >= 0) != (at_high >= 0)
+
+    # Bisection state per (target, deal)
+    lower = np.broadcast_to(low, crossed.shape).copy()
+    upper = np.broadcast_to(high, crossed.shape).copy()
+    low_feasible = at_low >= 0
+    active = crossed.copy()
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        target_index, deal_index = np.nonzero(active)
+        middle = (lower[active] + upper[active]) / 2.0
+        pending = np.unique(target_index)
+        evaluated = _evaluate(variable, middle, deal_index, price, gpr, columns, [names[t] for t in pending])
+        gap = np.empty(middle.size)
+        for t in pending:
+            rows = target_index == t
+            gap[rows] = evaluated[names[t]][rows] - goals[t]
+        # Move whichever end is on the same side of the target as the midpoint
+        same_as_low = (gap >= 0) == low_feasible[active]
+        lower[target_index[same_as_low], deal_index[same_as_low]] = middle[same_as_low]
+        upper[target_index[~same_as_low], deal_index[~same_as_low]] = middle[~same_as_low]
+        width = upper - lower
+        active &= width > tolerance * np.maximum(1.0, np.abs(lower))
+
+    crossing = np.where(crossed, (lower + upper) / 2.0, np.nan)
+    # Feasible interval per target, then intersected across targets
+    both_feasible = ~crossed & (at_low >= 0)
+    target_low = np.where(crossed & ~low_feasible, crossing, np.where(crossed | both_feasible, low, np.nan))
+    target_high = np.where(crossed & low_feasible, crossing, np.where(crossed | both_feasible, high, np.nan))
+    result_low = target_low.max(axis=0)
+    result_high = target_high.min(axis=0)
+    feasible = np.isfinite(result_low) & np.isfinite(result_high) & (result_low <= result_high)
+    return GoalSeekResult(
+        low=np.where(feasible, result_low, np.nan),
+        high=np.where(feasible, result_high, np.nan),
+        feasible=feasible,
+        solutions={name: crossing[index] for index, name in enumerate(names)},
+    )
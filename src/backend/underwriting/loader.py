@@ -2,16 +2,34 @@
 Pro-forma loader for multifamily underwriting analysis.
 """
 
-from typing import Dict, Any
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+import numpy as np
 import openpyxl
+from openpyxl.utils.cell import range_boundaries
+from backend.etl.cache import ParseCache
 
+# Bump whenever the shape of parse_proforma output changes
+LOADER_VERSION = "2"
 
-def parse_proforma(xlsx_path: str) -> Dict[str, Any]:
+
+def parse_proforma(xlsx_path: str, cache: Optional[ParseCache] = None) -> Dict[str, Any]:
     """
-    Parse a pro-forma Excel file and extract named ranges.
+    Parse a pro-forma Excel file and extract the values of its named ranges.
+    
+    Single-cell names resolve to the cell value; multi-cell names resolve to a
+    2D NumPy array (float64 when every non-blank cell is numeric, with blanks
+    as NaN, otherwise object). Names scoped to one sheet are keyed as
+    ``"Sheet!Name"``. Named constants (e.g. ``=0.05``) resolve to their value;
+    names that are formulas, external references or broken (``#REF!``) are
+    skipped.
     
     Args:
         xlsx_path: Path to the Excel file containing pro-forma data
+        cache: Optional parse cache; identical workbooks are served from it
+            instead of being reloaded (results that cannot be encoded are
+            simply not stored)
         
     Returns:
         Dictionary containing parsed pro-forma data from named ranges
@@ -20,24 +38,327 @@ def parse_proforma(xlsx_path: str) -> Dict[str, Any]:
         FileNotFoundError: If the Excel file doesn't exist
         ValueError: If the file is not a valid Excel file
     """
+    if cache is not None:
+        if not Path(xlsx_path).exists():
+            raise FileNotFoundError(f"Excel file not found: {xlsx_path}")
+        return cache.get_or_parse(xlsx_path, "proforma", LOADER_VERSION,
+                                  lambda: _load_named_ranges(xlsx_path))
+    return _load_named_ranges(xlsx_path)
+
+
+def _constant_value(text: str) -> Any:
+    """Convert a named constant's definition (``0.05``, ``"Class A"``, ``TRUE``) to a value."""
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1].replace('""', '"')
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
     try:
-        # Load the workbook
-        workbook = openpyxl.load_workbook(xlsx_path, data_only=True)
-        
-        # Extract named ranges
-        named_ranges = {}
-        for named_range in workbook.defined_names.definedName:
+        number = float(text)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() and "." not in text and "e" not in text.lower() else number
+
+
+def _collect_names(workbook) -> Tuple[List[str], Dict[str, Any], Dict[str, List[Tuple[str, int, Tuple]]]]:
+    """
+    Group the workbook's named ranges by destination sheet.
+    
+    Returns:
+        Tuple of (keys in definition order, resolved constants,
+        ``{sheet: [(key, area index, bounds)]}``)
+        where bounds are ``(min_col, min_row, max_col, max_row)`` with ``None``
+        for open-ended whole-row/column references
+    """
+    definitions = [(name, definition) for name, definition in workbook.defined_names.items()]
+    for worksheet in workbook.worksheets:
+        definitions.extend((f"{worksheet.title}!{name}", definition)
+                           for name, definition in worksheet.defined_names.items())
+    
+    constants: Dict[str, Any] = {}
+    by_sheet: Dict[str, List[Tuple[str, int, Tuple]]] = {}
+    for key, definition in definitions:
+        try:
+            if definition.is_reserved or definition.is_external:
+                continue
+            if definition.type != "RANGE":
+                value = _constant_value(definition.value.strip())
+                if value is not None:
+                    constants[key] = value
+                continue
+            destinations = list(definition.destinations)
+        except Exception:
+            # Skip definitions that can't be parsed
+            continue
+        for area, (sheet, cells) in enumerate(destinations):
+            if sheet not in workbook.sheetnames:
+                continue
             try:
-                # Get the range value
-                range_value = workbook.defined_names[named_range.name]
-                named_ranges[named_range.name] = range_value
-            except Exception as e:
-                # Skip ranges that can't be parsed
+                bounds = range_boundaries(cells.replace("$", ""))
+            except ValueError:
                 continue
+            by_sheet.setdefault(sheet, []).append((key, area, bounds))
+    return [key for key, _ in definitions], constants, by_sheet
+
+
+def _to_array(rows: List[List[Any]]) -> np.ndarray:
+    """Build a 2D array, numeric when every non-blank cell is a number."""
+    values = [value for row in rows for value in row]
+    numeric = any(value is not None for value in values) and all(
+        value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in values)
+    if numeric:
+        return np.array([[np.nan if value is None else value for value in row] for row in rows], dtype=np.float64)
+    array = np.empty((len(rows), len(rows[0]) if rows else 0), dtype=object)
+    for i, row in enumerate(rows):
+        array[i, :] = row
+    return array
+
+
+def _read_sheet_ranges(worksheet, ranges: List[Tuple[str, int, Tuple]]) -> Dict[Tuple[str, int], Any]:
+    """
+    Read every range on one sheet in a single streaming pass over their bounding box.
+    
+    Returns:
+        Dictionary mapping ``(key, area index)`` to a scalar or 2D array
+    """
+    min_rows = [bounds[1] or 1 for _, _, bounds in ranges]
+    min_cols = [bounds[0] or 1 for _, _, bounds in ranges]
+    max_rows = [bounds[3] for _, _, bounds in ranges]
+    max_cols = [bounds[2] for _, _, bounds in ranges]
+    box_min_row, box_min_col = min(min_rows), min(min_cols)
+    box_max_row = None if None in max_rows else max(max_rows)
+    box_max_col = None if None in max_cols else max(max_cols)
+    
+    collected: List[List[List[Any]]] = [[] for _ in ranges]
+    # Ranges ordered by first row, so each streamed row only visits ranges that cover it
+    order = sorted(range(len(ranges)), key=lambda i: min_rows[i])
+    active: List[int] = []
+    next_range = 0
+    for row_number, row in enumerate(
+            worksheet.iter_rows(min_row=box_min_row, max_row=box_max_row,
+                                min_col=box_min_col, max_col=box_max_col, values_only=True),
+            start=box_min_row):
+        while next_range < len(order) and min_rows[order[next_range]] <= row_number:
+            active.append(order[next_range])
+            next_range += 1
+        if not active:
+            continue
+        still_active = []
+        for i in active:
+            start = min_cols[i] - box_min_col
+            stop = None if max_cols[i] is None else max_cols[i] - box_min_col + 1
+            cells = list(row[start:stop])
+            if stop is not None and len(cells) < stop - start:
+                cells.extend([None] * (stop - start - len(cells)))
+            collected[i].append(cells)
+            if max_rows[i] is None or row_number < max_rows[i]:
+                still_active.append(i)
+        active = still_active
+        if not active and next_range == len(order):
+            break
+    
+    values: Dict[Tuple[str, int], Any] = {}
+    for i, (key, area, bounds) in enumerate(ranges):
+        rows = collected[i]
+        if bounds[1] is not None and bounds[1] == bounds[3] and bounds[0] == bounds[2]:
+            values[(key, area)] = rows[0][0] if rows and rows[0] else None
+        else:
+            width = max((len(row) for row in rows), default=0)
+            if bounds[2] is not None:
+                width = max(width, bounds[2] - min_cols[i] + 1)
+            rows = [row + [None] * (width - len(row)) for row in rows]
+            # Rows past the sheet's last used row are not streamed; pad to the defined height
+            if max_rows[i] is not None:
+                rows.extend([None] * width for _ in range(max_rows[i] - min_rows[i] + 1 - len(rows)))
+            values[(key, area)] = _to_array(rows)
+    return values
+
+
+def _load_named_ranges(xlsx_path: str) -> Dict[str, Any]:
+    """
+    Load a workbook in read-only mode and resolve all of its named ranges.
+    
+    Names are grouped by destination sheet and each sheet is streamed once,
+    so the cost does not grow with the number of names.
+    
+    Args:
+        xlsx_path: Path to the Excel file
+        
+    Returns:
+        Dictionary mapping range names to their values (a list of values for
+        names spanning several areas)
+        
+    Raises:
+        FileNotFoundError: If the Excel file doesn't exist
+        ValueError: If the file is not a valid Excel file
+    """
+    with ProForma(xlsx_path) as proforma:
+        return proforma.prefetch()
+
+
+class ProForma(Mapping):
+    """
+    Read-only handle on a pro-forma workbook that materializes named ranges on demand.
+    
+    Opening only indexes the defined names and the sheet/cell bounds they
+    point at; a range is read from its sheet the first time it is accessed
+    and memoized afterwards. Lookups are case-insensitive, like Excel names.
+    Values have the same shape as in :func:`parse_proforma`.
+    
+    Example:
+        with load_proforma("deal.xlsx") as proforma:
+            price, noi = proforma["PurchasePrice"], proforma["NOI"]
+    """
+    
+    def __init__(self, xlsx_path: str):
+        """
+        Open a workbook and index its defined names.
         
-        return named_ranges
+        Args:
+            xlsx_path: Path to the Excel file
+            
+        Raises:
+            FileNotFoundError: If the Excel file doesn't exist
+            ValueError: If the file is not a valid Excel file
+        """
+        self.path = xlsx_path
+        try:
+            self._workbook = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Excel file not found: {xlsx_path}")
+        except Exception as e:
+            raise ValueError(f"Invalid Excel file: {e}")
         
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Excel file not found: {xlsx_path}")
-    except Exception as e:
-        raise ValueError(f"Invalid Excel file: {e}") 
\ No newline at end of file
+        try:
+            order, constants, by_sheet = _collect_names(self._workbook)
+        except Exception as e:
+            self._workbook.close()
+            raise ValueError(f"Invalid Excel file: {e}")
+        
+        self._values: Dict[str, Any] = dict(constants)
+        # name -> [(sheet, area index, bounds)]
+        self._areas: Dict[str, List[Tuple[str, int, Tuple]]] = {}
+        for sheet, ranges in by_sheet.items():
+            for key, area, bounds in ranges:
+                self._areas.setdefault(key, []).append((sheet, area, bounds))
+        for areas in self._areas.values():
+            areas.sort(key=lambda entry: entry[1])
+        self._names = [key for key in order if key in self._values or key in self._areas]
+        self._lookup = {key.lower(): key for key in self._names}
+        self._closed = False
+    
+    def __enter__(self) -> "ProForma":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release the workbook; already materialized values stay available."""
+        if not self._closed:
+            self._workbook.close()
+            self._closed = True
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        """Worksheet titles in workbook order."""
+        return list(self._workbook.sheetnames)
+    
+    @property
+    def materialized(self) -> List[str]:
+        """Names whose values have been read so far."""
+        return [key for key in self._names if key in self._values]
+    
+    def bounds(self, name: str) -> List[Tuple[str, Tuple]]:
+        """
+        Destination sheet and ``(min_col, min_row, max_col, max_row)`` of a name, without reading it.
+        
+        Args:
+            name: Defined name
+            
+        Returns:
+            List of (sheet, bounds) per area; empty for named constants
+            
+        Raises:
+            KeyError: If the name is not defined
+        """
+        key = self._key(name)
+        return [(sheet, bounds) for sheet, _, bounds in self._areas.get(key, [])]
+    
+    def _key(self, name: str) -> str:
+        key = self._lookup.get(str(name).lower())
+        if key is None:
+            raise KeyError(name)
+        return key
+    
+    def __getitem__(self, name: str) -> Any:
+        key = self._key(name)
+        if key not in self._values:
+            self._materialize([key])
+        return self._values[key]
+    
+    def __contains__(self, name: object) -> bool:
+        return str(name).lower() in self._lookup
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def prefetch(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Materialize several names with one streaming pass per sheet.
+        
+        Args:
+            names: Names to read; all names if omitted
+            
+        Returns:
+            Dictionary mapping each name to its value
+            
+        Raises:
+            KeyError: If a name is not defined
+        """
+        keys = self._names if names is None else [self._key(name) for name in names]
+        self._materialize([key for key in keys if key not in self._values])
+        return {key: self._values[key] for key in keys}
+    
+    def _materialize(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        if self._closed:
+            raise ValueError(f"ProForma is closed: {self.path}")
+        by_sheet: Dict[str, List[Tuple[str, int, Tuple]]] = {}
+        for key in keys:
+            for sheet, area, bounds in self._areas[key]:
+                by_sheet.setdefault(sheet, []).append((key, area, bounds))
+        areas: Dict[Tuple[str, int], Any] = {}
+        try:
+            for sheet, ranges in by_sheet.items():
+                areas.update(_read_sheet_ranges(self._workbook[sheet], ranges))
+        except Exception as e:
+            raise ValueError(f"Invalid Excel file: {e}")
+        for key in keys:
+            parts = [areas[(key, area)] for _, area, _ in self._areas[key]]
+            multi_area = len(parts) > 1 or self._areas[key][0][1] > 0
+            self._values[key] = parts if multi_area else parts[0]
+
+
+def load_proforma(xlsx_path: str) -> ProForma:
+    """
+    Open a pro-forma workbook for on-demand access to its named ranges.
+    
+    Unlike :func:`parse_proforma`, nothing is read until a name is accessed,
+    so opening is cheap and memory follows what is actually used. Close the
+    handle (or use it as a context manager) when done.
+    
+    Args:
+        xlsx_path: Path to the Excel file
+        
+    Returns:
+        ProForma handle
+        
+    Raises:
+        FileNotFoundError: If the Excel file doesn't exist
+        ValueError: If the file is not a valid Excel file
+    """
+    return ProForma(xlsx_path)
@@ -0,0 +1,300 @@
+"""
+Monte Carlo simulation of deal returns over uncertain assumptions.
+
+Each uncertain assumption is a normal distribution around its value, with a
+spread derived from the assumption's ``confidence_level``: the confidence is
+read as the probability that the true value lies within ``band`` (10% by
+default) of the stated value. Draws can be correlated through a correlation
+matrix (applied with its Cholesky factor) and are clipped to each
+assumption's plausible range.
+
+Trials run in fixed-size chunks, each vectorized through the cash-flow engine
+and the batched IRR solver, optionally on a process pool. Every chunk draws
+from its own child of ``SeedSequence(seed)``, so results depend only on the
+seed and chunk size, not on the number of workers. Chunks return fixed-edge
+histograms rather than raw trials, which are folded into running totals as
+they complete; chunks are generated lazily with at most ``2 * max_workers``
+in flight, so memory stays bounded however many trials are requested;
+percentiles are interpolated from the merged
+histogram (accurate to within one bin width).
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .assumptions.models import Assumption
+from .engine import OPTIONAL_ASSUMPTIONS, REQUIRED_ASSUMPTIONS, flatten_assumptions, project_cash_flows
+from .returns import irr
+
+# Plausible range for sampled values of common assumptions
+ASSUMPTION_BOUNDS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "vacancy_rate": (0.0, 1.0),
+    "expense_ratio": (0.0, 1.0),
+    "exit_cap_rate": (0.005, None),
+    "interest_rate": (0.0, None),
+    "loan_to_value": (0.0, 1.0),
+    "management_fee": (0.0, 1.0),
+    "rent_growth_rate": (-0.5, None),
+    "expense_growth_rate": (-0.5, None),
+}
+
+# Histogram edges shared by every chunk so their counts can be summed
+IRR_EDGES = np.linspace(-1.0, 1.0, 801)
+EQUITY_MULTIPLE_EDGES = np.linspace(0.0, 6.0, 1201)
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+class UncertainAssumption(NamedTuple):
+    """A normally distributed assumption, clipped to ``[lower, upper]``."""
+
+    name: str
+    mean: float
+    std: float
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+
+class Distribution(NamedTuple):
+    """Summary of a simulated metric."""
+
+    mean: float
+    std: float
+    percentiles: Dict[int, float]
+    counts: np.ndarray  # per-bin counts, plus underflow/overflow below
+    edges: np.ndarray
+    underflow: int
+    overflow: int
+
+
+class MonteCarloResult(NamedTuple):
+    """Outcome of a simulation."""
+
+    trials: int
+    irr: Distribution  # levered IRR, over trials where an IRR exists
+    equity_multiple: Distribution
+    no_irr: int  # trials whose cash flows have no IRR
+    seed: Optional[int]
+
+
+def uncertain_from_assumption(assumption: Assumption, key: Optional[str] = None,
+                              band: float = 0.1) -> UncertainAssumption:
+    """
+    Derive a distribution from an assumption's value and confidence level.
+
+    ``confidence_level`` is read as the probability that the true value is
+    within ``band`` (relative) of ``value``, giving
+    ``std = band * |value| / z`` with ``z`` the two-sided normal quantile.
+    A missing confidence level means the value is treated as certain.
+
+    Args:
+        assumption: Assumption model
+        key: Engine assumption name (e.g. ``"exit_cap_rate"``); defaults to
+            the assumption name in snake case
+        band: Relative half-width the confidence level refers to
+
+    Returns:
+        UncertainAssumption with bounds from ``ASSUMPTION_BOUNDS``
+    """
+    name = key or assumption.name.strip().lower().replace(" ", "_")
+    confidence = assumption.confidence_level
+    if confidence is None or confidence >= 1.0:
+        std = 0.0
+    else:
+        # Zero confidence would mean infinite spread; cap it at a wide distribution
+        z = NormalDist().inv_cdf((1.0 + max(confidence, 0.01)) / 2.0)
+        std = band * abs(assumption.value) / z
+    lower, upper = ASSUMPTION_BOUNDS.get(name, (None, None))
+    return UncertainAssumption(name, float(assumption.value), std, lower, upper)
+
+
+def _histogram(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Counts per bin with underflow and overflow appended."""
+    counts = np.histogram(values, bins=edges)[0]
+    # np.histogram includes the right edge in the last bin; count anything beyond as overflow
+    return np.concatenate([counts, [np.sum(values < edges[0]), np.sum(values > edges[-1])]])
+
+
+def _simulate_chunk(
+    purchase_price: float,
+    gross_potential_rent: float,
+    base: Dict[str, Any],
+    uncertain: List[UncertainAssumption],
+    cholesky: Optional[np.ndarray],
+    seed_sequence: np.random.SeedSequence,
+    trials: int,
+) -> Dict[str, Any]:
+    """Simulate one chunk of trials and return mergeable summaries."""
+    rng = np.random.default_rng(seed_sequence)
+    draws = rng.standard_normal((trials, len(uncertain)))
+    if cholesky is not None:
+        draws = draws @ cholesky.T
+    assumptions = dict(base)
+    for column, item in enumerate(uncertain):
+        values = item.mean + item.std * draws[:, column]
+        if item.lower is not None or item.upper is not None:
+            values = np.clip(values, item.lower, item.upper)
+        assumptions[item.name] = values
+
+    # One row per trial
+    prices = np.full(trials, purchase_price, dtype=np.float64)
+    levered = project_cash_flows(prices, gross_potential_rent, assumptions).levered
+    rates = irr(levered).rate
+    equity = -levered[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        multiples = np.where(equity > 0, levered[:, 1:].sum(axis=1) / equity, np.nan)
+
+    summary: Dict[str, Any] = {}
+    for metric, values, edges in (("irr", rates, IRR_EDGES), ("equity_multiple", multiples, EQUITY_MULTIPLE_EDGES)):
+        finite = values[np.isfinite(values)]
+        summary[metric] = {
+            "counts": _histogram(finite, edges),
+            "n": finite.size,
+            "sum": float(finite.sum()),
+            "sum_squares": float(np.square(finite).sum()),
+        }
+    summary["no_irr"] = int(np.count_nonzero(~np.isfinite(rates)))
+    return summary
+
+
+def _accumulate(totals: Optional[Dict[str, Any]], part: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold one chunk summary into the running totals."""
+    if totals is None:
+        return part
+    for metric in ("irr", "equity_multiple"):
+        for field in ("counts", "n", "sum", "sum_squares"):
+            totals[metric][field] = totals[metric][field] + part[metric][field]
+    totals["no_irr"] += part["no_irr"]
+    return totals
+
+
+def _distribution(summary: Dict[str, Any], edges: np.ndarray, percentiles: Sequence[int]) -> Distribution:
+    """Distribution from merged chunk summaries of one metric."""
+    counts, n = summary["counts"], summary["n"]
+    total, total_squares = summary["sum"], summary["sum_squares"]
+    mean = total / n if n else float("nan")
+    variance = max(total_squares / n - mean * mean, 0.0) if n else float("nan")
+
+    bins, underflow, overflow = counts[:-2], int(counts[-2]), int(counts[-1])
+    # Cumulative counts at each edge, with out-of-range trials pinned to the outer edges
+    cumulative = np.concatenate([[underflow], underflow + np.cumsum(bins)])
+    values = {}
+    for percentile in percentiles:
+        target = n * percentile / 100.0
+        if n == 0:
+            values[percentile] = float("nan")
+        elif target <= cumulative[0]:
+            values[percentile] = float(edges[0])
+        elif target >= cumulative[-1]:
+            values[percentile] = float(edges[-1])
+        else:
+            values[percentile] = float(np.interp(target, cumulative, edges))
+    return Distribution(mean, variance ** 0.5, values, bins, edges, underflow, overflow)
+
+
+def run_monte_carlo(
+    purchase_price: float,
+    gross_potential_rent: float,
+    assumptions: Mapping[str, Any],
+    uncertain: Sequence[UncertainAssumption],
+    correlation: Optional[Sequence[Sequence[float]]] = None,
+    trials: int = 100_000,
+    seed: Optional[int] = None,
+    chunk_size: int = 20_000,
+    max_workers: Optional[int] = None,
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+) -> MonteCarloResult:
+    """
+    Simulate levered IRR and equity multiple over uncertain assumptions.
+
+    Args:
+        purchase_price: Purchase price of the deal
+        gross_potential_rent: Year-1 annual gross potential rent
+        assumptions: Base assumption set (flat or with nested ``financing``)
+        uncertain: Assumptions to sample; each replaces the base value
+        correlation: Correlation matrix between ``uncertain`` assumptions,
+            in the same order; independent if omitted
+        trials: Number of trials
+        seed: Random seed; the same seed and chunk size reproduce results
+        chunk_size: Trials per vectorized batch (bounds peak memory)
+        max_workers: Worker processes (defaults to the CPU count); ``1``
+            runs serially in the calling process
+        percentiles: Percentiles to report
+
+    Returns:
+        MonteCarloResult
+
+    Raises:
+        ValueError: If arguments are invalid, an uncertain assumption is not
+            an engine input, or the correlation matrix is not a valid
+            (symmetric positive definite) correlation matrix
+    """
+    if trials < 1:
+        raise ValueError("trials must be a positive integer")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    uncertain = list(uncertain)
+    if not uncertain:
+        raise ValueError("At least one uncertain assumption is required")
+    known = set(REQUIRED_ASSUMPTIONS) | set(OPTIONAL_ASSUMPTIONS)
+    for item in uncertain:
+        if item.name not in known:
+            raise ValueError(f"Unknown assumption for simulation: {item.name}")
+        if item.std < 0:
+            raise ValueError(f"Standard deviation must not be negative: {item.name}")
+        if item.name == "holding_period":
+            raise ValueError("holding_period cannot be simulated")
+
+    cholesky = None
+    if correlation is not None:
+        matrix = np.asarray(correlation, dtype=np.float64)
+        if matrix.shape != (len(uncertain), len(uncertain)):
+            raise ValueError(f"correlation must be {len(uncertain)}x{len(uncertain)}")
+        if not np.allclose(matrix, matrix.T) or not np.allclose(np.diag(matrix), 1.0):
+            raise ValueError("correlation must be symmetric with a unit diagonal")
+        try:
+            cholesky = np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            raise ValueError("correlation matrix is not positive definite")
+
+    base = flatten_assumptions(assumptions)
+    root = np.random.SeedSequence(seed)
+    chunks = -(-trials // chunk_size)
+
+    def arguments() -> Iterator[Tuple[Any, ...]]:
+        # Children are spawned one at a time; spawn(1) repeatedly yields the same seeds as spawn(chunks)
+        for index in range(chunks):
+            size = min(chunk_size, trials - index * chunk_size)
+            yield purchase_price, gross_potential_rent, base, uncertain, cholesky, root.spawn(1)[0], size
+
+    totals: Optional[Dict[str, Any]] = None
+    workers = min(max_workers or os.cpu_count() or 1, chunks)
+    if workers == 1:
+        for args in arguments():
+            totals = _accumulate(totals, _simulate_chunk(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            remaining = arguments()
+            pending = deque(executor.submit(_simulate_chunk, *args)
+                            for args in itertools.islice(remaining, 2 * workers))
+            while pending:
+                totals = _accumulate(totals, pending.popleft().result())
+                args = next(remaining, None)
+                if args is not None:
+                    pending.append(executor.submit(_simulate_chunk, *args))
+
+    return MonteCarloResult(
+        trials=trials,
+        irr=_distribution(totals["irr"], IRR_EDGES, percentiles),
+        equity_multiple=_distribution(totals["equity_multiple"], EQUITY_MULTIPLE_EDGES, percentiles),
+        no_irr=totals["no_irr"],
+        seed=seed,
+    )
@@ -0,0 +1,236 @@
+"""
+Batched return metrics (NPV and IRR) over many cash-flow vectors at once.
+
+Cash flows are 2D arrays with one row per scenario and one column per
+period, column 0 being time zero (undiscounted). Rows may be zero-padded
+past their last period, as produced by :mod:`backend.underwriting.engine`.
+"""
+
+from typing import Any, Dict, NamedTuple, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+# Deal metrics available from :func:`deal_metrics`
+METRICS = ("irr", "unlevered_irr", "noi", "dscr", "equity_multiple")
+
+# Rates scanned to bracket roots: dense near typical returns, sparse far out
+_SCAN_RATES = np.unique(np.concatenate([
+    np.linspace(-0.95, 0.0, 20),
+    np.linspace(0.0, 1.0, 41),
+    np.geomspace(1.0, 100.0, 11),
+]))
+
+
+class IRRResult(NamedTuple):
+    """Per-row IRR solutions."""
+
+    rate: np.ndarray  # NaN where no root was found
+    converged: np.ndarray  # bool
+    multiple_roots: np.ndarray  # bool: more than one rate zeroes the NPV
+
+
+def _as_rows(cash_flows: np.ndarray) -> np.ndarray:
+    flows = np.asarray(cash_flows, dtype=np.float64)
+    if flows.ndim == 1:
+        flows = flows[None, :]
+    if flows.ndim != 2:
+        raise ValueError("cash_flows must be a 1D or 2D array")
+    return flows
+
+
+def discount_factors(rates: ArrayLike, periods: int) -> np.ndarray:
+    """
+    Discount factors ``(1 + rate) ** -t`` for ``t = 0 .. periods - 1``.
+
+    Args:
+        rates: Discount rates, shape ``(k,)``
+        periods: Number of periods
+
+    Returns:
+        Array of shape ``(k, periods)``
+    """
+    rates = np.atleast_1d(np.asarray(rates, dtype=np.float64))
+    with np.errstate(over="ignore", divide="ignore"):
+        return (1.0 + rates)[:, None] ** -np.arange(periods, dtype=np.float64)[None, :]
+
+
+def npv_matrix(cash_flows: np.ndarray, rates: ArrayLike) -> np.ndarray:
+    """
+    NPV of every row at every rate in one matrix product.
+
+    Args:
+        cash_flows: Array of shape ``(n, periods)`` (or ``(periods,)``)
+        rates: Discount rates, shape ``(k,)``
+
+    Returns:
+        Array of shape ``(n, k)``
+    """
+    flows = _as_rows(cash_flows)
+    factors = discount_factors(rates, flows.shape[1])
+    with np.errstate(over="ignore", invalid="ignore"):
+        return flows @ factors.T
+
+
+def npv(cash_flows: np.ndarray, rate: ArrayLike) -> np.ndarray:
+    """
+    NPV of each row at its own rate.
+
+    Args:
+        cash_flows: Array of shape ``(n, periods)`` (or ``(periods,)``)
+        rate: Scalar rate, or one rate per row
+
+    Returns:
+        Array of shape ``(n,)``
+    """
+    flows = _as_rows(cash_flows)
+    rates = np.broadcast_to(np.asarray(rate, dtype=np.float64), (flows.shape[0],))
+    periods = np.arange(flows.shape[1], dtype=np.float64)
+    return np.sum(flows * (1.0 + rates)[:, None] ** -periods[None, :], axis=1)
+
+
+def _npv_and_slope(flows: np.ndarray, rates: np.ndarray):
+    periods = np.arange(flows.shape[1], dtype=np.float64)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        discounted = flows * (1.0 + rates)[:, None] ** -periods[None, :]
+        value = discounted.sum(axis=1)
+        slope = -(discounted * periods[None, :]).sum(axis=1) / (1.0 + rates)
+    return value, slope
+
+
+def irr(cash_flows: np.ndarray, guess: ArrayLike = 0.1, tolerance: float = 1e-10,
+        max_iterations: int = 100) -> IRRResult:
+    """
+    IRR of every row, solved together.
+
+    NPV is first evaluated for all rows on a fixed grid of rates in one
+    matrix product; sign changes bracket the roots, and the bracket nearest
+    ``guess`` is refined with a safeguarded Newton iteration that falls back
+    to bisection whenever a Newton step would leave the bracket. Rows with
+    more than one bracketed root are flagged in ``multiple_roots``. Rows with
+    no bracket (e.g. a root beyond the grid or a tangent root) get plain
+    Newton from ``guess`` and are flagged as not converged if that fails.
+
+    Args:
+        cash_flows: Array of shape ``(n, periods)`` (or ``(periods,)``)
+        guess: Starting rate, scalar or one per row
+        tolerance: Convergence tolerance on the rate, and on NPV relative to
+            the largest cash flow in the row
+        max_iterations: Iteration limit
+
+    Returns:
+        IRRResult with arrays of shape ``(n,)``
+    """
+    flows = _as_rows(cash_flows)
+    rows = flows.shape[0]
+    guess = np.broadcast_to(np.asarray(guess, dtype=np.float64), (rows,)).copy()
+    scale = np.maximum(np.abs(flows).max(axis=1, initial=0.0), np.finfo(np.float64).tiny)
+    npv_tolerance = tolerance * scale
+
+    grid = npv_matrix(flows, _SCAN_RATES)
+    positive, negative = grid > 0, grid < 0
+    crossings = (positive[:, :-1] & negative[:, 1:]) | (negative[:, :-1] & positive[:, 1:])
+    exact = grid == 0
+    # Candidate roots: bracketing intervals, then grid rates where NPV is exactly zero
+    candidates = np.concatenate([crossings, exact], axis=1)
+    # An IRR needs both an outflow and an inflow
+    has_root = (flows > 0).any(axis=1) & (flows < 0).any(axis=1)
+    root_count = np.where(has_root, candidates.sum(axis=1), 0)
+    bracketed = root_count > 0
+    starts = np.concatenate([_SCAN_RATES[:-1], _SCAN_RATES])
+    ends = np.concatenate([_SCAN_RATES[1:], _SCAN_RATES])
+    centers = (starts + ends) / 2
+
+    # Pick the candidate closest to the guess
+    if np.all(guess == guess[0]):
+        order = np.argsort(np.abs(centers - guess[0]), kind="stable")
+        best = order[candidates[:, order].argmax(axis=1)]
+    else:
+        best = np.where(candidates, np.abs(centers[None, :] - guess[:, None]), np.inf).argmin(axis=1)
+    index = np.arange(rows)
+    low, high = starts[best], ends[best]
+    low_value = np.where(best < crossings.shape[1], grid[index, np.minimum(best, grid.shape[1] - 1)], 0.0)
+    rate = np.where(bracketed, np.clip(guess, low, high), guess)
+    converged = np.zeros(rows, dtype=bool)
+    active = has_root.copy()
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        ids = np.flatnonzero(active)
+        r = rate[ids]
+        value, slope = _npv_and_slope(flows[ids], r)
+        done = np.isfinite(value) & (np.abs(value) <= npv_tolerance[ids])
+        converged[ids[done]] = True
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - value / slope
+        inside = bracketed[ids]
+        # Shrink brackets around the root
+        same_side = np.sign(value) == np.sign(low_value[ids])
+        lo, hi = low[ids], high[ids]
+        lo = np.where(inside & same_side, r, lo)
+        hi = np.where(inside & ~same_side, r, hi)
+        low_value[ids] = np.where(inside & same_side, value, low_value[ids])
+        low[ids], high[ids] = lo, hi
+
+        safe = np.isfinite(newton) & (newton > -1.0)
+        safe &= ~inside | ((newton > lo) & (newton < hi))
+        step = np.where(safe, newton, np.where(inside, (lo + hi) / 2, np.nan))
+        step_tolerance = tolerance * np.maximum(1.0, np.abs(r))
+        # A collapsed bracket pins the root; unbracketed rows need a tiny step and small NPV
+        pinned = inside & (hi - lo <= step_tolerance)
+        settled = ~inside & (np.abs(step - r) <= step_tolerance) & (np.abs(value) <= 1e-6 * scale[ids])
+        converged[ids[pinned | settled]] = True
+        finished = done | pinned | settled
+        rate[ids[~finished]] = step[~finished]
+        failed = ~np.isfinite(step) & ~finished
+        active[ids[finished | failed]] = False
+
+    rate = np.where(converged, rate, np.nan)
+    return IRRResult(rate=rate, converged=converged, multiple_roots=root_count > 1)
+
+
+def deal_metrics(flows: Any, metrics: Sequence[str] = METRICS) -> Dict[str, np.ndarray]:
+    """
+    Headline metrics of projected deals, one value per row.
+
+    * ``irr`` / ``unlevered_irr``: IRR of levered / unlevered flows (NaN
+      where none exists)
+    * ``noi``: year-1 NOI
+    * ``dscr``: year-1 NOI / year-1 debt service (NaN without debt)
+    * ``equity_multiple``: levered distributions / equity invested
+
+    Args:
+        flows: ``CashFlows`` from :func:`backend.underwriting.engine.project_cash_flows`
+        metrics: Metrics to compute (IRRs are only solved when requested)
+
+    Returns:
+        Dictionary of ``(deals,)`` arrays keyed by metric name
+
+    Raises:
+        ValueError: If a metric is unknown
+    """
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric: {', '.join(unknown)}")
+    levered = flows.levered
+    noi = flows.net_operating_income[:, 1]
+    results: Dict[str, np.ndarray] = {}
+    for metric in metrics:
+        if metric == "irr":
+            results[metric] = irr(levered).rate
+        elif metric == "unlevered_irr":
+            results[metric] = irr(flows.unlevered).rate
+        elif metric == "noi":
+            results[metric] = noi
+        elif metric == "dscr":
+            debt_service = flows.debt_service[:, 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results[metric] = np.where(debt_service > 0, noi / debt_service, np.nan)
+        else:
+            equity = -levered[:, 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results[metric] = np.where(equity > 0, levered[:, 1:].sum(axis=1) / equity, np.nan)
+    return results
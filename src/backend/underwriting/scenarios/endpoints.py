@@ -2,12 +2,18 @@
 FastAPI endpoints for scenario management.
 """
 
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from ..assumptions.service import load_assumptions
 from .logic import clone_scenario, compare_scenarios
+from .sensitivity import METRICS, sensitivity_grid, tornado
 
 router = APIRouter(prefix="/scenarios", tags=["scenarios"])
 
+# Largest axis accepted by the sensitivity endpoint (a 200 x 200 grid)
+MAX_AXIS_STEPS = 200
+
 
 @router.post("/")
 async def create_scenario(scenario_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -96,4 +102,122 @@ async def compare_scenario(scenario_id: str) -> Dict[str, Any]:
             "cash_flow_impact": 0.0
         },
         "message": "Scenario comparison endpoint stub"
-    } 
\ No newline at end of file
+    } 
+
+def _deal_inputs(request: Dict[str, Any]) -> Tuple[float, float, Dict[str, Any]]:
+    """Read the deal and its assumptions (inline or a named set) from a request body."""
+    try:
+        purchase_price = float(request["purchase_price"])
+        gross_potential_rent = float(request["gross_potential_rent"])
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Missing field: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="purchase_price and gross_potential_rent must be numbers")
+    if "assumptions" in request:
+        return purchase_price, gross_potential_rent, request["assumptions"]
+    try:
+        return purchase_price, gross_potential_rent, load_assumptions(
+            request.get("assumption_set", "moderate"), version=request.get("assumption_version"))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _axis(spec: Dict[str, Any]) -> Tuple[str, List[float]]:
+    """Parse ``{"name", "values"}`` or ``{"name", "start", "stop", "steps"}``."""
+    if "values" in spec:
+        values = [float(value) for value in spec["values"]]
+    else:
+        steps = int(spec.get("steps", 11))
+        if not 1 <= steps <= MAX_AXIS_STEPS:
+            raise ValueError(f"steps must be between 1 and {MAX_AXIS_STEPS}")
+        values = np.linspace(float(spec["start"]), float(spec["stop"]), steps).tolist()
+    if len(values) > MAX_AXIS_STEPS:
+        raise ValueError(f"An axis can have at most {MAX_AXIS_STEPS} values")
+    return spec["name"], values
+
+
+def _to_json(values: np.ndarray) -> List[Any]:
+    """Nested lists with NaN/inf as None (JSON has no NaN)."""
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+@router.post("/sensitivity/")
+async def sensitivity_grid_endpoint(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Two-way sensitivity table computed in one vectorized pass.
+    
+    Body: ``purchase_price``, ``gross_potential_rent``, either
+    ``assumptions`` (inline set) or ``assumption_set`` (name, default
+    ``moderate``, optionally pinned to a recorded ``assumption_version``),
+    and axes ``x`` and ``y`` given as ``{"name", "values"}``
+    or ``{"name", "start", "stop", "steps"}``.
+    
+    Args:
+        request: Sensitivity request
+        
+    Returns:
+        Axis values and IRR, NOI, DSCR and equity multiple matrices (rows
+        follow ``x``, columns follow ``y``)
+        
+    Raises:
+        HTTPException: If the request is invalid or the assumption set is not found
+    """
+    purchase_price, gross_potential_rent, assumptions = _deal_inputs(request)
+    try:
+        x_name, x_values = _axis(request["x"])
+        y_name, y_values = _axis(request["y"])
+        grid = sensitivity_grid(purchase_price, gross_potential_rent, assumptions,
+                                x_name, x_values, y_name, y_values)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sensitivity request: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing sensitivity: {e}")
+    return {
+        "x": {"name": grid.x_name, "values": grid.x_values.tolist()},
+        "y": {"name": grid.y_name, "values": grid.y_values.tolist()},
+        **{metric: _to_json(getattr(grid, metric)) for metric in METRICS},
+    }
+
+
+@router.post("/tornado/")
+async def tornado_endpoint(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One-at-a-time (tornado) sensitivity of a metric to each assumption.
+    
+    Body: the deal and assumptions as for the sensitivity grid, plus
+    optional ``deltas`` (name -> absolute delta), ``relative`` (default
+    0.1, used when ``deltas`` is omitted) and ``metric`` (default ``irr``).
+    
+    Args:
+        request: Tornado request
+        
+    Returns:
+        Base metric value and bars sorted by decreasing swing
+        
+    Raises:
+        HTTPException: If the request is invalid or the assumption set is not found
+    """
+    purchase_price, gross_potential_rent, assumptions = _deal_inputs(request)
+    try:
+        chart = tornado(purchase_price, gross_potential_rent, assumptions,
+                        deltas=request.get("deltas"), relative=float(request.get("relative", 0.1)),
+                        metric=request.get("metric", "irr"))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid tornado request: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing tornado: {e}")
+    return {
+        "metric": chart.metric,
+        "base": _to_json(np.asarray(chart.base)),
+        "bars": [
+            {
+                "name": bar.name,
+                "low_input": bar.low_input,
+                "high_input": bar.high_input,
+                "low": _to_json(np.asarray(bar.low)),
+                "high": _to_json(np.asarray(bar.high)),
+                "swing": _to_json(np.asarray(bar.swing)),
+            }
+            for bar in chart.bars
+        ],
+    }
@@ -0,0 +1,220 @@
+"""
+Sensitivity analysis: two-way grids and one-at-a-time tornado charts.
+
+Every cell of a grid (and both ends of every tornado bar) becomes one row of
+a single vectorized cash-flow projection, so a whole table costs one engine
+call and one batched IRR solve instead of one model run per cell.
+
+Axes can be any engine assumption (``exit_cap_rate``, ``interest_rate``,
+...) or a deal input (``purchase_price``, ``gross_potential_rent``).
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ..engine import OPTIONAL_ASSUMPTIONS, REQUIRED_ASSUMPTIONS, flatten_assumptions, project_cash_flows
+from ..returns import METRICS, deal_metrics
+
+# Deal inputs that can be varied alongside assumptions
+DEAL_INPUTS = ("purchase_price", "gross_potential_rent")
+
+# Assumptions left out of default tornado charts (whole-number periods)
+_TORNADO_EXCLUDED = ("holding_period", "amortization_period")
+
+
+class SensitivityGrid(NamedTuple):
+    """Metrics over a two-way grid; matrices have shape ``(len(x_values), len(y_values))``."""
+
+    x_name: str
+    x_values: np.ndarray
+    y_name: str
+    y_values: np.ndarray
+    irr: np.ndarray  # levered IRR, NaN where none exists
+    unlevered_irr: np.ndarray
+    noi: np.ndarray  # year-1 NOI
+    dscr: np.ndarray  # year-1 NOI / year-1 debt service, NaN without debt
+    equity_multiple: np.ndarray
+
+
+class TornadoBar(NamedTuple):
+    """One assumption moved down and up while everything else is held."""
+
+    name: str
+    low_input: float
+    high_input: float
+    low: float  # metric at ``low_input``
+    high: float  # metric at ``high_input``
+
+    @property
+    def swing(self) -> float:
+        """Absolute change in the metric between the two ends."""
+        return abs(self.high - self.low)
+
+
+class Tornado(NamedTuple):
+    """Tornado chart data, bars sorted by decreasing swing."""
+
+    metric: str
+    base: float
+    bars: List[TornadoBar]
+
+
+def _check_variable(name: str) -> None:
+    if name not in DEAL_INPUTS and name not in REQUIRED_ASSUMPTIONS and name not in OPTIONAL_ASSUMPTIONS:
+        raise ValueError(f"Unknown sensitivity variable: {name}")
+
+
+def evaluate_metrics(
+    purchase_price: float,
+    gross_potential_rent: float,
+    assumptions: Mapping[str, Any],
+    overrides: Mapping[str, np.ndarray],
+    metrics: Sequence[str] = METRICS,
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate deal metrics for many variations of one deal in a single pass.
+
+    Args:
+        purchase_price: Base purchase price
+        gross_potential_rent: Base year-1 annual gross potential rent
+        assumptions: Base assumption set (flat or with nested ``financing``)
+        overrides: Variable name -> ``(rows,)`` array of values replacing
+            the base value; all arrays must have the same length
+        metrics: Metrics to compute
+
+    Returns:
+        Dictionary of ``(rows,)`` arrays keyed by metric name
+
+    Raises:
+        ValueError: If a variable is unknown or lengths differ
+    """
+    if not overrides:
+        raise ValueError("At least one override is required")
+    columns = {}
+    for name, values in overrides.items():
+        _check_variable(name)
+        columns[name] = np.asarray(values, dtype=np.float64).ravel()
+    rows = {values.size for values in columns.values()}
+    if len(rows) != 1:
+        raise ValueError("Override arrays must have the same length")
+    size = rows.pop()
+
+    flat = flatten_assumptions(assumptions)
+    flat.update((name, values) for name, values in columns.items() if name not in DEAL_INPUTS)
+    price = columns.get("purchase_price", np.full(size, float(purchase_price)))
+    gpr = columns.get("gross_potential_rent", np.full(size, float(gross_potential_rent)))
+
+    return deal_metrics(project_cash_flows(price, gpr, flat), metrics)
+
+
+def sensitivity_grid(
+    purchase_price: float,
+    gross_potential_rent: float,
+    assumptions: Mapping[str, Any],
+    x_name: str,
+    x_values: Sequence[float],
+    y_name: str,
+    y_values: Sequence[float],
+) -> SensitivityGrid:
+    """
+    Two-way sensitivity table, e.g. exit cap rate x rent growth.
+
+    The two axes are broadcast against each other and the whole grid is
+    projected as one batch.
+
+    Args:
+        purchase_price: Base purchase price
+        gross_potential_rent: Base year-1 annual gross potential rent
+        assumptions: Base assumption set
+        x_name: Variable along the rows
+        x_values: Row values
+        y_name: Variable along the columns
+        y_values: Column values
+
+    Returns:
+        SensitivityGrid
+
+    Raises:
+        ValueError: If a variable is unknown, repeated, or has no values
+    """
+    if x_name == y_name:
+        raise ValueError("Sensitivity axes must be different variables")
+    xs = np.asarray(x_values, dtype=np.float64).ravel()
+    ys = np.asarray(y_values, dtype=np.float64).ravel()
+    if not xs.size or not ys.size:
+        raise ValueError("Sensitivity axes must have at least one value")
+    x_grid, y_grid = np.meshgrid(xs, ys, indexing="ij")
+    metrics = evaluate_metrics(purchase_price, gross_potential_rent, assumptions,
+                               {x_name: x_grid.ravel(), y_name: y_grid.ravel()})
+    shape = (xs.size, ys.size)
+    return SensitivityGrid(x_name, xs, y_name, ys,
+                           **{metric: values.reshape(shape) for metric, values in metrics.items()})
+
+
+def tornado(
+    purchase_price: float,
+    gross_potential_rent: float,
+    assumptions: Mapping[str, Any],
+    deltas: Optional[Mapping[str, float]] = None,
+    relative: float = 0.1,
+    metric: str = "irr",
+) -> Tornado:
+    """
+    One-at-a-time sensitivity of a metric to each assumption.
+
+    Each variable is moved to ``value - delta`` and ``value + delta`` with
+    all others at their base values; the base case and every bar end are
+    evaluated in one batch.
+
+    Args:
+        purchase_price: Base purchase price
+        gross_potential_rent: Base year-1 annual gross potential rent
+        assumptions: Base assumption set
+        deltas: Variable name -> absolute delta. Defaults to every numeric
+            assumption in the set (except whole-number periods) and the
+            purchase price, each moved by ``relative`` of its base value
+        relative: Relative delta used when ``deltas`` is omitted
+        metric: Metric to chart, one of :data:`METRICS`
+
+    Returns:
+        Tornado with bars sorted by decreasing swing
+
+    Raises:
+        ValueError: If the metric or a variable is unknown
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    flat = flatten_assumptions(assumptions)
+    base_values = {key: value for key, value in flat.items()
+                   if isinstance(value, (int, float)) and not isinstance(value, bool)}
+    base_values.update(purchase_price=float(purchase_price), gross_potential_rent=float(gross_potential_rent))
+    if deltas is None:
+        names = [key for key in base_values
+                 if key != "gross_potential_rent" and key not in _TORNADO_EXCLUDED
+                 and (key in DEAL_INPUTS or key in REQUIRED_ASSUMPTIONS or key in OPTIONAL_ASSUMPTIONS)]
+        deltas = {name: abs(base_values[name]) * relative for name in names}
+    for name in deltas:
+        _check_variable(name)
+        if name not in base_values:
+            raise ValueError(f"No base value for sensitivity variable: {name}")
+
+    # Row 0 is the base case; each variable then adds a low row and a high row
+    names = list(deltas)
+    rows = 1 + 2 * len(names)
+    overrides = {name: np.full(rows, float(base_values[name])) for name in names}
+    for index, name in enumerate(names):
+        overrides[name][1 + 2 * index] -= deltas[name]
+        overrides[name][2 + 2 * index] += deltas[name]
+    if not overrides:
+        overrides = {"purchase_price": np.full(1, float(purchase_price))}
+    values = evaluate_metrics(purchase_price, gross_potential_rent, assumptions, overrides, [metric])[metric]
+
+    bars = [
+        TornadoBar(name, float(overrides[name][1 + 2 * index]), float(overrides[name][2 + 2 * index]),
+                   float(values[1 + 2 * index]), float(values[2 + 2 * index]))
+        for index, name in enumerate(names)
+    ]
+    # Bars whose metric is undefined at either end go last
+    bars.sort(key=lambda bar: (not np.isfinite(bar.swing), -bar.swing if np.isfinite(bar.swing) else 0.0))
+    return Tornado(metric, float(values[0]), bars)
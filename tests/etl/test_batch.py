@@ -0,0 +1,89 @@
+"""
+Tests for ETL batch ingestion module.
+"""
+
+import pytest
+import csv
+import openpyxl
+from unittest.mock import patch
+from backend.etl.batch import _parse_chunk, parse_many, parse_file
+
+
+@pytest.fixture
+def rent_roll_files(tmp_path):
+    """Create a mix of CSV, XLSX and invalid files."""
+    paths = []
+    for index in range(3):
+        csv_path = tmp_path / f"rent_roll_{index}.csv"
+        with open(csv_path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['Unit', 'Market Rent'])
+            writer.writerow([f"{index}01", '1250'])
+        paths.append(str(csv_path))
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(['Account', 'Amount'])
+    worksheet.append(['Taxes', 42000])
+    xlsx_path = tmp_path / "t12.xlsx"
+    workbook.save(xlsx_path)
+    paths.append(str(xlsx_path))
+
+    broken_path = tmp_path / "broken.xlsx"
+    broken_path.write_bytes(b"not an excel file")
+    paths.append(str(broken_path))
+
+    unsupported_path = tmp_path / "notes.txt"
+    unsupported_path.write_text("hello")
+    paths.append(str(unsupported_path))
+    return paths
+
+
+class TestParseMany:
+    """Test cases for parse_many function."""
+
+    def test_parse_file_dispatches_by_extension(self, rent_roll_files):
+        """Test that parse_file picks the parser from the extension."""
+        result = parse_file(rent_roll_files[3])
+        assert result.ok
+        assert result.rows == [{'account': 'Taxes', 'amount': '42000'}]
+
+    def test_parse_file_unsupported(self, rent_roll_files):
+        """Test that unsupported extensions are reported as errors."""
+        result = parse_file(rent_roll_files[5])
+        assert not result.ok
+        assert "Unsupported file type" in result.error
+
+    def test_batch_workers_extract_pdfs_serially(self, tmp_path):
+        """Test that PDFs parsed inside batch workers do not start their own page pool."""
+        pdf_path = str(tmp_path / "rent_roll.pdf")
+        with patch("backend.etl.parsers.iter_pdf", return_value=iter([{"unit": "101"}])) as iter_pdf:
+            assert _parse_chunk([pdf_path])[0].rows == [{"unit": "101"}]
+        iter_pdf.assert_called_once_with(pdf_path, max_workers=1)
+        with patch("backend.etl.parsers.iter_pdf", return_value=iter([])) as iter_pdf:
+            parse_file(pdf_path)
+        iter_pdf.assert_called_once_with(pdf_path, max_workers=None)
+
+    @pytest.mark.parametrize("max_workers,chunksize", [(1, 1), (2, 1), (2, 2)])
+    def test_parse_many_collects_all_results(self, rent_roll_files, max_workers, chunksize):
+        """Test that every file yields a result and errors don't abort the batch."""
+        results = {result.path: result
+                   for result in parse_many(rent_roll_files, max_workers=max_workers, chunksize=chunksize)}
+
+        assert set(results) == set(rent_roll_files)
+        assert results[rent_roll_files[0]].rows == [{'unit': '001', 'market_rent': '1250'}]
+        assert results[rent_roll_files[3]].ok
+        assert not results[rent_roll_files[4]].ok
+        assert "ValueError" in results[rent_roll_files[4]].error
+        assert not results[rent_roll_files[5]].ok
+
+    def test_parse_many_empty(self):
+        """Test that an empty batch yields nothing."""
+        assert list(parse_many([])) == []
+
+    def test_parse_many_invalid_arguments(self):
+        """Test that invalid worker and chunk settings are rejected."""
+        with pytest.raises(ValueError):
+            list(parse_many(["a.csv"], max_workers=0))
+        with pytest.raises(ValueError):
+            list(parse_many(["a.csv"], chunksize=0))
@@ -0,0 +1,157 @@
+"""
+Tests for ETL parse cache module.
+"""
+
+import pytest
+import csv
+import os
+import shutil
+from unittest.mock import patch
+from datetime import datetime
+import numpy as np
+from backend.etl.cache import ParseCache, encode, decode, CacheEncodingError
+from backend.etl.parsers import parse_csv
+from backend.monitoring.metrics import PARSE_CACHE_HITS, PARSE_CACHE_MISSES
+
+
+def _write_rent_roll(path, rows=3):
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['Unit', 'Market Rent', 'Notes'])
+        for unit in range(rows):
+            writer.writerow([f"{unit}01", '1250', ''])
+
+
+class TestEncoding:
+    """Test cases for the binary cache format."""
+
+    def test_table_round_trip(self):
+        """Test that row tables with None and missing keys round-trip."""
+        rows = [
+            {'unit': '101', 'notes': None},
+            {'unit': 'Café 102'},
+            {'unit': '', 'notes': 'x'},
+        ]
+        assert decode(encode(rows)) == rows
+
+    def test_empty_table_round_trip(self):
+        """Test that an empty table round-trips."""
+        assert decode(encode([])) == []
+
+    def test_mapping_round_trip(self):
+        """Test that scalars and arrays round-trip, arrays as read-only views."""
+        mapping = {
+            'purchase_price': 15000000.0,
+            'units': 150,
+            'name': 'Sunset',
+            'missing': None,
+            'closing': datetime(2024, 1, 15),
+            'rent_roll': np.arange(6, dtype=np.float64).reshape(2, 3),
+            'labels': np.array([['a', None]], dtype=object),
+        }
+        result = decode(encode(mapping))
+        assert result['purchase_price'] == 15000000.0
+        assert result['units'] == 150
+        assert result['name'] == 'Sunset'
+        assert result['missing'] is None
+        assert result['closing'] == datetime(2024, 1, 15)
+        np.testing.assert_array_equal(result['rent_roll'], mapping['rent_roll'])
+        assert not result['rent_roll'].flags.writeable
+        assert result['labels'].tolist() == [['a', None]]
+
+    def test_unsupported_value(self):
+        """Test that unsupported values raise CacheEncodingError."""
+        with pytest.raises(CacheEncodingError):
+            encode({'range': object()})
+
+
+class TestParseCache:
+    """Test cases for ParseCache."""
+
+    def test_hit_on_identical_content(self, tmp_path):
+        """Test that a copy of a parsed file is served from the cache."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        original = tmp_path / "rent_roll.csv"
+        _write_rent_roll(original)
+        copy = tmp_path / "rent_roll_copy.csv"
+        shutil.copy(original, copy)
+
+        hits = PARSE_CACHE_HITS.labels(parser='csv')._value.get()
+        misses = PARSE_CACHE_MISSES.labels(parser='csv')._value.get()
+
+        first = parse_csv(str(original), cache=cache)
+        second = parse_csv(str(copy), cache=cache)
+
+        assert first == second == parse_csv(str(original))
+        assert len(cache) == 1
+        assert PARSE_CACHE_MISSES.labels(parser='csv')._value.get() == misses + 1
+        assert PARSE_CACHE_HITS.labels(parser='csv')._value.get() == hits + 1
+
+    def test_changed_content_misses(self, tmp_path):
+        """Test that editing a file produces a new cache entry."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        path = tmp_path / "rent_roll.csv"
+        _write_rent_roll(path, rows=2)
+        assert len(parse_csv(str(path), cache=cache)) == 2
+        _write_rent_roll(path, rows=4)
+        os.utime(path, ns=(0, 10**18))
+        assert len(parse_csv(str(path), cache=cache)) == 4
+        assert len(cache) == 2
+
+    def test_key_includes_version_and_options(self, tmp_path):
+        """Test that parser version and options are part of the key."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        path = tmp_path / "rent_roll.csv"
+        _write_rent_roll(path)
+        base = cache.key_for(str(path), 'csv', '1')
+        assert cache.key_for(str(path), 'csv', '2') != base
+        assert cache.key_for(str(path), 'csv', '1', {'sheet': 'A'}) != base
+        assert cache.key_for(str(path), 'xlsx', '1') != base
+
+    def test_digest_memo_is_bounded(self, tmp_path):
+        """Test that memoized file digests are evicted least recently used first."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        paths = []
+        for name in ('a', 'b', 'c'):
+            paths.append(tmp_path / f"{name}.csv")
+            _write_rent_roll(paths[-1])
+        with patch('backend.etl.cache._DIGEST_MEMO_SIZE', 2):
+            for path in (paths[0], paths[1], paths[0], paths[2]):
+                cache.key_for(str(path), 'csv', '1')
+        assert [stamp[0] for stamp in cache._digests] == [str(paths[0]), str(paths[2])]
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted first."""
+        payload = [{'unit': 'x' * 1000}]
+        entry_size = len(encode(payload))
+        cache = ParseCache(str(tmp_path / "cache"), max_bytes=entry_size * 2)
+
+        cache.put('a', payload)
+        cache.put('b', payload)
+        assert cache.get('a') == payload  # 'a' becomes most recently used
+        cache.put('c', payload)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == payload
+        assert cache.get('c') == payload
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_recency_survives_reopen(self, tmp_path):
+        """Test that entries persist across cache instances."""
+        directory = str(tmp_path / "cache")
+        ParseCache(directory).put('a', [{'unit': '101'}])
+        reopened = ParseCache(directory)
+        assert len(reopened) == 1
+        assert reopened.get('a') == [{'unit': '101'}]
+
+    def test_unencodable_result_not_stored(self, tmp_path):
+        """Test that results without a binary form are parsed but not cached."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        assert cache.put('a', {'range': object()}) is False
+        assert len(cache) == 0
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that a missing file still raises FileNotFoundError."""
+        cache = ParseCache(str(tmp_path / "cache"))
+        with pytest.raises(FileNotFoundError):
+            parse_csv(str(tmp_path / "missing.csv"), cache=cache)
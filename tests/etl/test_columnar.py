@@ -0,0 +1,136 @@
+"""
+Tests for ETL columnar output module.
+"""
+
+import pytest
+import tempfile
+import os
+import csv
+import numpy as np
+import pandas as pd
+import openpyxl
+from backend.etl.columnar import infer_column, rows_to_columns, read_columns
+
+
+class TestInferColumn:
+    """Test cases for column type inference."""
+    
+    def test_integers(self):
+        """Test that integer strings become int64."""
+        result = infer_column(['150', '1,200', '-3'])
+        assert result.dtype == np.int64
+        assert result.tolist() == [150, 1200, -3]
+    
+    def test_integers_with_blanks(self):
+        """Test that integer columns with blanks become float64 with NaN."""
+        result = infer_column(['150', None, ''])
+        assert result.dtype == np.float64
+        assert result[0] == 150.0
+        assert np.isnan(result[1]) and np.isnan(result[2])
+    
+    def test_currency(self):
+        """Test that currency strings become float64."""
+        result = infer_column(['$1,250.00', '$975.50', '(300.00)', None])
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result[:3], [1250.0, 975.5, -300.0])
+        assert np.isnan(result[3])
+    
+    def test_percentages(self):
+        """Test that percentages become fractions."""
+        result = infer_column(['5.5%', '3%', None])
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result[:2], [0.055, 0.03])
+    
+    def test_dates(self):
+        """Test that date strings become datetime64."""
+        result = infer_column(['2024-01-15', '2024-02-01 00:00:00', None])
+        assert result.dtype == np.dtype('datetime64[ns]')
+        assert result[0] == np.datetime64('2024-01-15')
+        assert result[1] == np.datetime64('2024-02-01')
+        assert np.isnat(result[2])
+    
+    def test_text(self):
+        """Test that non-numeric, non-date columns stay as strings."""
+        result = infer_column(['Occupied', '101', None])
+        assert result.dtype == object
+        assert result.tolist() == ['Occupied', '101', None]
+    
+    def test_zero_padded_codes_stay_text(self):
+        """Test that zero-padded codes keep their leading zeros."""
+        result = infer_column(['02134', '10001', None])
+        assert result.dtype == object
+        assert result.tolist() == ['02134', '10001', None]
+        assert infer_column(['0101', '1.5']).tolist() == ['0101', '1.5']
+        assert infer_column(['0', '10']).dtype == np.int64
+    
+    def test_oversized_integers_stay_text(self):
+        """Test that integers beyond int64 stay text instead of overflowing."""
+        result = infer_column(['12345678901234567890123', '1'])
+        assert result.dtype == object
+        assert result.tolist() == ['12345678901234567890123', '1']
+        assert infer_column(['9223372036854775808']).dtype == object
+        assert infer_column(['9223372036854775807', '-1']).dtype == np.int64
+    
+    def test_all_blank(self):
+        """Test that an all-blank column becomes NaN floats."""
+        result = infer_column([None, ''])
+        assert result.dtype == np.float64
+        assert np.isnan(result).all()
+
+
+class TestColumnarParsing:
+    """Test cases for columnar parsing of files."""
+    
+    def test_rows_to_columns_missing_keys(self):
+        """Test that rows missing a column are filled with blanks."""
+        rows = [{'unit': '101'}, {'unit': '102', 'rent': '$1,250.00'}]
+        columns = rows_to_columns(rows)
+        assert list(columns) == ['unit', 'rent']
+        assert columns['unit'].tolist() == [101, 102]
+        assert np.isnan(columns['rent'][0])
+        assert columns['rent'][1] == 1250.0
+    
+    def test_read_columns_csv(self):
+        """Test reading a CSV file into typed columns."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerow(['Unit', 'Sq Ft', 'Market Rent', 'Lease End'])
+            writer.writerow(['A-101', '750', '$1,250.00', '2025-06-30'])
+            writer.writerow(['A-102', '900', '$1,400.00', ''])
+            tmp_file_path = tmp_file.name
+        
+        try:
+            columns = read_columns(tmp_file_path)
+            assert columns['unit'].tolist() == ['A-101', 'A-102']
+            assert columns['sq_ft'].dtype == np.int64
+            np.testing.assert_allclose(columns['market_rent'], [1250.0, 1400.0])
+            assert columns['lease_end'].dtype == np.dtype('datetime64[ns]')
+            assert np.isnat(columns['lease_end'][1])
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_read_columns_xlsx_dataframe(self):
+        """Test reading an XLSX file into a typed DataFrame."""
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(['Unit', 'Market Rent'])
+        worksheet.append(['101', 1250.5])
+        worksheet.append(['102', 1300])
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            workbook.save(tmp_file.name)
+            tmp_file_path = tmp_file.name
+            workbook.close()
+        
+        try:
+            frame = read_columns(tmp_file_path, as_dataframe=True)
+            assert isinstance(frame, pd.DataFrame)
+            assert frame['unit'].tolist() == [101, 102]
+            assert frame['market_rent'].dtype == np.float64
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_read_columns_unsupported_type(self):
+        """Test that unsupported file types raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            read_columns("rent_roll.txt")
@@ -0,0 +1,127 @@
+"""
+Tests for ETL delta ingestion module.
+"""
+
+import pytest
+import csv
+from backend.etl.delta import diff_rows, ingest_delta, load_snapshot, row_fingerprint
+
+
+def _write_rent_roll(path, rows):
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['Unit', 'Tenant', 'Actual Rent'])
+        writer.writerows(rows)
+
+
+class TestDiffRows:
+    """Test cases for diff_rows function."""
+
+    def test_inserted_updated_removed(self):
+        """Test that each kind of change is detected."""
+        previous = [
+            {'unit': '101', 'rent': '1250'},
+            {'unit': '102', 'rent': '1300'},
+            {'unit': '103', 'rent': '1400'},
+        ]
+        current = [
+            {'unit': '101', 'rent': '1250'},
+            {'unit': '102', 'rent': '1350'},
+            {'unit': '104', 'rent': '1500'},
+        ]
+        delta = diff_rows(previous, current, key='unit')
+        assert delta.inserted == [{'unit': '104', 'rent': '1500'}]
+        assert delta.updated == [{'unit': '102', 'rent': '1350'}]
+        assert delta.removed == [{'unit': '103', 'rent': '1400'}]
+        assert delta.unchanged == 1
+        assert delta.has_changes
+
+    def test_composite_key(self):
+        """Test diffing with a composite key."""
+        previous = [{'building': 'A', 'unit': '101', 'rent': '1250'}]
+        current = [
+            {'building': 'A', 'unit': '101', 'rent': '1250'},
+            {'building': 'B', 'unit': '101', 'rent': '1250'},
+        ]
+        delta = diff_rows(previous, current, key=['building', 'unit'])
+        assert delta.inserted == [{'building': 'B', 'unit': '101', 'rent': '1250'}]
+        assert not delta.updated and not delta.removed
+
+    def test_fingerprint_ignores_column_order(self):
+        """Test that reordered columns are not reported as updates."""
+        assert row_fingerprint({'a': '1', 'b': None}) == row_fingerprint({'b': None, 'a': '1'})
+        assert row_fingerprint({'a': '1', 'b': None}) != row_fingerprint({'a': '1', 'b': ''})
+
+    def test_duplicate_key(self):
+        """Test that duplicate keys raise ValueError."""
+        with pytest.raises(ValueError, match="Duplicate key"):
+            diff_rows([], [{'unit': '101'}, {'unit': '101'}], key='unit')
+
+    def test_missing_key_column(self):
+        """Test that a missing key column raises ValueError."""
+        with pytest.raises(ValueError, match="Key column"):
+            diff_rows([], [{'suite': '101'}], key='unit')
+
+
+class TestIngestDelta:
+    """Test cases for ingest_delta function."""
+
+    def test_monthly_uploads(self, tmp_path):
+        """Test that consecutive uploads emit only the changes."""
+        snapshot = str(tmp_path / "snapshots" / "sunset.bin")
+        upload = tmp_path / "rent_roll.csv"
+
+        _write_rent_roll(upload, [['101', 'Smith', '1250'], ['102', 'Jones', '1300']])
+        first = ingest_delta(str(upload), snapshot)
+        assert len(first.inserted) == 2
+        assert not first.updated and not first.removed
+
+        _write_rent_roll(upload, [['101', 'Smith', '1250'], ['102', 'Lee', '1325'], ['103', 'Diaz', '1400']])
+        second = ingest_delta(str(upload), snapshot)
+        assert second.inserted == [{'unit': '103', 'tenant': 'Diaz', 'actual_rent': '1400'}]
+        assert second.updated == [{'unit': '102', 'tenant': 'Lee', 'actual_rent': '1325'}]
+        assert second.removed == []
+        assert second.unchanged == 1
+
+        assert len(load_snapshot(snapshot)) == 3
+
+    def test_failed_upload_keeps_snapshot(self, tmp_path):
+        """Test that an upload with duplicate keys leaves the snapshot untouched."""
+        snapshot = str(tmp_path / "sunset.bin")
+        upload = tmp_path / "rent_roll.csv"
+
+        _write_rent_roll(upload, [['101', 'Smith', '1250']])
+        ingest_delta(str(upload), snapshot)
+
+        _write_rent_roll(upload, [['101', 'Smith', '1250'], ['101', 'Lee', '1300']])
+        with pytest.raises(ValueError, match="Duplicate key"):
+            ingest_delta(str(upload), snapshot)
+
+        stored = load_snapshot(snapshot)
+        assert len(stored) == 1 and stored[0]['tenant'] == 'Smith'
+
+    def test_unsupported_file_type(self, tmp_path):
+        """Test that unsupported uploads raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            ingest_delta(str(tmp_path / "rent_roll.txt"), str(tmp_path / "snap.bin"))
+
+    def test_parsed_rows_with_non_text_values(self, tmp_path):
+        """Test that numeric cells are stored as text and the caller's rows are untouched."""
+        snapshot = str(tmp_path / "sunset.bin")
+        rows = [{'unit': 101, 'actual_rent': 1250.0, 'notes': None}]
+        first = ingest_delta(str(tmp_path / "rent_roll.xlsx"), snapshot, rows=rows)
+        assert first.inserted == [{'unit': '101', 'actual_rent': '1250.0', 'notes': None}]
+        assert rows == [{'unit': 101, 'actual_rent': 1250.0, 'notes': None}]
+
+        second = ingest_delta(str(tmp_path / "rent_roll.xlsx"), snapshot,
+                              rows=[{'unit': '101', 'actual_rent': '1250.0', 'notes': None}])
+        assert not second.has_changes
+        assert load_snapshot(snapshot)[0]['unit'] == '101'
+
+    def test_snapshot_rows_not_modified(self):
+        """Test that diffing does not strip stored fingerprints from the caller's rows."""
+        previous = [{'unit': '101', 'tenant': 'Smith'}]
+        previous[0]['__fingerprint__'] = row_fingerprint(previous[0])
+        delta = diff_rows(previous, [{'unit': '101', 'tenant': 'Smith'}], key='unit')
+        assert delta.unchanged == 1
+        assert '__fingerprint__' in previous[0]
@@ -0,0 +1,122 @@
+"""
+Tests for ETL rent-roll normalization module.
+"""
+
+import pytest
+import tempfile
+import os
+import csv
+import numpy as np
+import pandas as pd
+from backend.etl.columnar import read_columns
+from backend.etl.normalize import normalize_rent_roll, resolve_header, resolve_headers
+from backend.etl.parsers import parse_csv
+
+
+class TestResolveHeaders:
+    """Test cases for header alias resolution."""
+    
+    @pytest.mark.parametrize("header", ["Mkt Rent", "market_rent", "Market Rent/Mo", "MARKET RENT ($)",
+                                        "market_rent/mo"])
+    def test_market_rent_variants(self, header):
+        """Test that common market rent spellings resolve to one field."""
+        assert resolve_header(header) == "market_rent"
+    
+    def test_other_fields(self):
+        """Test resolution of a typical Yardi-style header row."""
+        mapping = resolve_headers(["Unit #", "Floor Plan", "Sq. Ft.", "Resident", "Lease Exp", "move-in_date",
+                                   "Rent", "Sec Dep", "Notes"])
+        assert mapping == {
+            "Unit #": "unit", "Floor Plan": "unit_type", "Sq. Ft.": "square_feet", "Resident": "tenant",
+            "Lease Exp": "lease_end", "move-in_date": "move_in", "Rent": "actual_rent", "Sec Dep": "deposit",
+        }
+    
+    def test_first_header_wins(self):
+        """Test that only the first header resolving to a field is mapped."""
+        assert resolve_headers(["Mkt Rent", "Market Rent/Mo"]) == {"Mkt Rent": "market_rent"}
+    
+    def test_unknown_header(self):
+        """Test that unrecognized headers are not mapped."""
+        assert resolve_header("Pet Fee Notes") is None
+
+
+class TestNormalizeRentRoll:
+    """Test cases for rent-roll normalization."""
+    
+    def test_normalize_row_dicts(self):
+        """Test normalization of parser output with mixed headers and formats."""
+        rows = [
+            {"Unit": "101", "Unit Type": "2x2", "SqFt": "1,000", "Mkt Rent": "$1,500.00",
+             "Actual Rent": "(25.00)", "Lease Start": "2024-01-01", "Lease End": "01/31/2025"},
+            {"Unit": "102", "Unit Type": "Studio", "SqFt": None, "Mkt Rent": None,
+             "Actual Rent": "900", "Lease Start": None, "Lease End": "month to month"},
+        ]
+        
+        df = normalize_rent_roll(rows)
+        
+        assert df["unit"].tolist() == ["101", "102"]
+        assert df["square_feet"].iloc[0] == 1000.0
+        assert np.isnan(df["square_feet"].iloc[1])
+        assert df["market_rent"].iloc[0] == 1500.0
+        assert df["actual_rent"].tolist() == [-25.0, 900.0]
+        assert df["lease_start"].iloc[0] == pd.Timestamp("2024-01-01")
+        assert pd.isna(df["lease_start"].iloc[1])
+        assert df["lease_end"].iloc[0] == pd.Timestamp("2025-01-31")
+        assert pd.isna(df["lease_end"].iloc[1])
+        assert df["market_rent_psf"].iloc[0] == 1.5
+    
+    @pytest.mark.parametrize("unit_type,bedrooms,bathrooms", [
+        ("2x2", 2.0, 2.0),
+        ("1BR/1BA", 1.0, 1.0),
+        ("3 Bed 2.5 Bath", 3.0, 2.5),
+        ("A2 - 1x1", 1.0, 1.0),
+        ("Studio", 0.0, 1.0),
+    ])
+    def test_unit_type_parsing(self, unit_type, bedrooms, bathrooms):
+        """Test bedroom and bathroom extraction from unit type labels."""
+        df = normalize_rent_roll([{"unit": "1", "unit_type": unit_type}])
+        assert df["bedrooms"].iloc[0] == bedrooms
+        assert df["bathrooms"].iloc[0] == bathrooms
+    
+    def test_unparseable_unit_type(self):
+        """Test that unrecognized unit types yield NaN counts."""
+        df = normalize_rent_roll([{"unit": "1", "unit_type": "Penthouse"}, {"unit": "2", "unit_type": None}])
+        assert df["bedrooms"].isna().all()
+        assert df["bathrooms"].isna().all()
+    
+    def test_rent_psf_requires_positive_square_feet(self):
+        """Test that zero or missing square footage gives NaN rent per square foot."""
+        df = normalize_rent_roll({"unit": ["1", "2"], "sq_ft": [0, np.nan], "rent": [1000.0, 1100.0]})
+        assert df["actual_rent_psf"].isna().all()
+    
+    def test_column_order_and_unmapped_columns(self):
+        """Test canonical columns first, then unrecognized columns, without shadowing."""
+        df = normalize_rent_roll([{"Notes": "corner", "Rent": "1000", "actual_rent": "999", "Unit": "1"}])
+        assert list(df.columns) == ["unit", "actual_rent", "Notes", "source_actual_rent"]
+        assert df["actual_rent"].iloc[0] == 1000.0
+        assert df["source_actual_rent"].iloc[0] == "999"
+    
+    def test_typed_columnar_input(self):
+        """Test that already-typed columns from read_columns are used as-is."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Unit", "Sq Ft", "Market Rent", "Lease Start"])
+            writer.writerow(["101", "800", "$1,200.00", "2024-03-01"])
+            writer.writerow(["102", "1000", "$1,500.00", "2024-04-01"])
+            temp_path = f.name
+        
+        try:
+            from_columns = normalize_rent_roll(read_columns(temp_path))
+            from_rows = normalize_rent_roll(parse_csv(temp_path))
+            
+            assert from_columns["market_rent_psf"].tolist() == [1.5, 1.5]
+            for column in ["square_feet", "market_rent", "market_rent_psf", "lease_start"]:
+                assert from_columns[column].tolist() == from_rows[column].tolist()
+        finally:
+            os.unlink(temp_path)
+    
+    def test_empty_input(self):
+        """Test that an empty rent roll normalizes to an empty frame."""
+        df = normalize_rent_roll(pd.DataFrame({"Unit": [], "Market Rent": []}))
+        assert len(df) == 0
+        assert list(df.columns) == ["unit", "market_rent"]
@@ -5,10 +5,57 @@ Tests for ETL parsers module.
 import pytest
 import tempfile
 import os
+import sys
 import csv
 import openpyxl
 from pathlib import Path
-from backend.etl.parsers import parse_csv, parse_xlsx, parse_pdf
+from unittest.mock import patch
+from backend.etl.parsers import (
+    parse_csv, parse_xlsx, parse_pdf, iter_csv, iter_xlsx, iter_pdf, parse_xlsx_sheets
+)
+
+
+def build_pdf(pages):
+    """
+    Build a minimal PDF whose pages lay out rows of text cells in columns.
+    
+    Args:
+        pages: One list of rows (lists of cell strings) per page; None makes
+            a blank page and ``"scan"`` an image-only page with no text layer
+        
+    Returns:
+        PDF file bytes
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for rows in pages:
+        content = []
+        if rows == "scan":
+            content.append("q 100 0 0 100 60 600 cm BI /W 1 /H 1 /CS /G /BPC 8 ID \xff EI Q")
+            rows = None
+        for r, row in enumerate(rows or []):
+            for c, cell in enumerate(row):
+                if cell:
+                    content.append(f"BT /F1 10 Tf {60 + c * 140} {740 - r * 18} Td ({cell}) Tj ET")
+        stream = "\n".join(content).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
 
 
 class TestParsers:
@@ -216,11 +263,10 @@ class TestParsers:
         finally:
             os.unlink(tmp_file_path)
     
-    def test_parse_pdf_not_implemented(self):
-        """Test that parse_pdf raises NotImplementedError."""
-        with pytest.raises(NotImplementedError) as exc_info:
+    def test_parse_pdf_file_not_found(self):
+        """Test PDF parsing with non-existent file."""
+        with pytest.raises(FileNotFoundError):
             parse_pdf("test.pdf")
-        assert "PDF parsing not yet implemented" in str(exc_info.value)
     
     def test_parse_csv_with_different_delimiters(self):
         """Test CSV parsing with different delimiters."""
@@ -239,4 +285,348 @@ class TestParsers:
             
             assert result == expected
         finally:
-            os.unlink(tmp_file_path) 
\ No newline at end of file
+            os.unlink(tmp_file_path) 
+    
+    def test_iter_csv_yields_rows_lazily(self):
+        """Test that iter_csv streams the same rows parse_csv returns."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerow(['Unit', 'Market Rent'])
+            for unit in range(1, 6):
+                writer.writerow([str(unit), '1250'])
+            tmp_file_path = tmp_file.name
+        
+        try:
+            rows = iter_csv(tmp_file_path)
+            assert next(rows) == {'unit': '1', 'market_rent': '1250'}
+            assert len(list(rows)) == 4
+            assert list(iter_csv(tmp_file_path)) == parse_csv(tmp_file_path)
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_csv_batches(self):
+        """Test that iter_csv groups rows into fixed-size batches."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerow(['Unit', 'Market Rent'])
+            for unit in range(1, 8):
+                writer.writerow([str(unit), '1250'])
+            tmp_file_path = tmp_file.name
+        
+        try:
+            batches = list(iter_csv(tmp_file_path, batch_size=3))
+            assert [len(batch) for batch in batches] == [3, 3, 1]
+            assert batches[2] == [{'unit': '7', 'market_rent': '1250'}]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_csv_invalid_batch_size(self):
+        """Test that iter_csv rejects non-positive batch sizes."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            tmp_file.write("Unit,Rent\n1,1250\n")
+            tmp_file_path = tmp_file.name
+        
+        try:
+            with pytest.raises(ValueError, match="batch_size"):
+                iter_csv(tmp_file_path, batch_size=0)
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_csv_file_not_found(self):
+        """Test that iter_csv raises FileNotFoundError before iteration starts."""
+        with pytest.raises(FileNotFoundError):
+            iter_csv("nonexistent_file.csv")
+    
+    def test_parse_csv_latin1_fallback_mid_file(self):
+        """Test that a latin-1 byte deep in the file keeps earlier rows and headers."""
+        lines = ["Property Name,City\n"]
+        lines += [f"Property {i},Austin\n" for i in range(5000)]
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as tmp_file:
+            tmp_file.write(''.join(lines).encode('utf-8'))
+            tmp_file.write("Caf\xe9 Lofts,San Jos\xe9\n".encode('latin-1'))
+            tmp_file_path = tmp_file.name
+        
+        try:
+            result = parse_csv(tmp_file_path)
+            assert len(result) == 5001
+            assert result[0] == {'property_name': 'Property 0', 'city': 'Austin'}
+            assert result[-1] == {'property_name': 'Caf\xe9 Lofts', 'city': 'San Jos\xe9'}
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_csv_crlf_across_chunks(self):
+        """Test that CRLF line endings split across read chunks are handled."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', newline='', delete=False) as tmp_file:
+            writer = csv.writer(tmp_file, lineterminator='\r\n')
+            writer.writerow(['Unit', 'Rent', 'Notes'])
+            for unit in range(20000):
+                writer.writerow([str(unit), '1250', 'line one\nline two' if unit % 700 == 7 else ''])
+            tmp_file_path = tmp_file.name
+        
+        try:
+            result = parse_csv(tmp_file_path)
+            assert len(result) == 20000
+            assert result[7] == {'unit': '7', 'rent': '1250', 'notes': 'line one\nline two'}
+            assert result[-1] == {'unit': '19999', 'rent': '1250', 'notes': None}
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_xlsx_batches(self):
+        """Test that iter_xlsx streams worksheet rows in fixed-size batches."""
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(['Unit', 'Market Rent'])
+        for unit in range(1, 6):
+            worksheet.append([unit, 1250])
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            workbook.save(tmp_file.name)
+            tmp_file_path = tmp_file.name
+            workbook.close()
+        
+        try:
+            batches = list(iter_xlsx(tmp_file_path, batch_size=2))
+            assert [len(batch) for batch in batches] == [2, 2, 1]
+            assert batches[0][0] == {'unit': '1', 'market_rent': '1250'}
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_xlsx_header_below_blank_rows(self):
+        """Test that the header is detected lazily below leading blank rows."""
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet['A3'] = 'Unit'
+        worksheet['B3'] = 'Market Rent'
+        worksheet['A4'] = '101'
+        worksheet['B4'] = 1250
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            workbook.save(tmp_file.name)
+            tmp_file_path = tmp_file.name
+            workbook.close()
+        
+        try:
+            assert parse_xlsx(tmp_file_path) == [{'unit': '101', 'market_rent': '1250'}]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_xlsx_short_rows_padded(self):
+        """Test that rows shorter than the header are padded with None."""
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(['Unit', 'Market Rent', 'Notes'])
+        worksheet.append(['101'])
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            workbook.save(tmp_file.name)
+            tmp_file_path = tmp_file.name
+            workbook.close()
+        
+        try:
+            assert parse_xlsx(tmp_file_path) == [{'unit': '101', 'market_rent': None, 'notes': None}]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_xlsx_invalid_file(self):
+        """Test that iter_xlsx raises ValueError for a non-XLSX file."""
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            tmp_file.write(b"not an excel file")
+            tmp_file_path = tmp_file.name
+        
+        try:
+            with pytest.raises(ValueError, match="Failed to parse XLSX file"):
+                iter_xlsx(tmp_file_path)
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def _write_pdf(self, pages):
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
+            tmp_file.write(build_pdf(pages))
+            return tmp_file.name
+    
+    def test_parse_pdf_text_layer_table(self):
+        """Test PDF table extraction from the text layer across pages."""
+        pytest.importorskip("pdfplumber")
+        header = ['Unit', 'Unit Type', 'Market Rent']
+        tmp_file_path = self._write_pdf([
+            [['Rent Roll - Sunset Apartments'], header,
+             ['101', '1x1', '$1,250.00'], ['102', '', '$1,400.00']],
+            [header, ['103', '2x2', '$1,575.00'], ['Page 2 of 2']],
+        ])
+        
+        try:
+            result = parse_pdf(tmp_file_path)
+            
+            expected = [
+                {'unit': '101', 'unit_type': '1x1', 'market_rent': '$1,250.00'},
+                {'unit': '102', 'unit_type': None, 'market_rent': '$1,400.00'},
+                {'unit': '103', 'unit_type': '2x2', 'market_rent': '$1,575.00'},
+            ]
+            
+            assert result == expected
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_iter_pdf_parallel_matches_serial(self):
+        """Test that page-parallel extraction yields rows in page order."""
+        pytest.importorskip("pdfplumber")
+        pages = [[['Unit', 'Market Rent']] + [[f"{page}{unit:02d}", '1250'] for unit in range(3)]
+                 for page in range(1, 6)]
+        tmp_file_path = self._write_pdf(pages)
+        
+        try:
+            serial = list(iter_pdf(tmp_file_path, max_workers=1))
+            parallel = list(iter_pdf(tmp_file_path, max_workers=2, pages_per_task=1))
+            assert parallel == serial
+            assert [row['unit'] for row in serial][:4] == ['100', '101', '102', '200']
+            assert len(serial) == 15
+            
+            batches = list(iter_pdf(tmp_file_path, max_workers=1, batch_size=10))
+            assert [len(batch) for batch in batches] == [10, 5]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_pdf_ocr_only_for_pages_without_text(self):
+        """Test that OCR runs only on pages without a text layer."""
+        pytest.importorskip("pdfplumber")
+        tmp_file_path = self._write_pdf([
+            [['Unit', 'Market Rent'], ['101', '1250']],
+            "scan",
+            None,
+        ])
+        scanned_words = [
+            {'x0': 60, 'x1': 80, 'top': 50, 'bottom': 60, 'text': '102'},
+            {'x0': 200, 'x1': 220, 'top': 50, 'bottom': 60, 'text': '1300'},
+        ]
+        
+        try:
+            with patch('backend.etl.parsers._ocr_words', return_value=scanned_words) as mock_ocr:
+                result = list(iter_pdf(tmp_file_path, max_workers=1))
+            
+            assert mock_ocr.call_count == 1
+            assert mock_ocr.call_args[0][0].page_number == 2
+            assert result == [
+                {'unit': '101', 'market_rent': '1250'},
+                {'unit': '102', 'market_rent': '1300'},
+            ]
+            
+            # With OCR disabled, image-only pages are skipped
+            assert list(iter_pdf(tmp_file_path, max_workers=1, ocr=False)) == result[:1]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_pdf_blank_page_skipped(self):
+        """Test that blank pages are skipped without attempting OCR."""
+        pytest.importorskip("pdfplumber")
+        tmp_file_path = self._write_pdf([None, [['Unit', 'Market Rent'], ['101', '1250']], None])
+        
+        try:
+            with patch('backend.etl.parsers._ocr_words') as mock_ocr:
+                result = parse_pdf(tmp_file_path, max_workers=1)
+            
+            assert mock_ocr.call_count == 0
+            assert result == [{'unit': '101', 'market_rent': '1250'}]
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_pdf_without_ocr_engine(self, caplog):
+        """Test that scanned pages are skipped with one warning when OCR is unavailable."""
+        pytest.importorskip("pdfplumber")
+        tmp_file_path = self._write_pdf([[['Unit', 'Market Rent'], ['101', '1250']], "scan", "scan"])
+        
+        try:
+            with patch.dict(sys.modules, {'pytesseract': None}), \
+                    patch('backend.etl.parsers._ocr_unavailable', None):
+                result = parse_pdf(tmp_file_path, max_workers=1)
+            
+            assert result == [{'unit': '101', 'market_rent': '1250'}]
+            warnings = [record for record in caplog.records if record.levelname == 'WARNING']
+            assert len(warnings) == 1
+            assert 'pytesseract is not installed' in warnings[0].getMessage()
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_pdf_invalid_file(self):
+        """Test that PDF parsing raises ValueError for a non-PDF file."""
+        pytest.importorskip("pdfplumber")
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
+            tmp_file.write(b"not a pdf file")
+            tmp_file_path = tmp_file.name
+        
+        try:
+            with pytest.raises(ValueError, match="Failed to parse PDF file"):
+                parse_pdf(tmp_file_path)
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def _write_operating_statement(self):
+        workbook = openpyxl.Workbook()
+        workbook.active.title = 'Jan'
+        for month in ['Jan', 'Feb', 'Mar']:
+            worksheet = workbook[month] if month in workbook.sheetnames else workbook.create_sheet(month)
+            worksheet.append(['Account', 'Amount'])
+            worksheet.append(['Rent', 100000 + len(month)])
+            worksheet.append([f'{month} Taxes', 9000])
+        workbook.create_sheet('Notes')
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
+            workbook.save(tmp_file.name)
+            workbook.close()
+            return tmp_file.name
+    
+    def test_parse_xlsx_sheets_all(self):
+        """Test that every worksheet is parsed into its own table."""
+        tmp_file_path = self._write_operating_statement()
+        
+        try:
+            result = parse_xlsx_sheets(tmp_file_path, max_workers=2)
+            assert list(result) == ['Jan', 'Feb', 'Mar', 'Notes']
+            assert result['Feb'] == [
+                {'account': 'Rent', 'amount': '100003'},
+                {'account': 'Feb Taxes', 'amount': '9000'},
+            ]
+            assert result['Notes'] == []
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_xlsx_sheets_subset(self):
+        """Test parsing a selected subset of worksheets serially."""
+        tmp_file_path = self._write_operating_statement()
+        
+        try:
+            result = parse_xlsx_sheets(tmp_file_path, sheets=['Mar', 'Jan'], max_workers=1)
+            assert list(result) == ['Mar', 'Jan']
+            assert result['Mar'][1] == {'account': 'Mar Taxes', 'amount': '9000'}
+            assert list(iter_xlsx(tmp_file_path, sheet='Mar')) == result['Mar']
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_xlsx_sheets_missing_sheet(self):
+        """Test that unknown worksheet names raise ValueError."""
+        tmp_file_path = self._write_operating_statement()
+        
+        try:
+            with pytest.raises(ValueError, match="Worksheet"):
+                parse_xlsx_sheets(tmp_file_path, sheets=['Apr'])
+            with pytest.raises(ValueError, match="Worksheet 'Apr' not found"):
+                iter_xlsx(tmp_file_path, sheet='Apr')
+        finally:
+            os.unlink(tmp_file_path)
+    
+    def test_parse_csv_wide_semicolon_file(self):
+        """Test delimiter detection when the sniffer sample ends mid-row."""
+        headers = ['GL Code', 'Account'] + [f'Month {m}' for m in range(1, 13)]
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
+            writer = csv.writer(tmp_file, delimiter=';')
+            writer.writerow(headers)
+            for line in range(50):
+                writer.writerow([f'{4000 + line}', 'Property Taxes'] + [f'{1000 + m}.25' for m in range(12)])
+            tmp_file_path = tmp_file.name
+        
+        try:
+            result = parse_csv(tmp_file_path)
+            assert len(result) == 50
+            assert result[0]['gl_code'] == '4000'
+            assert result[0]['month_12'] == '1011.25'
+        finally:
+            os.unlink(tmp_file_path)
\ No newline at end of file
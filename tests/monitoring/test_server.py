@@ -3,8 +3,9 @@ Tests for monitoring server.
 """
 
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
-from backend.monitoring.server import monitoring_app
+from backend.monitoring.server import create_monitoring_app, monitoring_app
 
 client = TestClient(monitoring_app)
 
@@ -52,4 +53,11 @@ class TestMonitoringServer:
         
         # Should contain metrics for our requests
         assert "http_requests_total" in content
-        assert "http_request_duration_seconds" in content 
\ No newline at end of file
+        assert "http_request_duration_seconds" in content 
+    
+    def test_startup_warms_assumption_cache(self):
+        """Test that application startup parses the assumption sets."""
+        with patch("backend.monitoring.server.warm_assumption_cache") as warm:
+            with TestClient(create_monitoring_app()) as startup_client:
+                assert startup_client.get("/health").status_code == 200
+        warm.assert_called_once_with()
@@ -76,4 +76,65 @@ class TestScenarioEndpoints:
         assert "comparison_data" in data
         assert "irr_difference" in data["comparison_data"]
         assert "npv_difference" in data["comparison_data"]
-        assert "cash_flow_impact" in data["comparison_data"] 
\ No newline at end of file
+        assert "cash_flow_impact" in data["comparison_data"] 
+    
+    def test_sensitivity_grid_endpoint(self):
+        """Test a sensitivity grid over a named assumption set."""
+        request = {
+            "purchase_price": 10_000_000,
+            "gross_potential_rent": 1_200_000,
+            "assumption_set": "moderate",
+            "x": {"name": "exit_cap_rate", "start": 0.05, "stop": 0.07, "steps": 3},
+            "y": {"name": "rent_growth_rate", "values": [0.02, 0.03]},
+        }
+        
+        response = client.post("/scenarios/sensitivity/", json=request)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["x"]["values"] == pytest.approx([0.05, 0.06, 0.07])
+        assert len(data["irr"]) == 3
+        assert len(data["irr"][0]) == 2
+        assert data["irr"][0][0] > data["irr"][2][0]
+        assert "dscr" in data and "noi" in data
+    
+    def test_sensitivity_grid_invalid_axis(self):
+        """Test that an unknown axis variable is a bad request."""
+        request = {
+            "purchase_price": 10_000_000,
+            "gross_potential_rent": 1_200_000,
+            "x": {"name": "not_an_input", "values": [1.0]},
+            "y": {"name": "rent_growth_rate", "values": [0.02]},
+        }
+        
+        response = client.post("/scenarios/sensitivity/", json=request)
+        assert response.status_code == 400
+    
+    def test_tornado_endpoint(self):
+        """Test a tornado chart with inline assumptions."""
+        request = {
+            "purchase_price": 10_000_000,
+            "gross_potential_rent": 1_200_000,
+            "assumptions": {
+                "rent_growth_rate": 0.03,
+                "expense_ratio": 0.4,
+                "vacancy_rate": 0.05,
+                "exit_cap_rate": 0.06,
+                "holding_period": 5,
+            },
+        }
+        
+        response = client.post("/scenarios/tornado/", json=request)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["metric"] == "irr"
+        swings = [bar["swing"] for bar in data["bars"]]
+        assert swings == sorted(swings, reverse=True)
+    
+    def test_tornado_unknown_assumption_set(self):
+        """Test that an unknown assumption set returns 404."""
+        request = {"purchase_price": 1, "gross_potential_rent": 1, "assumption_set": "missing"}
+        
+        response = client.post("/scenarios/tornado/", json=request)
+        assert response.status_code == 404
@@ -0,0 +1,110 @@
+"""
+Tests for sensitivity grids and tornado charts.
+"""
+
+import time
+import pytest
+import numpy as np
+from backend.underwriting.scenarios.sensitivity import evaluate_metrics, sensitivity_grid, tornado
+from backend.underwriting.engine import project_cash_flows
+from backend.underwriting.returns import irr
+
+ASSUMPTIONS = {
+    "rent_growth_rate": 0.03,
+    "expense_ratio": 0.4,
+    "vacancy_rate": 0.05,
+    "exit_cap_rate": 0.06,
+    "holding_period": 5,
+    "financing": {"loan_to_value": 0.65, "interest_rate": 0.055, "amortization_period": 30},
+}
+
+
+def single_deal(price=10_000_000, gpr=1_200_000, **changes):
+    """Project one deal the slow way, for comparison."""
+    assumptions = dict(ASSUMPTIONS, financing=dict(ASSUMPTIONS["financing"]))
+    for key, value in changes.items():
+        if key in assumptions["financing"]:
+            assumptions["financing"][key] = value
+        else:
+            assumptions[key] = value
+    return project_cash_flows(price, gpr, assumptions)
+
+
+class TestSensitivityGrid:
+    """Test cases for two-way sensitivity grids."""
+    
+    def test_cells_match_individual_runs(self):
+        """Test that every cell matches a separate single-deal projection."""
+        caps = [0.05, 0.06, 0.07]
+        growth = [0.01, 0.03]
+        grid = sensitivity_grid(10_000_000, 1_200_000, ASSUMPTIONS, "exit_cap_rate", caps,
+                                "rent_growth_rate", growth)
+        assert grid.irr.shape == (3, 2)
+        for i, cap in enumerate(caps):
+            for j, rate in enumerate(growth):
+                flows = single_deal(exit_cap_rate=cap, rent_growth_rate=rate)
+                assert grid.irr[i, j] == pytest.approx(irr(flows.levered).rate[0])
+                assert grid.noi[i, j] == pytest.approx(flows.net_operating_income[0, 1])
+    
+    def test_deal_input_axis_and_dscr(self):
+        """Test varying the purchase price against the interest rate."""
+        grid = sensitivity_grid(10_000_000, 1_200_000, ASSUMPTIONS, "purchase_price", [9e6, 11e6],
+                                "interest_rate", [0.05, 0.06])
+        flows = single_deal(price=11e6, interest_rate=0.06)
+        expected = flows.net_operating_income[0, 1] / flows.debt_service[0, 1]
+        assert grid.dscr[1, 1] == pytest.approx(expected)
+        # Higher price and rate both lower returns and coverage
+        assert grid.irr[0, 0] > grid.irr[1, 0] > grid.irr[1, 1]
+        assert grid.dscr[0, 0] > grid.dscr[1, 1]
+    
+    def test_dscr_undefined_without_debt(self):
+        """Test that an all-cash deal has no DSCR."""
+        metrics = evaluate_metrics(10_000_000, 1_200_000, ASSUMPTIONS, {"loan_to_value": [0.0, 0.5]})
+        assert np.isnan(metrics["dscr"][0])
+        assert metrics["dscr"][1] > 0
+    
+    def test_fifty_by_fifty_grid_is_fast(self):
+        """Test that a 50x50 grid is one fast batch."""
+        start = time.perf_counter()
+        grid = sensitivity_grid(10_000_000, 1_200_000, ASSUMPTIONS, "exit_cap_rate",
+                                np.linspace(0.045, 0.075, 50), "rent_growth_rate", np.linspace(0.0, 0.06, 50))
+        assert time.perf_counter() - start < 1.0
+        assert grid.irr.shape == (50, 50)
+        assert np.isfinite(grid.irr).all()
+    
+    def test_invalid_axes(self):
+        """Test unknown and repeated variables."""
+        with pytest.raises(ValueError, match="Unknown sensitivity variable"):
+            sensitivity_grid(1e7, 1.2e6, ASSUMPTIONS, "cap_rate", [0.05], "rent_growth_rate", [0.03])
+        with pytest.raises(ValueError, match="different"):
+            sensitivity_grid(1e7, 1.2e6, ASSUMPTIONS, "exit_cap_rate", [0.05], "exit_cap_rate", [0.06])
+
+
+class TestTornado:
+    """Test cases for tornado charts."""
+    
+    def test_default_bars_sorted_by_swing(self):
+        """Test the default variables, ordering and bar values."""
+        chart = tornado(10_000_000, 1_200_000, ASSUMPTIONS)
+        names = [bar.name for bar in chart.bars]
+        assert "holding_period" not in names
+        assert {"purchase_price", "exit_cap_rate", "interest_rate"} <= set(names)
+        swings = [bar.swing for bar in chart.bars]
+        assert swings == sorted(swings, reverse=True)
+        assert chart.base == pytest.approx(irr(single_deal().levered).rate[0])
+        cap = next(bar for bar in chart.bars if bar.name == "exit_cap_rate")
+        assert (cap.low_input, cap.high_input) == pytest.approx((0.054, 0.066))
+        assert cap.low == pytest.approx(irr(single_deal(exit_cap_rate=0.054).levered).rate[0])
+    
+    def test_explicit_deltas_and_metric(self):
+        """Test absolute deltas with a different metric."""
+        chart = tornado(10_000_000, 1_200_000, ASSUMPTIONS, deltas={"interest_rate": 0.01}, metric="dscr")
+        assert len(chart.bars) == 1
+        bar = chart.bars[0]
+        assert (bar.low_input, bar.high_input) == pytest.approx((0.045, 0.065))
+        assert bar.low > chart.base > bar.high
+    
+    def test_unknown_metric(self):
+        """Test that an unknown metric is rejected."""
+        with pytest.raises(ValueError, match="Unknown metric"):
+            tornado(1e7, 1.2e6, ASSUMPTIONS, metric="npv")
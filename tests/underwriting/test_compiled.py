@@ -0,0 +1,103 @@
+"""
+Tests for compiling assumption sets into arrays.
+"""
+
+import json
+import pytest
+import numpy as np
+from pathlib import Path
+from backend.underwriting.assumptions.compiled import FIELDS, compile_assumptions
+from backend.underwriting.assumptions.models import Assumption
+from backend.underwriting.engine import project_cash_flows
+
+ASSUMPTIONS_DIR = Path(__file__).resolve().parents[2] / "data" / "assumptions"
+
+
+@pytest.fixture
+def documents():
+    """The bundled assumption sets."""
+    return [json.loads(path.read_text()) for path in sorted(ASSUMPTIONS_DIR.glob("*.json"))]
+
+
+class TestCompileAssumptions:
+    """Test cases for compile_assumptions."""
+    
+    def test_layout_and_defaults(self):
+        """Test fixed field order, contiguous rows and filled defaults."""
+        compiled = compile_assumptions([
+            {"name": "a", "rent_growth_rate": 0.03, "expense_ratio": 0.4, "vacancy_rate": 0.05,
+             "exit_cap_rate": 0.06, "holding_period": 5},
+            {"name": "b", "assumptions": {"rent_growth_rate": 0.02, "expense_ratio": 0.45, "vacancy_rate": 0.06,
+                                          "exit_cap_rate": 0.065, "holding_period": 7,
+                                          "financing": {"loan_to_value": 0.7}}},
+        ])
+        assert compiled.values.shape == (len(FIELDS), 2)
+        assert compiled.values.flags.c_contiguous
+        assert compiled.names == ["a", "b"]
+        np.testing.assert_allclose(compiled["loan_to_value"], [0.0, 0.7])
+        np.testing.assert_allclose(compiled["amortization_period"], [30, 30])
+        # Expense growth defaults to rent growth
+        np.testing.assert_allclose(compiled["expense_growth_rate"], [0.03, 0.02])
+    
+    def test_fields_are_zero_copy_views(self, documents):
+        """Test that field arrays and set slices share the compiled block."""
+        compiled = compile_assumptions(documents)
+        column = compiled["exit_cap_rate"]
+        assert np.shares_memory(column, compiled.values)
+        assert column.flags.c_contiguous
+        subset = compiled.select(slice(1, 3))
+        assert np.shares_memory(subset.values, compiled.values)
+        assert subset.names == compiled.names[1:3]
+        assert compiled.select("Moderate").to_dict(0) == compiled.to_dict("Moderate")
+        gathered = compiled.select(["Moderate", 0])
+        assert not np.shares_memory(gathered.values, compiled.values)
+        assert gathered.names == ["Moderate", compiled.names[0]]
+    
+    def test_select_position_bounds(self, documents):
+        """Test that negative positions count from the end and out-of-range ones fail."""
+        compiled = compile_assumptions(documents)
+        count = len(compiled)
+        assert compiled.select(-1).names == [compiled.names[-1]]
+        assert compiled.select(count - 1).names == [compiled.names[-1]]
+        with pytest.raises(IndexError):
+            compiled.select(count)
+        with pytest.raises(IndexError):
+            compiled.select(-count - 1)
+    
+    def test_reverse_mapping(self, documents):
+        """Test mapping positions back to set and field names."""
+        compiled = compile_assumptions(documents)
+        row = compiled.to_dict("Moderate")
+        assert row["exit_cap_rate"] == 0.06
+        assert row["debt_service_coverage"] == 1.20
+        assert compiled.fields[compiled.field_index["vacancy_rate"]] == "vacancy_rate"
+        assert compiled.names[compiled.set_index["Moderate"]] == "Moderate"
+    
+    def test_engine_accepts_columns(self, documents):
+        """Test that compiled columns drive the engine like the source sets."""
+        compiled = compile_assumptions(documents)
+        prices, rents = [8e6, 12e6, 20e6], [9e5, 1.3e6, 2.1e6]
+        np.testing.assert_allclose(project_cash_flows(prices, rents, compiled.columns).levered,
+                                   project_cash_flows(prices, rents, documents).levered)
+    
+    def test_assumption_models(self):
+        """Test sets given as Assumption models."""
+        models = [Assumption(name=name, value=value, category="test") for name, value in (
+            ("Rent Growth Rate", 0.03), ("Expense Ratio", 0.4), ("Vacancy Rate", 0.05),
+            ("Exit Cap Rate", 0.06), ("Holding Period", 5))]
+        compiled = compile_assumptions([models], names=["models"])
+        assert compiled.to_dict("models")["exit_cap_rate"] == 0.06
+    
+    def test_missing_required(self):
+        """Test strict and lenient handling of missing required fields."""
+        with pytest.raises(ValueError, match="Missing required assumption 'rent_growth_rate' in set 'x'"):
+            compile_assumptions([{"name": "x"}])
+        lenient = compile_assumptions([{"name": "x"}], strict=False)
+        assert np.isnan(lenient["exit_cap_rate"][0])
+    
+    def test_invalid_names(self):
+        """Test that names must match the sets and be unique."""
+        with pytest.raises(ValueError, match="unique"):
+            compile_assumptions([{}, {}], names=["a", "a"], strict=False)
+        with pytest.raises(ValueError, match="Expected 2 names"):
+            compile_assumptions([{}, {}], names=["a"], strict=False)
@@ -0,0 +1,79 @@
+"""
+Tests for debt sizing and amortization schedules.
+"""
+
+import pytest
+import numpy as np
+from backend.underwriting.debt import (
+    amortization_schedule,
+    amortizing_payment,
+    clear_schedule_cache,
+    remaining_balance,
+    schedule_cache_info,
+    size_loan,
+)
+
+
+class TestSizeLoan:
+    """Test cases for constrained loan sizing."""
+    
+    def test_minimum_of_ltv_and_dscr(self):
+        """Test that the tighter constraint sets each loan."""
+        sizing = size_loan([10e6, 10e6], [900000, 500000], 0.7, 0.06, 30, 1.25)
+        constant = amortizing_payment(1.0, 0.06, 30) * 12
+        np.testing.assert_allclose(sizing.ltv_proceeds, [7e6, 7e6])
+        np.testing.assert_allclose(sizing.dscr_proceeds, np.array([900000, 500000]) / 1.25 / constant)
+        np.testing.assert_allclose(sizing.loan_amount, [7e6, 500000 / 1.25 / constant])
+        assert sizing.dscr_constrained.tolist() == [False, True]
+        # The DSCR-sized loan is covered exactly 1.25 times
+        debt_service = amortizing_payment(sizing.loan_amount[1], 0.06, 30) * 12
+        assert 500000 / debt_service == pytest.approx(1.25)
+    
+    def test_no_coverage_requirement(self):
+        """Test that a zero DSCR leaves LTV in charge."""
+        sizing = size_loan(10e6, 100000, 0.65, 0.06, 30)
+        assert np.isinf(sizing.dscr_proceeds[0])
+        assert sizing.loan_amount[0] == pytest.approx(6.5e6)
+
+
+class TestAmortizationSchedule:
+    """Test cases for amortization schedules."""
+    
+    def test_schedule_matches_closed_form(self):
+        """Test payments, interest split and balances of a fully amortizing loan."""
+        schedule = amortization_schedule(6.5e6, 0.06, 30)
+        payment = amortizing_payment(6.5e6, 0.06, 30)
+        assert schedule.payment.shape == (1, 360)
+        np.testing.assert_allclose(schedule.payment[0], payment)
+        assert schedule.interest[0, 0] == pytest.approx(6.5e6 * 0.005)
+        np.testing.assert_allclose(schedule.principal.sum(), 6.5e6)
+        assert schedule.balance[0, 35] == pytest.approx(remaining_balance(6.5e6, 0.06, payment, 36))
+        assert schedule.balance[0, -1] == pytest.approx(0.0, abs=1e-4)
+    
+    def test_balloon_and_mixed_terms(self):
+        """Test a balloon loan batched with a shorter loan and a zero rate."""
+        schedule = amortization_schedule([1e6, 120000], [0.05, 0.0], [10, 5], [30, 5])
+        assert schedule.payment.shape == (2, 120)
+        payment = amortizing_payment(1e6, 0.05, 30)
+        assert schedule.balance[0, -1] == pytest.approx(remaining_balance(1e6, 0.05, payment, 120))
+        np.testing.assert_allclose(schedule.payment[1, :60], 2000)
+        assert not schedule.payment[1, 60:].any()
+        assert schedule.interest[1].sum() == 0
+    
+    def test_schedules_are_memoized(self):
+        """Test that loans sharing terms reuse one cached schedule."""
+        clear_schedule_cache()
+        first = amortization_schedule([1e6, 2e6, 3e6], 0.055, 10, 30)
+        info = schedule_cache_info()
+        assert (info.misses, info.hits) == (1, 0)
+        second = amortization_schedule(5e6, 0.055, 10, 30)
+        assert schedule_cache_info().hits == 1
+        np.testing.assert_allclose(second.balance[0], first.balance[0] * 5)
+        # Results are independent copies of the cached arrays
+        second.balance[0, 0] = 0.0
+        assert amortization_schedule(5e6, 0.055, 10, 30).balance[0, 0] > 0
+    
+    def test_invalid_term(self):
+        """Test that fractional months are rejected."""
+        with pytest.raises(ValueError, match="whole number of months"):
+            amortization_schedule(1e6, 0.05, 10.01)
@@ -0,0 +1,132 @@
+"""
+Tests for the vectorized cash-flow engine.
+"""
+
+import pytest
+import json
+from pathlib import Path
+import numpy as np
+from backend.underwriting.engine import (
+    amortizing_payment, assumption_columns, cash_flow_table, flatten_assumptions, project_cash_flows,
+    remaining_balance,
+)
+
+ASSUMPTIONS_DIR = Path(__file__).resolve().parents[2] / "data" / "assumptions"
+
+BASE = {
+    "rent_growth_rate": 0.03,
+    "expense_growth_rate": 0.02,
+    "expense_ratio": 0.40,
+    "vacancy_rate": 0.05,
+    "exit_cap_rate": 0.06,
+    "holding_period": 3,
+}
+
+
+class TestFlattenAssumptions:
+    """Test cases for assumption flattening."""
+    
+    def test_financing_lifted(self):
+        """Test that nested financing values become top-level keys."""
+        flat = flatten_assumptions({"assumptions": {"vacancy_rate": 0.05,
+                                                    "financing": {"loan_to_value": 0.7}}})
+        assert flat == {"vacancy_rate": 0.05, "loan_to_value": 0.7}
+
+    
+    def test_assumption_columns(self):
+        """Test that one set per deal becomes per-deal columns with defaults filled in."""
+        columns = assumption_columns([BASE, {**BASE, "vacancy_rate": 0.08}], 2)
+        np.testing.assert_allclose(columns["vacancy_rate"], [0.05, 0.08])
+        np.testing.assert_allclose(columns["loan_to_value"], [0.0, 0.0])
+        with pytest.raises(ValueError, match="Expected 3 assumption sets"):
+            assumption_columns([BASE, BASE], 3)
+
+
+class TestProjectCashFlows:
+    """Test cases for cash-flow projection."""
+    
+    def test_all_cash_single_deal(self):
+        """Test a hand-checked all-cash projection."""
+        flows = project_cash_flows(10000000, 1000000, BASE)
+        
+        np.testing.assert_allclose(flows.gross_potential_rent[0], [0, 1000000, 1030000, 1060900])
+        np.testing.assert_allclose(flows.effective_gross_income[0, 1], 950000)
+        np.testing.assert_allclose(flows.operating_expenses[0, 1:], 380000 * 1.02 ** np.arange(3))
+        noi_year4 = 1000000 * 1.03 ** 3 * 0.95 - 380000 * 1.02 ** 3
+        np.testing.assert_allclose(flows.reversion[0, 3], noi_year4 / 0.06)
+        np.testing.assert_allclose(flows.unlevered[0, 0], -10000000)
+        np.testing.assert_allclose(flows.levered, flows.unlevered)
+        assert flows.debt_service.sum() == 0
+    
+    def test_financing(self):
+        """Test debt service, equity and loan repayment at exit."""
+        flows = project_cash_flows(10000000, 1000000, {**BASE, "acquisition_costs": 0.02,
+                                                      "financing": {"loan_to_value": 0.65,
+                                                                    "interest_rate": 0.06,
+                                                                    "amortization_period": 30}})
+        payment = amortizing_payment(6500000, 0.06, 30)
+        assert payment == pytest.approx(38970.78, abs=0.01)
+        np.testing.assert_allclose(flows.debt_service[0, 1:], payment * 12)
+        np.testing.assert_allclose(flows.levered[0, 0], -(10200000 - 6500000))
+        balance = remaining_balance(6500000, 0.06, payment, 36)
+        np.testing.assert_allclose(flows.exit_loan_balance, [balance])
+        np.testing.assert_allclose(flows.levered[0, 3], flows.unlevered[0, 3] - payment * 12 - balance)
+    
+    def test_dscr_constrained_loan(self):
+        """Test that the coverage requirement caps the loan below LTV proceeds."""
+        financing = {"loan_to_value": 0.75, "interest_rate": 0.07, "amortization_period": 30}
+        ltv_only = project_cash_flows(10000000, 1000000, {**BASE, "financing": financing})
+        constrained = project_cash_flows(10000000, 1000000, {**BASE, "financing": {
+            **financing, "debt_service_coverage": 1.25}})
+        assert ltv_only.loan_amount[0] == pytest.approx(7500000)
+        assert constrained.loan_amount[0] < ltv_only.loan_amount[0]
+        dscr = constrained.net_operating_income[0, 1] / constrained.debt_service[0, 1]
+        assert dscr == pytest.approx(1.25)
+    
+    def test_zero_interest_loan(self):
+        """Test straight-line amortization at a zero rate."""
+        assert amortizing_payment(120000, 0.0, 10) == pytest.approx(1000)
+        assert remaining_balance(120000, 0.0, 1000, 60) == pytest.approx(60000)
+    
+    def test_batch_matches_single_deals(self):
+        """Test that a mixed-holding-period batch equals per-deal projections."""
+        sets = [json.loads(path.read_text()) for path in sorted(ASSUMPTIONS_DIR.glob("*.json"))]
+        prices, rents = [8e6, 12e6, 20e6], [9e5, 1.3e6, 2.1e6]
+        
+        batch = project_cash_flows(prices, rents, sets)
+        
+        horizon = int(batch.holding_period.max())
+        assert batch.levered.shape == (3, horizon + 1)
+        for deal, assumption_set in enumerate(sets):
+            single = project_cash_flows(prices[deal], rents[deal], assumption_set)
+            years = int(single.holding_period[0]) + 1
+            np.testing.assert_allclose(batch.levered[deal, :years], single.levered[0])
+            np.testing.assert_allclose(batch.net_operating_income[deal, :years], single.net_operating_income[0])
+            assert not batch.levered[deal, years:].any()
+    
+    def test_array_assumptions(self):
+        """Test assumptions given as per-deal arrays."""
+        flows = project_cash_flows([1e7, 1e7], 1e6, {**BASE, "exit_cap_rate": np.array([0.05, 0.06])})
+        assert flows.reversion[0, 3] / flows.reversion[1, 3] == pytest.approx(0.06 / 0.05)
+    
+    def test_cash_flow_table(self):
+        """Test per-year rows for one deal."""
+        rows = cash_flow_table(project_cash_flows(1e7, 1e6, BASE))
+        assert [row["year"] for row in rows] == [0, 1, 2, 3]
+        assert rows[1]["net_operating_income"] == pytest.approx(570000)
+    
+    @pytest.mark.parametrize("assumptions,message", [
+        ({key: value for key, value in BASE.items() if key != "exit_cap_rate"}, "exit_cap_rate"),
+        ({**BASE, "holding_period": 2.5}, "holding_period"),
+        ({**BASE, "holding_period": 0}, "holding_period"),
+        ({**BASE, "vacancy_rate": [0.05, 0.06, 0.07]}, "length"),
+    ])
+    def test_invalid_inputs(self, assumptions, message):
+        """Test validation of assumptions."""
+        with pytest.raises(ValueError, match=message):
+            project_cash_flows([1e7, 1e7], 1e6, assumptions)
+    
+    def test_mismatched_deal_inputs(self):
+        """Test that deal inputs must broadcast together."""
+        with pytest.raises(ValueError):
+            project_cash_flows([1e7, 2e7], [1e6, 2e6, 3e6], BASE)
@@ -0,0 +1,222 @@
+"""
+Tests for the workbook formula engine.
+"""
+
+import datetime
+import pytest
+import openpyxl
+from openpyxl.workbook.defined_name import DefinedName
+from backend.underwriting.formulas import FormulaEngine, DIV0, NA, NAME, REF, VALUE, irr
+
+
+def evaluate(formula, cells=None):
+    """Evaluate a single formula in a one-sheet workbook."""
+    sheet = dict(cells or {})
+    sheet[(100, 1)] = formula
+    return FormulaEngine({"Sheet1": sheet}).get_value("Sheet1!A100")
+
+
+class TestOperators:
+    """Test cases for operator evaluation."""
+    
+    @pytest.mark.parametrize("formula,expected", [
+        ("=2+3*4", 14),
+        ("=(2+3)*4", 20),
+        ("=-2^2", 4),
+        ("=2^3^2", 64),
+        ("=50%", 0.5),
+        ('="Unit "&101', "Unit 101"),
+        ("=1<2", True),
+        ('="abc"="ABC"', True),
+        ("=A1+1", 1),
+        ("=1/0", DIV0),
+        ("=#N/A+1", NA),
+        ('="x"*2', VALUE),
+    ])
+    def test_operators(self, formula, expected):
+        """Test precedence, coercion and error propagation."""
+        assert evaluate(formula) == expected
+    
+    def test_range_arithmetic_uses_top_left(self):
+        """Test implicit intersection when a range is used as a scalar."""
+        assert evaluate("=A1:A2*2", {(1, 1): 3, (2, 1): 5}) == 6
+
+
+class TestFunctions:
+    """Test cases for built-in functions."""
+    
+    def test_aggregates_ignore_text_in_ranges(self):
+        """Test that SUM/AVERAGE/COUNT skip text and blanks inside ranges."""
+        cells = {(1, 1): 10, (2, 1): "n/a", (3, 1): 20, (4, 1): True}
+        assert evaluate("=SUM(A1:A5)", cells) == 30
+        assert evaluate("=AVERAGE(A1:A5)", cells) == 15
+        assert evaluate("=COUNT(A1:A5)", cells) == 2
+        assert evaluate("=MAX(A1:A5,25)", cells) == 25
+        assert evaluate("=SUM(A1:A3,TRUE)", cells) == 31
+    
+    def test_aggregates_ignore_text_in_cell_references(self):
+        """Test that single-cell references count like ranges but literal text does not."""
+        cells = {(1, 1): "n/a", (1, 2): 10, (1, 3): 0.1, (1, 4): "=B1"}
+        assert evaluate("=SUM(A1,B1)", cells) == 10
+        assert evaluate("=AVERAGE(A1,B1,D1)", cells) == 10
+        assert evaluate("=MIN(A1,B1)", cells) == 10
+        assert evaluate("=MAX(A1,B1)", cells) == 10
+        assert evaluate("=NPV(C1,A1,B1)", cells) == pytest.approx(10 / 1.1)
+        assert evaluate('=SUM(B1,"n/a")', cells) == VALUE
+        assert evaluate("=SUM(A1&\"\",B1)", cells) == VALUE
+    
+    def test_if_is_lazy(self):
+        """Test that IF only evaluates the selected branch."""
+        assert evaluate("=IF(1>0,\"yes\",1/0)") == "yes"
+        assert evaluate("=IF(0,1)") is False
+        assert evaluate("=IFERROR(1/0,-1)") == -1
+    
+    def test_financial_functions(self):
+        """Test NPV, PMT and IRR against known values."""
+        assert evaluate("=NPV(0.1,110)") == pytest.approx(100)
+        assert evaluate("=PMT(0.05/12,360,200000)") == pytest.approx(-1073.64, abs=0.01)
+        assert evaluate("=PMT(0,10,1000)") == -100
+        cells = {(1, 1): -1000, (1, 2): 300, (1, 3): 400, (1, 4): 500}
+        rate = evaluate("=IRR(A1:D1)", cells)
+        assert evaluate(f"=NPV({rate},B1:D1)+A1", cells) == pytest.approx(0, abs=1e-6)
+    
+    def test_irr_without_sign_change(self):
+        """Test that IRR returns #NUM! when no rate exists."""
+        assert irr([100, 200]) is None
+        assert evaluate("=IRR(A1:B1)", {(1, 1): 100, (1, 2): 200}).code == "#NUM!"
+    
+    def test_index_match(self):
+        """Test INDEX/MATCH lookups, exact and approximate."""
+        cells = {(1, 1): "Studio", (2, 1): "1x1", (3, 1): "2x2",
+                 (1, 2): 1100, (2, 2): 1350, (3, 2): 1800}
+        assert evaluate('=INDEX(B1:B3,MATCH("2X2",A1:A3,0))', cells) == 1800
+        assert evaluate("=INDEX(A1:B3,2,2)", cells) == 1350
+        assert evaluate("=MATCH(1500,B1:B3)", cells) == 2
+        assert evaluate('=MATCH("3x2",A1:A3,0)', cells) == NA
+        assert evaluate("=INDEX(A1:B3,4,1)", cells).code == "#REF!"
+    
+    def test_unsupported_function(self):
+        """Test that unknown functions evaluate to #NAME? and are reported."""
+        engine = FormulaEngine({"Sheet1": {(1, 1): "=XNPV(0.1,C1:C2,D1:D2)", (1, 2): "=A1+1"}})
+        assert engine.get_value("Sheet1!A1") == NAME
+        assert engine.get_value("Sheet1!B1") == NAME
+        assert engine.unsupported == {("Sheet1", 1, 1): {"XNPV"}}
+
+
+class TestFormulaEngine:
+    """Test cases for dependency tracking and recalculation."""
+    
+    def build(self):
+        sheets = {
+            "Inputs": {(1, 1): 1000000, (2, 1): 0.05, (3, 1): 60000},
+            "Returns": {
+                (1, 1): "=Inputs!A3/exit_cap_rate",
+                (2, 1): "=A1-Inputs!A1",
+                (3, 1): "=Inputs!A3*12",
+            },
+        }
+        return FormulaEngine(sheets, names={"exit_cap_rate": "Inputs!$A$2"})
+    
+    def test_initial_evaluation(self):
+        """Test that all formulas are evaluated on construction."""
+        engine = self.build()
+        assert engine.get_value("Returns!A1") == pytest.approx(1200000)
+        assert engine.get_value("Returns!A2") == pytest.approx(200000)
+        assert engine.get_value("exit_cap_rate") == 0.05
+    
+    def test_incremental_recalculation(self):
+        """Test that only formulas downstream of a change are recalculated."""
+        engine = self.build()
+        engine.set_value("exit_cap_rate", 0.06)
+        assert engine.recalculate() == 2
+        assert engine.get_value("Returns!A2") == pytest.approx(0)
+        assert engine.recalculate() == 0
+        
+        engine.set_value("Inputs!A3", 72000)
+        assert engine.get_value("Returns!A3") == 864000
+        assert engine.get_value("Returns!A1") == pytest.approx(1200000)
+    
+    def test_plan_cache_is_bounded(self):
+        """Test that recalculation plans are evicted least recently used first."""
+        engine = self.build()
+        engine.plan_cache_size = 2
+        for reference in ("Inputs!A1", "Inputs!A2", "Inputs!A1", "Inputs!A3"):
+            engine.set_value(reference, 1)
+            engine.recalculate()
+        assert len(engine._plans) == 2
+        assert [sorted(changed) for changed in engine._plans] == [[("Inputs", 1, 1)], [("Inputs", 3, 1)]]
+    
+    def test_set_formula_cell_rejected(self):
+        """Test that formula cells cannot be overwritten."""
+        engine = self.build()
+        with pytest.raises(ValueError):
+            engine.set_value("Returns!A1", 5)
+        with pytest.raises(ValueError):
+            engine.set_value("missing_name", 5)
+    
+    def test_column_like_defined_name(self):
+        """Test that names such as NOI are not read as whole-column references."""
+        engine = FormulaEngine({"S": {(1, 1): 100, (1, 2): "=NOI*2", (2, 2): "=SUM(A:A)"}},
+                               names={"NOI": "S!$A$1"})
+        assert engine.get_value("S!B1") == 200
+        assert engine.get_value("NOI") == 100
+        engine.set_value("NOI", 150)
+        assert engine.get_value("S!B1") == 300
+        assert engine.get_value("S!B2") == 150
+    
+    def test_date_cells(self):
+        """Test that dates compare and calculate as Excel serial numbers."""
+        engine = FormulaEngine({"S": {
+            (1, 1): datetime.datetime(2024, 1, 1), (1, 2): datetime.datetime(2024, 3, 1),
+            (2, 1): "=IF(A1<B1,1,0)", (2, 2): "=B1-A1", (3, 1): "=A1>45000", (3, 2): "=MAX(A1:B1)",
+            (4, 1): object(), (4, 2): "=A4+1",
+        }})
+        assert engine.get_value("S!A2") == 1
+        assert engine.get_value("S!B2") == 60
+        assert engine.get_value("S!A3") is True
+        assert engine.get_value("S!B3") == 45352
+        assert engine.get_value("S!B4") == VALUE
+    
+    def test_stale_sheet_references(self):
+        """Test that deleted sheets and external links become #REF! only where used."""
+        engine = FormulaEngine({"S": {
+            (1, 1): "=Gone!A1+1", (1, 2): "=[1]Other!A1+1", (1, 3): "='Old Sheet'!B2:C3",
+            (2, 1): 5, (2, 2): "=A2*2", (2, 3): "=IFERROR(A1,0)",
+        }}, names={"stale": "Gone!$A$1"})
+        assert engine.get_value("S!A1") == REF
+        assert engine.get_value("S!B1") == REF
+        assert engine.get_value("S!C1") == REF
+        assert engine.get_value("S!B2") == 10
+        assert engine.get_value("S!C2") == 0
+        assert engine.get_value("stale") == REF
+    
+    def test_circular_reference(self):
+        """Test that circular references are rejected at compile time."""
+        with pytest.raises(ValueError, match="Circular reference"):
+            FormulaEngine({"Sheet1": {(1, 1): "=B1+1", (1, 2): "=A1*2"}})
+    
+    def test_from_xlsx(self, tmp_path):
+        """Test compiling a saved workbook with names and cross-sheet formulas."""
+        workbook = openpyxl.Workbook()
+        inputs = workbook.active
+        inputs.title = "Inputs"
+        inputs["B5"] = 0.05
+        inputs["B6"] = 650000
+        model = workbook.create_sheet("Cash Flow")
+        model["A1"] = "=Inputs!B6/exit_cap_rate"
+        model["A2"] = "=SUM(A1,Inputs!B:B)"
+        workbook.defined_names["exit_cap_rate"] = DefinedName("exit_cap_rate", attr_text="Inputs!$B$5")
+        path = tmp_path / "model.xlsx"
+        workbook.save(path)
+        
+        engine = FormulaEngine.from_xlsx(str(path))
+        
+        assert engine.get_value("'Cash Flow'!A1") == pytest.approx(13000000)
+        engine.set_value("exit_cap_rate", 0.065)
+        assert engine.get_value("'Cash Flow'!A1") == pytest.approx(10000000)
+        assert engine.get_value("'Cash Flow'!A2") == pytest.approx(10000000 + 650000.065)
+    
+    def test_from_xlsx_file_not_found(self):
+        """Test that FileNotFoundError is raised for a missing workbook."""
+        with pytest.raises(FileNotFoundError):
+            FormulaEngine.from_xlsx("nonexistent_file.xlsx")
@@ -0,0 +1,94 @@
+"""
+Tests for the batched goal-seek solver.
+"""
+
+import time
+import pytest
+import numpy as np
+from backend.underwriting.goalseek import goal_seek
+from backend.underwriting.engine import project_cash_flows
+from backend.underwriting.returns import deal_metrics
+
+ASSUMPTIONS = {
+    "rent_growth_rate": 0.03,
+    "expense_ratio": 0.4,
+    "vacancy_rate": 0.05,
+    "exit_cap_rate": 0.06,
+    "holding_period": 5,
+    "financing": {"loan_to_value": 0.65, "interest_rate": 0.055, "amortization_period": 30},
+}
+
+
+def metrics_at(price, gpr=1_200_000, assumptions=ASSUMPTIONS):
+    """Metrics of one deal evaluated directly."""
+    values = deal_metrics(project_cash_flows(price, gpr, assumptions), ["irr", "dscr"])
+    return {name: float(value[0]) for name, value in values.items()}
+
+
+class TestGoalSeek:
+    """Test cases for goal_seek."""
+    
+    def test_max_price_for_target_irr(self):
+        """Test that the solved price hits the IRR target."""
+        result = goal_seek(10_000_000, 1_200_000, ASSUMPTIONS, "purchase_price", {"irr": 0.15}, (1e6, 5e7))
+        assert result.feasible[0]
+        assert result.low[0] == 1e6
+        assert metrics_at(result.high[0])["irr"] == pytest.approx(0.15, abs=1e-5)
+        assert result.solutions["irr"][0] == result.high[0]
+    
+    def test_binding_target_wins(self):
+        """Test that the tighter of IRR and DSCR limits the price."""
+        targets = {"irr": 0.12, "dscr": 1.6}
+        result = goal_seek(10_000_000, 1_200_000, ASSUMPTIONS, "purchase_price", targets, (1e6, 5e7))
+        assert result.high[0] == pytest.approx(min(result.solutions.values())[0])
+        metrics = metrics_at(result.high[0])
+        assert metrics["irr"] >= 0.12 - 1e-5
+        assert metrics["dscr"] == pytest.approx(1.6, abs=1e-5)
+    
+    def test_batch_matches_single_deals(self):
+        """Test a batch of deals against one solve per deal."""
+        rents = np.array([800_000, 1_200_000, 2_000_000])
+        batch = goal_seek(rents * 10, rents, ASSUMPTIONS, "purchase_price", {"irr": 0.15}, (rents * 2, rents * 40))
+        for deal, rent in enumerate(rents):
+            single = goal_seek(rent * 10, rent, ASSUMPTIONS, "purchase_price", {"irr": 0.15}, (rent * 2, rent * 40))
+            assert batch.high[deal] == pytest.approx(single.high[0], rel=1e-5)
+    
+    def test_lower_limit_for_exit_cap(self):
+        """Test a variable whose feasible side is below the crossing."""
+        result = goal_seek(10_000_000, 1_200_000, ASSUMPTIONS, "exit_cap_rate", {"irr": 0.15}, (0.03, 0.12))
+        assert result.low[0] == 0.03
+        solved = dict(ASSUMPTIONS, exit_cap_rate=result.high[0])
+        assert metrics_at(10_000_000, assumptions=solved)["irr"] == pytest.approx(0.15, abs=1e-5)
+    
+    def test_loan_amount(self):
+        """Test solving for an explicit loan amount against a DSCR."""
+        result = goal_seek(10_000_000, 1_200_000, ASSUMPTIONS, "loan_amount", {"dscr": 1.25}, (1e5, 9e6))
+        flows = project_cash_flows(10_000_000, 1_200_000, {
+            **ASSUMPTIONS, "financing": {**ASSUMPTIONS["financing"], "loan_to_value": result.high[0] / 1e7}})
+        assert flows.net_operating_income[0, 1] / flows.debt_service[0, 1] == pytest.approx(1.25, abs=1e-5)
+    
+    def test_infeasible_deal(self):
+        """Test that a target no input can reach is reported as infeasible."""
+        result = goal_seek(10_000_000, [1_200_000, 100_000], ASSUMPTIONS, "purchase_price", {"irr": 0.15},
+                           (9e6, 1.1e7))
+        assert result.feasible.tolist() == [True, False]
+        assert np.isnan(result.high[1])
+    
+    def test_thousand_deal_screen_is_fast(self):
+        """Test that screening 1,000 listings takes seconds at most."""
+        rng = np.random.default_rng(0)
+        rents = rng.uniform(5e5, 3e6, 1000)
+        start = time.perf_counter()
+        result = goal_seek(rents * 10, rents, ASSUMPTIONS, "purchase_price", {"irr": 0.15, "dscr": 1.25},
+                           (rents * 2, rents * 40))
+        assert time.perf_counter() - start < 5.0
+        assert result.feasible.all()
+    
+    def test_invalid_inputs(self):
+        """Test validation of the variable, targets and bounds."""
+        with pytest.raises(ValueError, match="variable"):
+            goal_seek(1e7, 1e6, ASSUMPTIONS, "cap_rate", {"irr": 0.15}, (0.03, 0.1))
+        with pytest.raises(ValueError, match="Unknown metric"):
+            goal_seek(1e7, 1e6, ASSUMPTIONS, "purchase_price", {"npv": 0.0}, (1e6, 2e7))
+        with pytest.raises(ValueError, match="low < high"):
+            goal_seek(1e7, 1e6, ASSUMPTIONS, "purchase_price", {"irr": 0.15}, (2e7, 1e6))
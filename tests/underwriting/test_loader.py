@@ -5,8 +5,12 @@ Tests for the pro-forma loader module.
 import pytest
 import tempfile
 import os
-from unittest.mock import Mock, patch
-from backend.underwriting.loader import parse_proforma
+from unittest.mock import patch
+import numpy as np
+import openpyxl
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from backend.underwriting.loader import load_proforma, parse_proforma
 
 
 class TestParseProforma:
@@ -29,36 +33,183 @@ class TestParseProforma:
         finally:
             os.unlink(tmp_file_path)
     
-    @patch('openpyxl.load_workbook')
-    def test_parse_proforma_success(self, mock_load_workbook):
-        """Test successful parsing of pro-forma file."""
-        # Mock workbook and named ranges
-        mock_workbook = Mock()
-        mock_defined_names = Mock()
-        
-        # Create mock defined names
-        mock_revenue = Mock()
-        mock_revenue.name = "Revenue"
-        mock_expenses = Mock()
-        mock_expenses.name = "Expenses"
-        mock_noi = Mock()
-        mock_noi.name = "NOI"
-        
-        mock_defined_names.definedName = [mock_revenue, mock_expenses, mock_noi]
-        
-        # Mock the range values using a dictionary
-        mock_defined_names.__getitem__ = Mock(side_effect=lambda x: f"value_{x}")
-        mock_workbook.defined_names = mock_defined_names
-        mock_load_workbook.return_value = mock_workbook
-        
-        # Test the function
-        result = parse_proforma("test_file.xlsx")
-        
-        # Verify the result
-        expected = {
-            "Revenue": "value_Revenue",
-            "Expenses": "value_Expenses", 
-            "NOI": "value_NOI"
-        }
-        assert result == expected
-        mock_load_workbook.assert_called_once_with("test_file.xlsx", data_only=True) 
\ No newline at end of file
+    def test_parse_proforma_success(self, tmp_path):
+        """Test that named ranges resolve to scalar and 2D range values."""
+        workbook = openpyxl.Workbook()
+        summary = workbook.active
+        summary.title = "Summary"
+        summary["A1"], summary["B1"] = "Revenue", 1250000
+        summary["A2"], summary["B2"] = "Expenses", 450000.5
+        summary["A3"], summary["B3"] = "Property", "Maple Court"
+        cash_flow = workbook.create_sheet("Cash Flow")
+        for row in range(1, 4):
+            for col in range(1, 6):
+                cash_flow.cell(row=row, column=col, value=row * 100 + col)
+        cash_flow["C2"] = None
+        
+        workbook.defined_names["Revenue"] = DefinedName("Revenue", attr_text="Summary!$B$1")
+        workbook.defined_names["Expenses"] = DefinedName("Expenses", attr_text="Summary!$B$2")
+        workbook.defined_names["Labels"] = DefinedName("Labels", attr_text="Summary!$A$1:$B$3")
+        workbook.defined_names["CashFlows"] = DefinedName("CashFlows", attr_text="'Cash Flow'!$B$1:$D$3")
+        workbook.defined_names["GrowthRate"] = DefinedName("GrowthRate", attr_text="0.03")
+        workbook.defined_names["Broken"] = DefinedName("Broken", attr_text="#REF!")
+        summary.defined_names["Name"] = DefinedName("Name", attr_text="Summary!$B$3")
+        path = tmp_path / "proforma.xlsx"
+        workbook.save(path)
+        
+        result = parse_proforma(str(path))
+        
+        assert result["Revenue"] == 1250000
+        assert result["Expenses"] == 450000.5
+        assert result["GrowthRate"] == 0.03
+        assert result["Summary!Name"] == "Maple Court"
+        assert "Broken" not in result
+        
+        cash_flows = result["CashFlows"]
+        assert isinstance(cash_flows, np.ndarray)
+        assert cash_flows.dtype == np.float64
+        assert cash_flows.shape == (3, 3)
+        np.testing.assert_array_equal(cash_flows[[0, 2]], [[102, 103, 104], [302, 303, 304]])
+        assert cash_flows[1, 0] == 202 and np.isnan(cash_flows[1, 1])
+        
+        labels = result["Labels"]
+        assert labels.dtype == object
+        assert labels.tolist() == [["Revenue", 1250000], ["Expenses", 450000.5], ["Property", "Maple Court"]]
+    
+    def test_parse_proforma_open_ended_and_multi_area_ranges(self, tmp_path):
+        """Test whole-column references and names spanning several areas."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Rates"
+        for row in range(1, 5):
+            sheet.cell(row=row, column=1, value=row / 100)
+        sheet["C1"] = "x"
+        workbook.defined_names["Column"] = DefinedName("Column", attr_text="Rates!$A:$A")
+        workbook.defined_names["Areas"] = DefinedName("Areas", attr_text="Rates!$A$1,Rates!$C$1")
+        path = tmp_path / "rates.xlsx"
+        workbook.save(path)
+        
+        result = parse_proforma(str(path))
+        
+        np.testing.assert_allclose(result["Column"].ravel(), [0.01, 0.02, 0.03, 0.04])
+        assert result["Areas"] == [0.01, "x"]
+    
+    def test_parse_proforma_keeps_trailing_empty_rows(self, tmp_path):
+        """Test that a range extending past the used area keeps its defined shape."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Inputs"
+        sheet["A1"], sheet["B1"], sheet["A2"], sheet["B2"] = 1, 2, 3, 4
+        workbook.defined_names["Block"] = DefinedName("Block", attr_text="Inputs!$A$1:$B$5")
+        workbook.defined_names["Empty"] = DefinedName("Empty", attr_text="Inputs!$D$7:$E$8")
+        path = tmp_path / "inputs.xlsx"
+        workbook.save(path)
+        
+        result = parse_proforma(str(path))
+        
+        assert result["Block"].shape == (5, 2)
+        np.testing.assert_array_equal(result["Block"][:2], [[1, 2], [3, 4]])
+        assert np.isnan(result["Block"][2:]).all()
+        assert result["Empty"].shape == (2, 2)
+    
+    def test_parse_proforma_reads_each_sheet_once(self, tmp_path):
+        """Test that many names on one sheet are resolved in a single pass."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Inputs"
+        for row in range(1, 301):
+            sheet.cell(row=row, column=2, value=row)
+            workbook.defined_names[f"Input{row}"] = DefinedName(f"Input{row}", attr_text=f"Inputs!$B${row}")
+        path = tmp_path / "inputs.xlsx"
+        workbook.save(path)
+        
+        original = ReadOnlyWorksheet.iter_rows
+        with patch.object(ReadOnlyWorksheet, "iter_rows", autospec=True, side_effect=original) as iter_rows:
+            result = parse_proforma(str(path))
+        
+        assert iter_rows.call_count == 1
+        assert [result[f"Input{row}"] for row in range(1, 301)] == list(range(1, 301))
+    
+    def test_parse_proforma_cached(self, tmp_path):
+        """Test that resolved values round-trip through the parse cache."""
+        from backend.etl.cache import ParseCache
+        
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Inputs"
+        sheet["A1"], sheet["A2"], sheet["B1"], sheet["B2"] = 1.5, 2.5, "Class", "A"
+        workbook.defined_names["Rents"] = DefinedName("Rents", attr_text="Inputs!$A$1:$A$2")
+        workbook.defined_names["Grid"] = DefinedName("Grid", attr_text="Inputs!$A$1:$B$2")
+        path = tmp_path / "cached.xlsx"
+        workbook.save(path)
+        cache = ParseCache(str(tmp_path / "cache"))
+        
+        first = parse_proforma(str(path), cache=cache)
+        second = parse_proforma(str(path), cache=cache)
+        
+        assert len(cache) == 1
+        np.testing.assert_array_equal(second["Rents"], first["Rents"])
+        assert second["Grid"].tolist() == [[1.5, "Class"], [2.5, "A"]]
+
+
+class TestLoadProforma:
+    """Test cases for the lazy ProForma handle."""
+    
+    def build(self, tmp_path):
+        workbook = openpyxl.Workbook()
+        summary = workbook.active
+        summary.title = "Summary"
+        summary["B1"], summary["B2"] = 12500000, 875000
+        rent_roll = workbook.create_sheet("Rent Roll")
+        for row in range(1, 201):
+            rent_roll.cell(row=row, column=1, value=1000 + row)
+        workbook.defined_names["PurchasePrice"] = DefinedName("PurchasePrice", attr_text="Summary!$B$1")
+        workbook.defined_names["NOI"] = DefinedName("NOI", attr_text="Summary!$B$2")
+        workbook.defined_names["Rents"] = DefinedName("Rents", attr_text="'Rent Roll'!$A$1:$A$200")
+        workbook.defined_names["CapRate"] = DefinedName("CapRate", attr_text="0.07")
+        path = tmp_path / "deal.xlsx"
+        workbook.save(path)
+        return str(path)
+    
+    def test_open_indexes_without_reading(self, tmp_path):
+        """Test that opening indexes names without materializing ranges."""
+        with patch.object(ReadOnlyWorksheet, "iter_rows", autospec=True) as iter_rows:
+            with load_proforma(self.build(tmp_path)) as proforma:
+                assert list(proforma) == ["PurchasePrice", "NOI", "Rents", "CapRate"]
+                assert "noi" in proforma and "Missing" not in proforma
+                assert proforma.bounds("Rents") == [("Rent Roll", (1, 1, 1, 200))]
+                assert proforma.materialized == ["CapRate"]
+        iter_rows.assert_not_called()
+    
+    def test_access_materializes_once(self, tmp_path):
+        """Test that a range is read on first access and memoized."""
+        original = ReadOnlyWorksheet.iter_rows
+        with load_proforma(self.build(tmp_path)) as proforma:
+            with patch.object(ReadOnlyWorksheet, "iter_rows", autospec=True, side_effect=original) as iter_rows:
+                assert proforma["noi"] == 875000
+                assert proforma["NOI"] == 875000
+                assert iter_rows.call_count == 1
+            assert proforma.materialized == ["NOI", "CapRate"]
+            
+            rents = proforma["Rents"]
+            assert rents.shape == (200, 1)
+            assert rents[-1, 0] == 1200
+        
+        assert proforma["Rents"] is rents
+        with pytest.raises(ValueError):
+            proforma["PurchasePrice"]
+    
+    def test_prefetch_matches_parse_proforma(self, tmp_path):
+        """Test that prefetching everything gives the parse_proforma result."""
+        path = self.build(tmp_path)
+        with load_proforma(path) as proforma:
+            values = proforma.prefetch(["PurchasePrice", "CapRate"])
+            assert values == {"PurchasePrice": 12500000, "CapRate": 0.07}
+            with pytest.raises(KeyError):
+                proforma.prefetch(["Missing"])
+            assert set(dict(proforma)) == set(parse_proforma(path))
+    
+    def test_load_proforma_file_not_found(self):
+        """Test that FileNotFoundError is raised for non-existent file."""
+        with pytest.raises(FileNotFoundError):
+            load_proforma("nonexistent_file.xlsx")
@@ -0,0 +1,149 @@
+"""
+Tests for Monte Carlo simulation over uncertain assumptions.
+"""
+
+import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from backend.underwriting import montecarlo
+from backend.underwriting.assumptions.models import Assumption
+from backend.underwriting.engine import project_cash_flows
+from backend.underwriting.montecarlo import (
+    UncertainAssumption,
+    run_monte_carlo,
+    uncertain_from_assumption,
+)
+from backend.underwriting.returns import irr
+
+BASE = {
+    "rent_growth_rate": 0.03,
+    "expense_ratio": 0.4,
+    "vacancy_rate": 0.05,
+    "exit_cap_rate": 0.06,
+    "holding_period": 5,
+    "financing": {"loan_to_value": 0.65, "interest_rate": 0.055, "amortization_period": 30},
+}
+
+UNCERTAIN = [
+    UncertainAssumption("rent_growth_rate", 0.03, 0.01),
+    UncertainAssumption("exit_cap_rate", 0.06, 0.005, 0.005),
+    UncertainAssumption("vacancy_rate", 0.05, 0.015, 0.0, 1.0),
+    UncertainAssumption("interest_rate", 0.055, 0.005, 0.0),
+]
+
+
+class TestUncertainFromAssumption:
+    """Test cases for deriving distributions from assumptions."""
+    
+    def test_confidence_sets_spread(self):
+        """Test that higher confidence gives a narrower distribution."""
+        low = Assumption(name="Exit Cap Rate", value=0.06, category="exit", confidence_level=0.5)
+        high = Assumption(name="Exit Cap Rate", value=0.06, category="exit", confidence_level=0.95)
+        wide, narrow = uncertain_from_assumption(low), uncertain_from_assumption(high)
+        assert wide.name == "exit_cap_rate"
+        assert wide.mean == 0.06
+        assert wide.std > narrow.std > 0
+        # 95% confidence of being within +/-10% -> 0.006 is 1.96 standard deviations
+        assert narrow.std == pytest.approx(0.006 / 1.959964, rel=1e-5)
+        assert narrow.lower == 0.005
+    
+    def test_missing_confidence_is_certain(self):
+        """Test that an assumption without a confidence level has no spread."""
+        assumption = Assumption(name="Vacancy", value=0.05, category="revenue")
+        result = uncertain_from_assumption(assumption, key="vacancy_rate")
+        assert result.name == "vacancy_rate"
+        assert result.std == 0.0
+        assert (result.lower, result.upper) == (0.0, 1.0)
+
+
+class TestRunMonteCarlo:
+    """Test cases for run_monte_carlo."""
+    
+    def test_reproducible_from_seed(self):
+        """Test that the same seed reproduces results and another seed differs."""
+        first = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=5000, seed=3,
+                                chunk_size=1000, max_workers=1)
+        again = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=5000, seed=3,
+                                chunk_size=1000, max_workers=1)
+        other = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=5000, seed=4,
+                                chunk_size=1000, max_workers=1)
+        assert first.irr.percentiles == again.irr.percentiles
+        np.testing.assert_array_equal(first.irr.counts, again.irr.counts)
+        assert first.irr.percentiles != other.irr.percentiles
+    
+    def test_summaries_cover_all_trials(self):
+        """Test histogram totals, percentile ordering and the mean."""
+        result = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=2500, seed=1,
+                                 chunk_size=1000, max_workers=1)
+        assert result.trials == 2500
+        total = result.irr.counts.sum() + result.irr.underflow + result.irr.overflow
+        assert total + result.no_irr == 2500
+        values = [result.irr.percentiles[p] for p in sorted(result.irr.percentiles)]
+        assert values == sorted(values)
+        assert result.irr.percentiles[5] < result.irr.mean < result.irr.percentiles[95]
+        assert result.equity_multiple.percentiles[50] > 1.0
+    
+    def test_zero_spread_matches_deterministic_projection(self):
+        """Test that certain assumptions reproduce the single-deal IRR."""
+        certain = [UncertainAssumption("exit_cap_rate", 0.06, 0.0)]
+        result = run_monte_carlo(10_000_000, 1_200_000, BASE, certain, trials=100, seed=0, max_workers=1)
+        expected = irr(project_cash_flows(10_000_000, 1_200_000, BASE).levered).rate[0]
+        assert result.irr.mean == pytest.approx(expected)
+        assert result.irr.std == pytest.approx(0.0, abs=1e-6)
+        # Percentiles come from the histogram, so they are exact to one bin (0.25%)
+        assert result.irr.percentiles[50] == pytest.approx(expected, abs=0.0025)
+    
+    def test_correlation_is_applied(self):
+        """Test that positively correlated exit cap and interest rates widen the IRR spread."""
+        pair = [UNCERTAIN[1], UNCERTAIN[3]]
+        independent = run_monte_carlo(10_000_000, 1_200_000, BASE, pair, trials=20_000, seed=5, max_workers=1)
+        correlated = run_monte_carlo(10_000_000, 1_200_000, BASE, pair, [[1.0, 0.9], [0.9, 1.0]],
+                                     trials=20_000, seed=5, max_workers=1)
+        assert correlated.irr.std > independent.irr.std
+    
+    def test_worker_count_does_not_change_results(self):
+        """Test that a process pool gives the same results as a serial run."""
+        serial = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=4000, seed=9,
+                                 chunk_size=1000, max_workers=1)
+        pooled = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=4000, seed=9,
+                                 chunk_size=1000, max_workers=2)
+        assert serial.irr.percentiles == pooled.irr.percentiles
+        np.testing.assert_array_equal(serial.equity_multiple.counts, pooled.equity_multiple.counts)
+    
+    def test_chunks_in_flight_are_bounded(self):
+        """Test that chunks are submitted lazily, at most two per worker at a time."""
+        in_flight, peak = [0], [0]
+        
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+                return super().submit(fn, *args)
+        
+        original = montecarlo._accumulate
+        
+        def accumulate(totals, part):
+            in_flight[0] -= 1
+            return original(totals, part)
+        
+        with patch.object(montecarlo, "ProcessPoolExecutor", CountingExecutor), \
+                patch.object(montecarlo, "_accumulate", side_effect=accumulate):
+            pooled = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=5000, seed=9,
+                                     chunk_size=250, max_workers=2)
+        serial = run_monte_carlo(10_000_000, 1_200_000, BASE, UNCERTAIN, trials=5000, seed=9,
+                                 chunk_size=250, max_workers=1)
+        assert peak[0] <= 4
+        assert pooled.irr.percentiles == serial.irr.percentiles
+        assert sum(pooled.irr.counts) + pooled.irr.underflow + pooled.irr.overflow + pooled.no_irr == 5000
+    
+    def test_invalid_inputs(self):
+        """Test validation of arguments and correlation matrices."""
+        with pytest.raises(ValueError, match="Unknown assumption"):
+            run_monte_carlo(1.0, 1.0, BASE, [UncertainAssumption("cap_rate", 0.06, 0.01)])
+        with pytest.raises(ValueError, match="positive definite"):
+            run_monte_carlo(1.0, 1.0, BASE, UNCERTAIN[:2], [[1.0, 1.5], [1.5, 1.0]])
+        with pytest.raises(ValueError, match="unit diagonal"):
+            run_monte_carlo(1.0, 1.0, BASE, UNCERTAIN[:2], [[2.0, 0.0], [0.0, 1.0]])
+        with pytest.raises(ValueError, match="trials"):
+            run_monte_carlo(1.0, 1.0, BASE, UNCERTAIN, trials=0)
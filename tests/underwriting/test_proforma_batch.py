@@ -0,0 +1,103 @@
+"""
+Tests for bulk pro-forma loading.
+"""
+
+import pytest
+import multiprocessing
+import os
+import time
+import openpyxl
+from openpyxl.workbook.defined_name import DefinedName
+from backend.underwriting import batch
+from backend.underwriting.batch import find_proformas, load_many, summarize_proforma
+
+requires_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                   reason="patches module state inherited by forked workers")
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Create a pipeline folder with valid, broken and lock-file workbooks."""
+    for index in range(3):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Summary"
+        sheet["B1"], sheet["B2"] = 10000000 + index, 600000 + index
+        workbook.defined_names["PurchasePrice"] = DefinedName("PurchasePrice", attr_text="Summary!$B$1")
+        workbook.defined_names["NOI"] = DefinedName("NOI", attr_text="Summary!$B$2")
+        workbook.save(tmp_path / f"deal_{index}.xlsx")
+    (tmp_path / "broker").mkdir()
+    (tmp_path / "broker" / "corrupt.xlsx").write_bytes(b"not an excel file")
+    (tmp_path / "~$deal_0.xlsx").write_bytes(b"lock")
+    (tmp_path / "notes.txt").write_text("hello")
+    return tmp_path
+
+
+class TestFindProformas:
+    """Test cases for source resolution."""
+    
+    def test_directory(self, pipeline):
+        """Test recursive directory search that skips lock and non-workbook files."""
+        paths = find_proformas(pipeline)
+        assert [os.path.relpath(path, pipeline) for path in paths] == [
+            os.path.join("broker", "corrupt.xlsx"), "deal_0.xlsx", "deal_1.xlsx", "deal_2.xlsx"]
+    
+    def test_glob(self, pipeline):
+        """Test glob patterns."""
+        assert len(find_proformas(str(pipeline / "deal_*.xlsx"))) == 3
+        assert len(find_proformas(str(pipeline / "**" / "*.xlsx"))) == 4
+
+
+class TestLoadMany:
+    """Test cases for bulk loading."""
+    
+    def test_summarize_selected_names(self, pipeline):
+        """Test that only requested names are read and unknown ones are reported."""
+        summary = summarize_proforma(str(pipeline / "deal_1.xlsx"), ["NOI", "ExitCap"])
+        assert summary.ok
+        assert summary.values == {"NOI": 600001}
+        assert summary.missing == ["ExitCap"]
+        assert summary.seconds >= 0
+    
+    def test_load_directory(self, pipeline):
+        """Test that every workbook yields a summary and failures are isolated."""
+        summaries = {os.path.basename(s.path): s for s in load_many(pipeline, names=["PurchasePrice"],
+                                                                   max_workers=2)}
+        
+        assert set(summaries) == {"deal_0.xlsx", "deal_1.xlsx", "deal_2.xlsx", "corrupt.xlsx"}
+        assert summaries["deal_2.xlsx"].values == {"PurchasePrice": 10000002}
+        assert not summaries["corrupt.xlsx"].ok
+        assert "Invalid Excel file" in summaries["corrupt.xlsx"].error
+    
+    @requires_fork
+    def test_timeout_kills_worker(self, pipeline, monkeypatch):
+        """Test that a workbook exceeding the timeout is killed without stalling the batch."""
+        original = batch.summarize_proforma
+        
+        def slow(path, names=None):
+            if path.endswith("deal_0.xlsx"):
+                time.sleep(30)
+            return original(path, names)
+        
+        monkeypatch.setattr(batch, "summarize_proforma", slow)
+        start = time.perf_counter()
+        summaries = {os.path.basename(s.path): s for s in load_many(str(pipeline / "deal_*.xlsx"),
+                                                                   max_workers=2, timeout=1.0)}
+        
+        assert time.perf_counter() - start < 10
+        assert summaries["deal_0.xlsx"].error == "Timed out after 1 seconds"
+        assert summaries["deal_1.xlsx"].ok and summaries["deal_2.xlsx"].ok
+    
+    @requires_fork
+    def test_worker_crash(self, pipeline, monkeypatch):
+        """Test that a worker dying without a result is reported per file."""
+        monkeypatch.setattr(batch, "summarize_proforma", lambda path, names=None: os._exit(3))
+        summaries = list(load_many([str(pipeline / "deal_0.xlsx")]))
+        assert summaries[0].error == "Worker exited with code 3"
+    
+    def test_invalid_arguments(self, pipeline):
+        """Test validation of max_workers and timeout."""
+        with pytest.raises(ValueError):
+            list(load_many(pipeline, max_workers=0))
+        with pytest.raises(ValueError):
+            list(load_many(pipeline, timeout=0))
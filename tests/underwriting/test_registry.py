@@ -0,0 +1,160 @@
+"""
+Tests for the cached assumption-set registry.
+"""
+
+import json
+import os
+import pytest
+from unittest.mock import patch
+from backend.underwriting.assumptions.registry import AssumptionRegistry, get_registry, thaw
+
+
+@pytest.fixture
+def assumptions_dir(tmp_path):
+    """Directory with two assumption sets."""
+    for name, vacancy in (("conservative", 0.06), ("aggressive", 0.03)):
+        (tmp_path / f"{name}.json").write_text(json.dumps({
+            "name": name.title(),
+            "assumptions": {"vacancy_rate": vacancy, "financing": {"loan_to_value": 0.7}},
+            "tags": ["base"],
+        }))
+    return tmp_path
+
+
+def rewrite(path, content):
+    """Write a file and move its mtime forward so the change is always visible."""
+    path.write_text(json.dumps(content))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestAssumptionRegistry:
+    """Test cases for AssumptionRegistry."""
+    
+    def test_parses_once(self, assumptions_dir):
+        """Test that repeated loads share one parsed view."""
+        registry = AssumptionRegistry(assumptions_dir, poll_interval=0)
+        with patch("backend.underwriting.assumptions.registry.json.loads", wraps=json.loads) as load:
+            first = registry.get("conservative")
+            second = registry.get("conservative")
+        assert first is second
+        assert load.call_count == 1
+        assert first["assumptions"]["vacancy_rate"] == 0.06
+    
+    def test_views_are_read_only(self, assumptions_dir):
+        """Test that cached sets cannot be modified by callers."""
+        view = AssumptionRegistry(assumptions_dir).get("conservative")
+        with pytest.raises(TypeError):
+            view["name"] = "Changed"
+        with pytest.raises(TypeError):
+            view["assumptions"]["financing"]["loan_to_value"] = 0.9
+        assert view["tags"] == ("base",)
+        copy = thaw(view)
+        copy["assumptions"]["vacancy_rate"] = 0.1
+        assert view["assumptions"]["vacancy_rate"] == 0.06
+        assert copy["tags"] == ["base"]
+    
+    def test_edits_are_picked_up(self, assumptions_dir):
+        """Test mtime invalidation and deletion."""
+        registry = AssumptionRegistry(assumptions_dir, poll_interval=0)
+        assert registry.get("aggressive")["assumptions"]["vacancy_rate"] == 0.03
+        rewrite(assumptions_dir / "aggressive.json", {"name": "Aggressive", "assumptions": {"vacancy_rate": 0.02}})
+        assert registry.get("aggressive")["assumptions"]["vacancy_rate"] == 0.02
+        (assumptions_dir / "aggressive.json").unlink()
+        with pytest.raises(ValueError, match="Assumption set 'aggressive' not found"):
+            registry.get("aggressive")
+    
+    def test_poll_interval_defers_checks(self, assumptions_dir):
+        """Test that files are not re-checked within the poll interval."""
+        registry = AssumptionRegistry(assumptions_dir, poll_interval=3600)
+        registry.get("aggressive")
+        rewrite(assumptions_dir / "aggressive.json", {"name": "Edited"})
+        assert registry.get("aggressive")["name"] == "Aggressive"
+        registry.invalidate("aggressive")
+        assert registry.get("aggressive")["name"] == "Edited"
+    
+    def test_names_follow_directory(self, assumptions_dir):
+        """Test that added files appear in the listing."""
+        registry = AssumptionRegistry(assumptions_dir)
+        assert registry.names() == ["aggressive", "conservative"]
+        (assumptions_dir / "moderate.json").write_text("{}")
+        stat = assumptions_dir.stat()
+        os.utime(assumptions_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert registry.names() == ["aggressive", "conservative", "moderate"]
+        assert AssumptionRegistry(assumptions_dir / "missing").names() == []
+    
+    def test_warm_reports_errors(self, assumptions_dir):
+        """Test that warming loads valid sets and reports invalid ones."""
+        (assumptions_dir / "broken.json").write_text("{ invalid json")
+        registry = AssumptionRegistry(assumptions_dir)
+        results = registry.warm()
+        assert results["conservative"] is None
+        assert "Invalid JSON in assumption set 'broken'" in results["broken"]
+    
+    def test_shared_registry_per_directory(self, assumptions_dir):
+        """Test that get_registry returns one registry per directory."""
+        assert get_registry(assumptions_dir) is get_registry(str(assumptions_dir))
+
+
+class TestInheritance:
+    """Test cases for assumption sets that extend a parent."""
+    
+    @pytest.fixture
+    def layered_dir(self, assumptions_dir):
+        """Market and deal layers on top of the conservative set."""
+        (assumptions_dir / "austin.json").write_text(json.dumps({
+            "name": "Austin",
+            "extends": "conservative",
+            "assumptions": {"rent_growth_rate": 0.04, "financing": {"interest_rate": 0.06}},
+        }))
+        (assumptions_dir / "deal_42.json").write_text(json.dumps({
+            "name": "Deal 42",
+            "extends": "austin",
+            "assumptions": {"vacancy_rate": 0.08},
+            "tags": ["deal"],
+        }))
+        return assumptions_dir
+    
+    def test_overlay_merges_nested_values(self, layered_dir):
+        """Test that each layer overrides its parent and nested dicts merge."""
+        resolved = AssumptionRegistry(layered_dir).resolve("deal_42")
+        assert resolved["name"] == "Deal 42"
+        assert "extends" not in resolved
+        assert resolved["assumptions"]["vacancy_rate"] == 0.08
+        assert resolved["assumptions"]["rent_growth_rate"] == 0.04
+        assert dict(resolved["assumptions"]["financing"]) == {"loan_to_value": 0.7, "interest_rate": 0.06}
+        assert resolved["tags"] == ("deal",)
+        with pytest.raises(TypeError):
+            resolved["assumptions"]["vacancy_rate"] = 0.1
+    
+    def test_resolution_is_memoized(self, layered_dir):
+        """Test that unchanged chains return the same resolved object."""
+        registry = AssumptionRegistry(layered_dir, poll_interval=0)
+        first = registry.resolve("deal_42")
+        assert registry.resolve("deal_42") is first
+        # A set without a parent is its own file view
+        assert registry.resolve("conservative") is registry.get("conservative")
+    
+    def test_ancestor_change_invalidates(self, layered_dir):
+        """Test that editing a grandparent changes the resolved set."""
+        registry = AssumptionRegistry(layered_dir, poll_interval=0)
+        first = registry.resolve("deal_42")
+        rewrite(layered_dir / "conservative.json", {
+            "name": "Conservative", "assumptions": {"expense_ratio": 0.5, "financing": {"loan_to_value": 0.6}}})
+        second = registry.resolve("deal_42")
+        assert second is not first
+        assert second["assumptions"]["expense_ratio"] == 0.5
+        assert second["assumptions"]["financing"]["loan_to_value"] == 0.6
+    
+    def test_circular_chain(self, assumptions_dir):
+        """Test that a cycle in the chain is reported."""
+        (assumptions_dir / "a.json").write_text(json.dumps({"extends": "b"}))
+        (assumptions_dir / "b.json").write_text(json.dumps({"extends": "a"}))
+        with pytest.raises(ValueError, match="Circular 'extends' chain: a -> b -> a"):
+            AssumptionRegistry(assumptions_dir).resolve("a")
+    
+    def test_missing_parent(self, assumptions_dir):
+        """Test that a missing parent is reported."""
+        (assumptions_dir / "orphan.json").write_text(json.dumps({"extends": "nowhere"}))
+        with pytest.raises(ValueError, match="Assumption set 'nowhere' not found"):
+            AssumptionRegistry(assumptions_dir).resolve("orphan")
@@ -0,0 +1,81 @@
+"""
+Tests for batched NPV and IRR.
+"""
+
+import pytest
+import numpy as np
+from backend.underwriting.engine import project_cash_flows
+from backend.underwriting.returns import irr, npv, npv_matrix
+
+
+class TestNPV:
+    """Test cases for NPV."""
+    
+    def test_npv_per_row_rate(self):
+        """Test NPV with a scalar and with per-row rates."""
+        flows = np.array([[-100.0, 110.0], [-100.0, 121.0]])
+        np.testing.assert_allclose(npv(flows, 0.1), [0.0, 10.0], atol=1e-9)
+        np.testing.assert_allclose(npv(flows, [0.1, 0.21]), [0.0, 0.0], atol=1e-12)
+    
+    def test_npv_matrix(self):
+        """Test that the matrix form matches row-by-row NPV."""
+        rng = np.random.default_rng(0)
+        flows = rng.normal(size=(50, 8))
+        rates = np.linspace(0.0, 0.2, 7)
+        matrix = npv_matrix(flows, rates)
+        assert matrix.shape == (50, 7)
+        for column, rate in enumerate(rates):
+            np.testing.assert_allclose(matrix[:, column], npv(flows, rate))
+
+
+class TestIRR:
+    """Test cases for the batched IRR solver."""
+    
+    def test_known_rates(self):
+        """Test rows with known IRRs, including zero padding and a zero rate."""
+        flows = np.array([
+            [-100.0, 110.0, 0.0, 0.0],
+            [-100.0, 0.0, 121.0, 0.0],
+            [-100.0, 100.0, 0.0, 0.0],
+            [-1000.0, 300.0, 400.0, 500.0],
+        ])
+        result = irr(flows)
+        np.testing.assert_allclose(result.rate[:3], [0.1, 0.1, 0.0], atol=1e-9)
+        assert npv(flows[3], result.rate[3])[0] == pytest.approx(0, abs=1e-6)
+        assert result.converged.all()
+        assert not result.multiple_roots.any()
+    
+    def test_no_sign_change(self):
+        """Test that rows without both inflows and outflows have no IRR."""
+        result = irr(np.array([[100.0, 200.0], [-100.0, -5.0], [0.0, 0.0]]))
+        assert np.isnan(result.rate).all()
+        assert not result.converged.any()
+    
+    def test_multiple_roots_flagged(self):
+        """Test that a row with two IRRs (10% and 20%) is flagged and the guess selects the root."""
+        flows = np.array([[-100.0, 230.0, -132.0]])
+        assert irr(flows).multiple_roots[0]
+        assert irr(flows, guess=0.05).rate[0] == pytest.approx(0.1)
+        assert irr(flows, guess=0.25).rate[0] == pytest.approx(0.2)
+    
+    def test_batch_of_engine_deals(self):
+        """Test that every row of a mixed-holding-period batch solves."""
+        rng = np.random.default_rng(1)
+        deals = 500
+        prices = rng.uniform(5e6, 5e7, deals)
+        flows = project_cash_flows(
+            prices, prices * rng.uniform(0.08, 0.12, deals),
+            {"rent_growth_rate": 0.03, "expense_ratio": 0.4, "vacancy_rate": 0.05,
+             "exit_cap_rate": rng.uniform(0.05, 0.07, deals), "holding_period": rng.integers(3, 11, deals),
+             "financing": {"loan_to_value": 0.65, "interest_rate": 0.06, "amortization_period": 30}},
+        ).levered
+        result = irr(flows)
+        assert result.converged.all()
+        residual = npv(flows, result.rate) / np.abs(flows).max(axis=1)
+        assert np.abs(residual).max() < 1e-8
+    
+    def test_single_vector(self):
+        """Test a 1D cash-flow vector."""
+        result = irr([-100.0, 50.0, 60.0])
+        assert result.rate.shape == (1,)
+        assert result.converged[0]
@@ -0,0 +1,187 @@
+"""
+Tests for the versioned assumption store.
+"""
+
+import json
+import os
+import pytest
+from unittest.mock import patch
+from backend.underwriting.assumptions import service
+from backend.underwriting.assumptions.registry import get_registry, thaw
+from backend.underwriting.assumptions.store import VersionedStore, apply_delta, content_hash, diff
+
+
+def version_content(index):
+    """Assumption set whose values change with ``index``."""
+    return {
+        "name": "Deal",
+        "assumptions": {
+            "vacancy_rate": 0.05 + index / 1000,
+            "financing": {"loan_to_value": 0.7, "interest_rate": 0.06},
+        },
+        "tags": ["deal", str(index)],
+    }
+
+
+class TestDelta:
+    """Test cases for diff and apply_delta."""
+    
+    def test_round_trip(self):
+        """Test that applying a diff reproduces the new content."""
+        old = {"a": 1, "b": {"c": 2, "d": 3}, "e": [1, 2]}
+        new = {"a": 1, "b": {"c": 4}, "e": [1, 2, 3], "f": True}
+        delta = diff(old, new)
+        assert delta["unset"] == [["b", "d"]]
+        assert sorted(path for path, _ in delta["set"]) == [["b", "c"], ["e"], ["f"]]
+        assert apply_delta(thaw(old), delta) == new
+    
+    def test_type_change_is_recorded(self):
+        """Test that 1 -> 1.0 is a change, since it changes the content hash."""
+        delta = diff({"a": 1}, {"a": 1.0})
+        assert delta["set"] == [[["a"], 1.0]]
+    
+    def test_hash_ignores_key_order(self):
+        """Test that content hashes are canonical."""
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+
+class TestVersionedStore:
+    """Test cases for VersionedStore."""
+    
+    def test_commit_and_load(self, tmp_path):
+        """Test that every committed version can be reconstructed."""
+        store = VersionedStore(tmp_path, snapshot_interval=4)
+        versions = [store.commit("deal", version_content(index)) for index in range(10)]
+        fresh = VersionedStore(tmp_path, snapshot_interval=4)
+        for index, version in enumerate(versions):
+            assert thaw(fresh.load(version)) == version_content(index)
+            assert version == content_hash(version_content(index))
+    
+    def test_deltas_and_snapshots(self, tmp_path):
+        """Test that versions are deltas with a full snapshot every interval."""
+        store = VersionedStore(tmp_path, snapshot_interval=4)
+        versions = [store.commit("deal", version_content(index)) for index in range(9)]
+        kinds = [store._read_object(version)["type"] for version in versions]
+        assert kinds == ["snapshot", "delta", "delta", "delta"] * 2 + ["snapshot"]
+        delta = store._read_object(versions[1])
+        assert delta["parent"] == versions[0]
+        assert "content" not in delta
+    
+    def test_reconstruction_is_bounded(self, tmp_path):
+        """Test that loading reads at most one snapshot interval of objects."""
+        store = VersionedStore(tmp_path, snapshot_interval=4)
+        versions = [store.commit("deal", version_content(index)) for index in range(20)]
+        fresh = VersionedStore(tmp_path, snapshot_interval=4)
+        with patch.object(fresh, "_read_object", wraps=fresh._read_object) as read:
+            fresh.load(versions[-1])
+        assert read.call_count <= 4
+    
+    def test_unchanged_content_is_not_recorded(self, tmp_path):
+        """Test that committing the head again is a no-op."""
+        store = VersionedStore(tmp_path)
+        first = store.commit("deal", version_content(0))
+        assert store.commit("deal", version_content(0)) == first
+        assert len(store.history("deal")) == 1
+    
+    def test_reverted_content_shares_its_object(self, tmp_path):
+        """Test that identical content is stored once and keeps its version id."""
+        store = VersionedStore(tmp_path)
+        first = store.commit("deal", version_content(0))
+        store.commit("deal", version_content(1))
+        assert store.commit("deal", version_content(0), message="revert") == first
+        history = store.history("deal")
+        assert [entry.version for entry in history] == [first, history[1].version, first]
+        assert history[-1].message == "revert"
+        assert len(list((tmp_path / "objects").rglob("*.json"))) == 2
+    
+    def test_resolve_version(self, tmp_path):
+        """Test version references by id, prefix and position."""
+        store = VersionedStore(tmp_path)
+        versions = [store.commit("deal", version_content(index)) for index in range(3)]
+        assert store.resolve_version("deal") == versions[-1]
+        assert store.resolve_version("deal", 0) == versions[0]
+        assert store.resolve_version("deal", -2) == versions[1]
+        assert store.resolve_version("deal", versions[1][:12]) == versions[1]
+        with pytest.raises(ValueError, match="not found"):
+            store.resolve_version("deal", "ffffffffffff")
+        with pytest.raises(ValueError, match="no version"):
+            store.resolve_version("deal", 5)
+        with pytest.raises(ValueError, match="no recorded versions"):
+            store.resolve_version("other")
+    
+    def test_lru_cache(self, tmp_path):
+        """Test that historical reads are cached and evicted least recently used first."""
+        store = VersionedStore(tmp_path, cache_size=2)
+        versions = [store.commit("deal", version_content(index)) for index in range(3)]
+        store._cache.clear()
+        first = store.load(versions[0])
+        assert store.load(versions[0]) is first
+        store.load(versions[1])
+        store.load(versions[0])
+        store.load(versions[2])
+        assert store.cached_versions() == [versions[0], versions[2]]
+    
+    def test_history_parsed_once_per_change(self, tmp_path):
+        """Test that the refs file is only re-parsed after it changes."""
+        store = VersionedStore(tmp_path)
+        store.commit("deal", version_content(0))
+        with patch("backend.underwriting.assumptions.store.json.loads", wraps=json.loads) as loads:
+            store.resolve_version("deal")
+            store.resolve_version("deal", 0)
+            store.commit("deal", version_content(0))
+        assert loads.call_count == 1
+        store.commit("deal", version_content(1))
+        assert len(store.history("deal")) == 2
+    
+    def test_failed_write_keeps_original_error(self, tmp_path):
+        """Test that cleanup after a failed write does not mask the error."""
+        store = VersionedStore(tmp_path)
+        replace = os.replace
+        
+        def replace_then_fail(source, destination):
+            replace(source, destination)
+            raise OSError("disk full")
+        
+        with patch("backend.underwriting.assumptions.store.os.replace", side_effect=replace_then_fail):
+            with pytest.raises(OSError, match="disk full"):
+                store.commit("deal", version_content(0))
+    
+    def test_corrupt_object(self, tmp_path):
+        """Test that a version failing its hash check is rejected."""
+        store = VersionedStore(tmp_path)
+        version = store.commit("deal", version_content(0))
+        path = store._object_path(version)
+        record = json.loads(path.read_text())
+        record["content"]["name"] = "Tampered"
+        path.write_text(json.dumps(record))
+        with pytest.raises(ValueError, match="corrupt"):
+            VersionedStore(tmp_path).load(version)
+
+
+class TestServiceVersions:
+    """Test cases for versioned reads through the assumption service."""
+    
+    @pytest.fixture
+    def assumptions_dir(self, tmp_path):
+        """Assumptions directory the service reads from."""
+        (tmp_path / "deal.json").write_text(json.dumps(version_content(0)))
+        with patch.object(service, "_assumptions_dir", return_value=tmp_path):
+            yield tmp_path
+    
+    def test_load_recorded_versions(self, assumptions_dir):
+        """Test that recorded versions stay loadable after the file changes."""
+        first = service.record_assumptions("deal", message="IC memo")
+        (assumptions_dir / "deal.json").write_text(json.dumps(version_content(1)))
+        get_registry(assumptions_dir).invalidate()
+        second = service.record_assumptions("deal")
+        assert first != second
+        assert thaw(service.load_assumptions("deal", version=first)) == version_content(0)
+        assert thaw(service.load_assumptions("deal", version=0)) == version_content(0)
+        assert thaw(service.load_assumptions("deal")) == version_content(1)
+        assert [entry.message for entry in service.assumption_history("deal")] == ["IC memo", None]
+        assert service.list_assumption_sets() == ["deal"]
+    
+    def test_unknown_version(self, assumptions_dir):
+        """Test that an unrecorded version raises ValueError."""
+        with pytest.raises(ValueError):
+            service.load_assumptions("deal", version="abcd1234")
@@ -0,0 +1,113 @@
+"""
+Tests for bulk Assumption validation.
+"""
+
+import gc
+import math
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from backend.underwriting.assumptions.models import Assumption
+from backend.underwriting.assumptions.validation import RowError, validate_assumptions
+
+
+def make_rows(count=5):
+    """Valid assumption records."""
+    return [{"name": f"Assumption {i}", "value": i * 0.01, "category": "expense",
+             "confidence_level": 0.8, "unit": "percentage"} for i in range(count)]
+
+
+class TestValidateAssumptions:
+    """Test cases for validate_assumptions."""
+    
+    def test_valid_records(self):
+        """Test that valid records become models in input order."""
+        result = validate_assumptions(make_rows())
+        assert result.ok
+        assert result.rows == [0, 1, 2, 3, 4]
+        assert all(isinstance(item, Assumption) for item in result.assumptions)
+        assert [item.name for item in result.assumptions] == [f"Assumption {i}" for i in range(5)]
+        assert result.assumptions[2] == Assumption(**make_rows()[2])
+    
+    def test_errors_reported_per_row(self):
+        """Test that invalid rows are reported without dropping valid ones."""
+        rows = make_rows()
+        rows[1]["confidence_level"] = 1.5
+        rows[3]["value"] = "not a number"
+        del rows[4]["category"]
+        result = validate_assumptions(rows)
+        assert not result.ok
+        assert result.rows == [0, 2]
+        assert [(error.row, error.field) for error in result.errors] == [
+            (1, "confidence_level"), (3, "value"), (4, "category")]
+    
+    def test_matches_model_validation(self):
+        """Test that rows fail exactly when constructing the model fails."""
+        rows = make_rows(4)
+        rows[0]["value"] = "0.5"
+        rows[1]["confidence_level"] = -0.1
+        rows[2]["name"] = None
+        result = validate_assumptions(rows)
+        for index, row in enumerate(rows):
+            try:
+                Assumption(**row)
+                assert index in result.rows
+            except ValueError:
+                assert index not in result.rows
+        assert result.assumptions[0].value == 0.5
+    
+    def test_columnar_input(self):
+        """Test a mapping of columns with vectorized range checks."""
+        columns = {
+            "name": ["a", "b", None, "d"],
+            "value": [0.1, float("nan"), 0.3, 0.4],
+            "category": ["revenue"] * 4,
+            "confidence_level": [0.9, 0.5, 0.5, 2.0],
+        }
+        result = validate_assumptions(columns)
+        assert result.rows == [0]
+        assert result.errors == [
+            RowError(1, "value", "Field required"),
+            RowError(2, "name", "Field required"),
+            RowError(3, "confidence_level", "Input should be between 0 and 1"),
+        ]
+    
+    def test_dataframe_with_empty_optional_cells(self):
+        """Test that empty optional cells in a DataFrame mean "not given"."""
+        frame = pd.DataFrame({
+            "name": ["a", "b"],
+            "value": [1.0, 2.0],
+            "category": ["expense", "expense"],
+            "confidence_level": [0.7, None],
+            "unit": ["pct", None],
+        })
+        result = validate_assumptions(frame)
+        assert result.ok
+        assert result.assumptions[1].confidence_level is None
+        assert result.assumptions[1].unit is None
+    
+    def test_records_only(self):
+        """Test validating without building models."""
+        result = validate_assumptions(make_rows(3), build_models=False)
+        assert result.assumptions is None
+        assert result.records[1]["value"] == 0.01
+        assert math.isclose(result.records[2]["confidence_level"], 0.8)
+    
+    def test_gc_left_alone_by_default(self):
+        """Test that garbage collection is only paused on request and then restored."""
+        assert gc.isenabled()
+        with patch("backend.underwriting.assumptions.validation.gc.disable") as disable:
+            validate_assumptions(make_rows(3))
+        disable.assert_not_called()
+        assert validate_assumptions(make_rows(3), pause_gc=True).ok
+        assert gc.isenabled()
+    
+    def test_missing_column(self):
+        """Test that a missing required column fails every row."""
+        result = validate_assumptions({"name": ["a"], "value": [1.0]})
+        assert result.errors == [RowError(0, "category", "Field required")]
+    
+    def test_mismatched_columns(self):
+        """Test that columns must have equal lengths."""
+        with pytest.raises(ValueError, match="same length"):
+            validate_assumptions({"name": ["a", "b"], "value": [1.0]})